@@ -0,0 +1,112 @@
+"""
+Analyzer Throughput Benchmark - v1.2
+
+합성 지문(benchmarks/corpus.py: short / long / relative / expletive)을 종류별로 분석하여
+처리량(문장/초, 토큰/초), 지문당 지연 시간(p50/p99), 단계별 시간 비율, 최대 RSS를 측정합니다.
+
+지문 캐시를 거치지 않는 `parse_passage`(analyze_passage의 캐시 미스 경로, 분석 워커에서 실행)를
+측정합니다. 문장 캐시는 기본적으로 끕니다. (`--sentence-cache`로 켜기)
+
+Usage:
+    python benchmarks/bench_analyzer.py [--count 50] [--kinds short,long] [--mode FULL] [--json result.json]
+    python benchmarks/bench_analyzer.py --blank   # 모델 없이 파이프라인 오버헤드만 (smoke test)
+"""
+import argparse
+import time
+
+from common import peak_rss_mb, summarize_ms, write_report
+from corpus import KINDS, PASSAGE, make_corpus
+from nlp import analyzer, stages
+
+
+def load_pipeline(blank: bool) -> str:
+    """분석기 모델을 준비하고 모델 이름을 돌려줍니다."""
+    if blank:
+        import spacy
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        analyzer.nlp_model = nlp
+        analyzer.model_id = "blank_en@bench"
+    else:
+        analyzer.load_model()
+    return analyzer.get_model_id()
+
+
+def run_kind(kind: str, passages, mode: str) -> dict:
+    stages.drain()
+    latencies, sentences, tokens = [], 0, 0
+    start = time.perf_counter()
+    for text in passages:
+        t0 = time.perf_counter()
+        result = analyzer.parse_passage(text, mode)
+        latencies.append(time.perf_counter() - t0)
+        sentences += result["meta"]["totalSentences"]
+        tokens += sum(len(s["tokens"]) for s in result["sentences"])
+    elapsed = time.perf_counter() - start
+
+    # 단계별 시간 비율 (nlp/stages.py, /metrics와 같은 구분; 나머지는 조각 분리/결과 조립 등)
+    totals = [0.0] * len(stages.STAGES)
+    for sample in stages.drain():
+        for i in range(len(stages.STAGES)):
+            totals[i] += sample[i]
+    share = {stage: round(total / elapsed, 3) for stage, total in zip(stages.STAGES, totals)}
+    share["other"] = round(max(0.0, 1 - sum(totals) / elapsed), 3)
+    return {
+        "kind": kind,
+        "passages": len(passages),
+        "sentences": sentences,
+        "tokens": tokens,
+        "seconds": round(elapsed, 3),
+        "sentencesPerSec": round(sentences / elapsed, 1),
+        "tokensPerSec": round(tokens / elapsed, 1),
+        "latency": summarize_ms(latencies),
+        "stageShare": share,
+        "peakRssMb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=50, help="종류별 지문 수")
+    parser.add_argument("--kinds", default=",".join(KINDS))
+    parser.add_argument("--mode", default="FULL", choices=["FULL", "CORE"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sentence-cache", action="store_true", help="문장 캐시 사용")
+    parser.add_argument("--blank", action="store_true", help="모델 대신 빈 파이프라인(sentencizer) 사용")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    analyzer.SENTENCE_CACHE_ENABLED = args.sentence_cache
+    kinds = [k for k in args.kinds.split(",") if k]
+    corpus = make_corpus(args.count, kinds, seed=args.seed)
+
+    start = time.perf_counter()
+    model = load_pipeline(args.blank)
+    load_seconds = time.perf_counter() - start
+    # warm-up: 단일 파싱 경로와 긴 지문 조각 분석 경로(문장 분리기 생성 포함)
+    analyzer.parse_passage(PASSAGE, args.mode)
+    analyzer.parse_passage(" ".join([PASSAGE] * 8), args.mode)
+    rss_after_load = peak_rss_mb()
+
+    results = [run_kind(kind, corpus[kind], args.mode) for kind in kinds]
+    report = {
+        "benchmark": "analyzer",
+        "model": model,
+        "mode": args.mode,
+        "seed": args.seed,
+        "sentenceCache": args.sentence_cache,
+        "loadSeconds": round(load_seconds, 3),
+        "rssAfterLoadMb": rss_after_load,
+        "results": results,
+    }
+
+    print(f"model {model} (load {report['loadSeconds']}s, RSS {rss_after_load} MB), mode {args.mode}")
+    for r in results:
+        lat = r["latency"]
+        print(f"{r['kind']:>10}: {r['sentencesPerSec']:>9} sent/s  p50 {lat['p50Ms']:>8} ms  p99 {lat['p99Ms']:>8} ms  "
+              f"peak RSS {r['peakRssMb']} MB")
+    write_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+API Load Benchmark - v1.2
+
+합성 DB(benchmarks/syndb.py, N명 학생 × M개 세션)를 만든 뒤 FastAPI 앱을 같은 프로세스에서
+(httpx ASGITransport) 동시 요청으로 호출하여 요청 묶음(mix)별 처리량과 엔드포인트별
+지연 시간(p50/p99)을 측정합니다. 네트워크/uvicorn 비용은 포함하지 않습니다.
+
+- analyze: POST /api/analyze-passage (합성 지문 묶음에서 골라 지문 캐시 적중이 섞임)
+- progress: PUT /api/sessions/{id}/progress
+- dashboard: GET /api/manage/sessions (첫 페이지 + 다음 페이지), GET /api/sessions/{id}, GET /api/passages
+- mixed: 학생 요청(진행 상황 저장 위주) + 분석 + 교사 대시보드
+
+Usage:
+    python benchmarks/bench_api_load.py [--mixes analyze,progress,dashboard,mixed] [--requests 500]
+        [--concurrency 16] [--students 500] [--sessions 20000] [--json result.json]
+    python benchmarks/bench_api_load.py --blank   # 모델 없이 (분석은 빈 파이프라인, 워커 프로세스 없음)
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+from common import peak_rss_mb, summarize_ms, write_report
+from corpus import make_corpus
+from syndb import create_database
+
+# 요청 묶음별 작업 비율
+MIXES = {
+    "analyze": {"analyze": 1},
+    "progress": {"progress": 1},
+    "dashboard": {"admin_sessions": 2, "admin_sessions_next": 1, "session": 2, "passages": 1},
+    "mixed": {"progress": 6, "session": 2, "analyze": 1, "admin_sessions": 1},
+}
+
+
+class Workload:
+    """작업 이름 -> 요청 하나를 보내는 코루틴"""
+
+    def __init__(self, client: httpx.AsyncClient, data: dict, passages, seed: int):
+        self.client = client
+        self.data = data
+        self.passages = passages
+        self.rng = random.Random(seed)
+
+    async def analyze(self):
+        return await self.client.post("/api/analyze-passage", json={"passage": self.rng.choice(self.passages)})
+
+    async def progress(self):
+        session_id = self.rng.choice(self.data["session_ids"])
+        body = {
+            "sentence_index": self.rng.randrange(self.data["session_totals"][session_id]),
+            "root_answer": 1, "root_correct": self.rng.random() < 0.7,
+            "subject_answer": 0, "subject_correct": self.rng.random() < 0.7,
+        }
+        return await self.client.put(f"/api/sessions/{session_id}/progress", json=body)
+
+    async def session(self):
+        return await self.client.get(f"/api/sessions/{self.rng.choice(self.data['session_ids'])}")
+
+    async def admin_sessions(self):
+        return await self.client.get("/api/manage/sessions")
+
+    async def admin_sessions_next(self):
+        first = await self.client.get("/api/manage/sessions", params={"limit": 20})
+        cursor = first.json().get("nextCursor")
+        if cursor is None:
+            return first
+        return await self.client.get("/api/manage/sessions", params={"limit": 20, "cursor": cursor})
+
+    async def passages_list(self):
+        return await self.client.get("/api/passages")
+
+    def operation(self, name: str):
+        return self.passages_list if name == "passages" else getattr(self, name)
+
+
+async def run_mix(app, mix: str, data: dict, passages, requests: int, concurrency: int, seed: int) -> dict:
+    weights = MIXES[mix]
+    names = list(weights)
+    plan_rng = random.Random(seed)
+    plan = plan_rng.choices(names, weights=[weights[n] for n in names], k=requests)
+
+    latencies = {name: [] for name in names}
+    statuses = Counter()
+    errors = Counter()
+    next_index = 0
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        workload = Workload(client, data, passages, seed)
+
+        async def worker():
+            nonlocal next_index
+            while next_index < len(plan):
+                name = plan[next_index]
+                next_index += 1
+                started = time.perf_counter()
+                try:
+                    res = await workload.operation(name)()
+                    statuses[res.status_code] += 1
+                    if res.status_code >= 400:
+                        errors[name] += 1
+                except Exception as e:
+                    statuses[type(e).__name__] += 1
+                    errors[name] += 1
+                latencies[name].append(time.perf_counter() - started)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "mix": mix,
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requestsPerSec": round(requests / elapsed, 1),
+        "errors": sum(errors.values()),
+        "statusCounts": {str(k): v for k, v in sorted(statuses.items(), key=lambda kv: str(kv[0]))},
+        "operations": {
+            name: {**summarize_ms(values), "errors": errors[name]} for name, values in latencies.items()
+        },
+    }
+
+
+def prepare_app(workdir: str, args):
+    """임시 DB/로그 경로로 앱을 시작합니다. (lifespan 대신 startup 이벤트 직접 호출)"""
+    import main
+    from db import database
+    from nlp import analyzer, error_tracker
+
+    database.DB_PATH = os.path.join(workdir, "bench.db")
+    error_tracker.LOG_PATH = os.path.join(workdir, "nlp_errors.log")
+    main.limiter.enabled = False
+    if args.blank:
+        import spacy
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        analyzer.nlp_model = nlp
+        analyzer.model_id = "blank_en@bench"
+        main.analysis_executor.workers = 0
+    else:
+        main.analysis_executor.workers = args.analysis_workers
+    main.analysis_executor.warm_up_in_background = main.analysis_executor.warm_up
+
+    main.startup_event()
+    if not main.analysis_executor.is_ready:
+        raise SystemExit(f"Analyzer is not ready: {main.analysis_executor.error}")
+    return main
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mixes", default=",".join(MIXES))
+    parser.add_argument("--requests", type=int, default=500, help="요청 묶음별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--passages", type=int, default=500, help="DB에 넣을 저장 지문 수")
+    parser.add_argument("--corpus", type=int, default=50, help="분석 요청에 쓸 종류별 합성 지문 수")
+    parser.add_argument("--analysis-workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--blank", action="store_true", help="모델 대신 빈 파이프라인(sentencizer) 사용")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    mixes = [m for m in args.mixes.split(",") if m]
+    unknown = set(mixes) - set(MIXES)
+    if unknown:
+        parser.error(f"Unknown mix: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix="vg-bench-api-")
+    app_main = None
+    try:
+        start = time.perf_counter()
+        data = create_database(
+            os.path.join(workdir, "bench.db"), args.students, args.sessions, args.passages, seed=args.seed
+        )
+        generate_seconds = round(time.perf_counter() - start, 1)
+        passages = [p for kind in make_corpus(args.corpus, seed=args.seed).values() for p in kind]
+
+        app_main = prepare_app(workdir, args)
+        results = [
+            asyncio.run(run_mix(app_main.app, mix, data, passages, args.requests, args.concurrency, args.seed))
+            for mix in mixes
+        ]
+        cache = app_main.analysis_cache.stats()
+    finally:
+        if app_main is not None:
+            app_main.shutdown_event()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "benchmark": "api_load",
+        "model": "blank" if args.blank else "en_core_web_sm",
+        "rows": {"students": args.students, "sessions": args.sessions, "progress": data["progress"], "passages": args.passages},
+        "generateSeconds": generate_seconds,
+        "analysisWorkers": 0 if args.blank else args.analysis_workers,
+        "analysisCacheHitRatio": cache["hitRatio"],
+        "peakRssMb": peak_rss_mb(),
+        "results": results,
+    }
+
+    print(f"DB {args.students} students x {args.sessions} sessions (generated in {generate_seconds}s)")
+    for r in results:
+        print(f"\n{r['mix']}: {r['requestsPerSec']} req/s, {r['errors']} errors (concurrency {r['concurrency']})")
+        for name, op in r["operations"].items():
+            if op["count"]:
+                print(f"  {name:>20}: n={op['count']:<5} p50 {op['p50Ms']:>8} ms  p99 {op['p99Ms']:>8} ms")
+    write_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compact Encoding Benchmark - v1.2
+
+약 2000자 지문의 분석 결과를 기존 `AnalysisResponse`(Pydantic 검증 + 직렬화)와
+compact 형식(`?format=compact`)으로 직렬화하여 응답 크기(원본/gzip)와
+직렬화 시간을 비교합니다.
+
+Usage:
+    python benchmarks/bench_compact_encoding.py [--repeat 200] [--json result.json]
+"""
+import argparse
+import gzip
+import json
+import time
+
+from common import write_report
+from corpus import PASSAGE
+
+
+def long_passage(limit: int = 2000) -> str:
+    """예시 지문을 반복하여 최대 길이에 가까운 지문을 만듭니다."""
+    text = PASSAGE
+    while len(text) + len(PASSAGE) + 1 <= limit:
+        text += " " + PASSAGE
+    return text
+
+
+def measure(name: str, serialize, repeat: int) -> dict:
+    payload = serialize()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        serialize()
+    elapsed = time.perf_counter() - start
+    return {
+        "format": name,
+        "bytes": len(payload),
+        "gzipBytes": len(gzip.compress(payload)),
+        "usPerResponse": round(elapsed / repeat * 1_000_000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    from models import AnalysisResponse
+    from nlp.analyzer import parse_passage
+    from nlp.compact import encode_compact
+
+    text = long_passage()
+    result = parse_passage(text)
+
+    results = [
+        # FastAPI response_model 경로: 토큰마다 TokenItem 검증 후 직렬화
+        measure("json", lambda: AnalysisResponse.model_validate(result).model_dump_json().encode(), args.repeat),
+        measure(
+            "compact",
+            lambda: json.dumps(encode_compact(result), ensure_ascii=False, separators=(",", ":")).encode(),
+            args.repeat,
+        ),
+    ]
+
+    full, compact = results
+    report = {
+        "benchmark": "compact_encoding",
+        "repeat": args.repeat,
+        "passageChars": len(text),
+        "sentences": result["meta"]["totalSentences"],
+        "tokens": sum(len(s["tokens"]) for s in result["sentences"]),
+        "results": results,
+        "sizeRatio": round(compact["bytes"] / full["bytes"], 3),
+        "gzipSizeRatio": round(compact["gzipBytes"] / full["gzipBytes"], 3),
+        "speedup": round(full["usPerResponse"] / compact["usPerResponse"], 2),
+    }
+
+    for r in results:
+        print(f"{r['format']:>8}: {r['bytes']:>7} B  gzip {r['gzipBytes']:>6} B  {r['usPerResponse']:>8} us/response")
+    print(f"size x{report['sizeRatio']} (gzip x{report['gzipSizeRatio']}), serialization x{report['speedup']} faster")
+
+    write_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+DB Index Benchmark - v1.2
+
+합성 대용량 DB를 인덱스 없는 스키마(마이그레이션 3단계, v1.1 상당)로 만든 뒤
+복사본을 최신 버전으로 마이그레이션하여, 주요 조회의 쿼리 플랜
+(EXPLAIN QUERY PLAN)과 실행 시간을 비교합니다.
+
+Usage:
+    python benchmarks/bench_db_indexes.py [--students 2000] [--sessions 50000] [--repeat 50] [--json result.json]
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from common import write_report
+from syndb import create_database
+from db.migrations import migrate, LATEST_VERSION
+
+# v1.1 스키마 (인덱스는 PRIMARY KEY / UNIQUE 뿐)
+BASELINE_VERSION = 3
+
+# (이름, SQL, 파라미터를 만드는 함수) - main.py의 조회와 같은 형태
+QUERIES = [
+    (
+        "assign_student: 이름으로 학생 찾기",
+        "SELECT id FROM students WHERE display_name = ?",
+        lambda data: (random.choice(data["names"]),),
+    ),
+    (
+        "학생별 세션 목록 (student_id 필터)",
+        """SELECT sess.id FROM sessions sess
+           JOIN session_student_map m ON sess.id = m.session_id
+           WHERE m.student_id = ?
+           ORDER BY sess.created_at DESC, sess.id DESC LIMIT 51""",
+        lambda data: (random.choice(data["student_ids"]),),
+    ),
+    (
+        "관리자 세션 목록 다음 페이지 (keyset)",
+        """SELECT sess.id, sess.created_at, substr(sess.passage_text, 1, 50), s.display_name
+           FROM sessions sess
+           LEFT JOIN session_student_map m ON sess.id = m.session_id
+           LEFT JOIN students s ON m.student_id = s.id
+           WHERE (sess.created_at, sess.id) < (?, ?)
+           ORDER BY sess.created_at DESC, sess.id DESC LIMIT 51""",
+        lambda data: random.choice(data["cursors"]),
+    ),
+    (
+        "지문 목록 (created_at 정렬)",
+        "SELECT id, title, created_at FROM passages ORDER BY created_at DESC",
+        lambda data: (),
+    ),
+]
+
+
+def profile(path: str, data: dict, repeat: int) -> list:
+    conn = sqlite3.connect(path)
+    random.seed(7)
+    results = []
+    for name, sql, make_params in QUERIES:
+        params = make_params(data)
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, make_params(data)).fetchall()
+        elapsed = time.perf_counter() - start
+        results.append({"query": name, "plan": plan, "msPerQuery": round(elapsed / repeat * 1000, 3)})
+    conn.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=50000)
+    parser.add_argument("--passages", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="vg-bench-db-")
+    try:
+        before_path = os.path.join(workdir, "before.db")
+        after_path = os.path.join(workdir, "after.db")
+
+        # 인덱스 없는 스키마로 합성 데이터 생성 (benchmarks/syndb.py)
+        data = create_database(before_path, args.students, args.sessions, args.passages, target=BASELINE_VERSION)
+        shutil.copyfile(before_path, after_path)
+        conn = sqlite3.connect(after_path)
+        start = time.perf_counter()
+        migrate(conn)
+        migrate_ms = round((time.perf_counter() - start) * 1000, 1)
+        conn.close()
+
+        before = profile(before_path, data, args.repeat)
+        after = profile(after_path, data, args.repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "benchmark": "db_indexes",
+        "repeat": args.repeat,
+        "rows": {
+            "students": args.students, "sessions": args.sessions,
+            "progress": data["progress"], "passages": args.passages,
+        },
+        "schemaVersions": [BASELINE_VERSION, LATEST_VERSION],
+        "migrateMs": migrate_ms,
+        "results": [
+            {
+                "query": b["query"],
+                "before": {"plan": b["plan"], "msPerQuery": b["msPerQuery"]},
+                "after": {"plan": a["plan"], "msPerQuery": a["msPerQuery"]},
+                "speedup": round(b["msPerQuery"] / a["msPerQuery"], 1) if a["msPerQuery"] else None,
+            }
+            for b, a in zip(before, after)
+        ],
+    }
+
+    print(f"schema v{BASELINE_VERSION} -> v{LATEST_VERSION} (migration {migrate_ms} ms)")
+    for r in report["results"]:
+        print(f"\n{r['query']}")
+        for label in ("before", "after"):
+            print(f"  {label:>6}: {r[label]['msPerQuery']:>9} ms/query")
+            for line in r[label]["plan"]:
+                print(f"          {line}")
+        print(f"  x{r['speedup']} faster")
+
+    write_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+spaCy Pipeline Profile Benchmark - v1.2
+
+파이프라인 프로필(full / minimal)별로 새 프로세스에서 모델을 로드하고
+예시 지문을 반복 분석하여 처리량(문장/초)과 최대 RSS를 비교합니다.
+
+Usage:
+    python benchmarks/bench_pipeline_profile.py [--repeat 20] [--json result.json]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from common import peak_rss_mb, write_report
+from corpus import PASSAGE
+
+
+def run_profile(profile: str, repeat: int) -> dict:
+    """하나의 프로필을 현재 프로세스에서 측정합니다."""
+    import spacy
+    from nlp.analyzer import MODEL_NAME, get_excluded_components, _analyze_doc
+
+    start = time.perf_counter()
+    nlp = spacy.load(MODEL_NAME, exclude=get_excluded_components(profile))
+    load_seconds = time.perf_counter() - start
+
+    _analyze_doc(nlp(PASSAGE), "FULL")  # warm-up
+
+    sentences = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = _analyze_doc(nlp(PASSAGE), "FULL")
+        sentences += result["meta"]["totalSentences"]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "profile": profile,
+        "pipeline": nlp.pipe_names,
+        "loadSeconds": round(load_seconds, 3),
+        "sentencesPerSec": round(sentences / elapsed, 1),
+        "msPerPassage": round(elapsed / repeat * 1000, 2),
+        "peakRssMb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--profile", help=argparse.SUPPRESS)  # 내부용: 단일 프로필 측정
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(run_profile(args.profile, args.repeat)))
+        return
+
+    # RSS를 공정하게 비교하기 위해 프로필마다 별도 프로세스에서 실행
+    results = []
+    for profile in ("full", "minimal"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--profile", profile, "--repeat", str(args.repeat)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    full, minimal = results
+    report = {
+        "benchmark": "pipeline_profile",
+        "repeat": args.repeat,
+        "results": results,
+        "throughputGain": round(minimal["sentencesPerSec"] / full["sentencesPerSec"], 2),
+        "rssSavedMb": (
+            round(full["peakRssMb"] - minimal["peakRssMb"], 1)
+            if full["peakRssMb"] is not None and minimal["peakRssMb"] is not None else None
+        ),
+    }
+
+    for r in results:
+        print(f"{r['profile']:>8}: {r['sentencesPerSec']:>8} sent/s  {r['msPerPassage']:>7} ms/passage  "
+              f"peak RSS {r['peakRssMb']} MB  {r['pipeline']}")
+    print(f"throughput x{report['throughputGain']}, RSS saved {report['rssSavedMb']} MB")
+
+    write_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
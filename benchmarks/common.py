@@ -0,0 +1,88 @@
+"""
+Benchmark Helpers - v1.2
+
+벤치마크 스크립트가 공유하는 경로 설정, 지연 시간 요약, 최대 RSS, JSON 보고서 저장.
+
+보고서는 `{"benchmark": 이름, "environment": {...}, ...}` 형태이며 `--json`으로 저장한 파일을
+`python benchmarks/compare.py before.json after.json`으로 비교합니다.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SERVER_DIR = os.path.join(ROOT, "server")
+
+# server/ 기준 import (`from nlp.analyzer import ...`, `import main`)
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """현재 프로세스의 최대 RSS (MB). 측정 불가능한 플랫폼에서는 None."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux: KB, macOS: bytes
+        return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+    except ImportError:
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / 1024 / 1024, 1)
+        except Exception:
+            return None
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """정렬된 값의 백분위수 (선형 보간)"""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def summarize_ms(seconds: Iterable[float]) -> dict:
+    """초 단위 측정값 목록 -> ms 단위 count / mean / p50 / p90 / p99 / max"""
+    values = sorted(s * 1000 for s in seconds)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "meanMs": round(statistics.fmean(values), 3),
+        "p50Ms": round(percentile(values, 50), 3),
+        "p90Ms": round(percentile(values, 90), 3),
+        "p99Ms": round(percentile(values, 99), 3),
+        "maxMs": round(values[-1], 3),
+    }
+
+
+def environment() -> dict:
+    """결과 비교 시 함께 봐야 하는 실행 환경"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+    }
+
+
+def write_report(report: dict, path: Optional[str]) -> None:
+    """`--json` 경로가 있으면 실행 환경을 붙여 보고서를 저장합니다."""
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({**report, "environment": environment()}, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,83 @@
+"""
+Benchmark Report Comparison - v1.2
+
+같은 벤치마크의 JSON 보고서 두 개(`--json`)를 비교하여 바뀐 수치를 출력합니다.
+`--threshold`(%)보다 나빠진 항목이 있으면 종료 코드 1을 돌려줍니다. (CI 회귀 확인용)
+
+- 클수록 좋은 값: `...PerSec`, `speedup`, `...Gain`
+- 작을수록 좋은 값: `...Ms`, `...Mb`, `...Bytes`, `seconds`
+- 목록 항목은 `kind` / `mix` / `query` / `profile` / `format` 값으로 짝을 맞춥니다.
+
+Usage:
+    python benchmarks/compare.py before.json after.json [--threshold 10]
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Optional
+
+LIST_KEYS = ("kind", "mix", "query", "profile", "format")
+HIGHER_IS_BETTER = ("PerSec", "speedup", "Gain")
+LOWER_IS_BETTER = ("Ms", "Mb", "Bytes", "seconds")
+
+
+def direction(key: str) -> Optional[int]:
+    """+1: 클수록 좋음, -1: 작을수록 좋음, None: 비교하지 않음"""
+    if key.endswith(HIGHER_IS_BETTER):
+        return 1
+    if key.endswith(LOWER_IS_BETTER):
+        return -1
+    return None
+
+
+def flatten(value, prefix: str = "") -> Dict[str, float]:
+    """보고서를 `results[kind=short].latency.p99Ms` 같은 경로 -> 숫자로 펼칩니다."""
+    out = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "environment":
+                continue
+            out.update(flatten(item, f"{prefix}.{key}" if prefix else key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            label = str(index)
+            if isinstance(item, dict):
+                label = next((f"{k}={item[k]}" for k in LIST_KEYS if k in item), label)
+            out.update(flatten(item, f"{prefix}[{label}]"))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = value
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="회귀로 볼 악화 비율 (%%)")
+    args = parser.parse_args()
+
+    with open(args.before, encoding="utf-8") as f:
+        before_report = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after_report = json.load(f)
+    if before_report.get("benchmark") != after_report.get("benchmark"):
+        parser.error("Reports are from different benchmarks")
+
+    before, after = flatten(before_report), flatten(after_report)
+    regressions = 0
+    for path in sorted(before.keys() & after.keys()):
+        sign = direction(path.rsplit(".", 1)[-1])
+        old, new = before[path], after[path]
+        if sign is None or old == new:
+            continue
+        change = (new - old) / abs(old) * 100 if old else float("inf")
+        worse = change * sign < -args.threshold
+        regressions += worse
+        print(f"{'REGRESSION' if worse else '':>10}  {path}: {old} -> {new} ({change:+.1f}%)")
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
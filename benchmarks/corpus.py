@@ -0,0 +1,98 @@
+"""
+Synthetic Passage Corpus - v1.2
+
+벤치마크용 합성 지문을 seed로 재현 가능하게 만듭니다.
+
+- short: 단문 2~4개
+- long: 단문/복문 30~60개 (`VG_ANALYSIS_CHUNK_CHARS`를 넘는 조각 분석 경로 포함)
+- relative: 관계절(who/which/that, 목적격 생략) 중심
+- expletive: 허사 there/it 구문(There is ..., It seems that ..., It is ... to ...) 중심
+"""
+import random
+from typing import Dict, List
+
+# 분석기 규칙을 고루 거치는 예시 지문 (기존 벤치마크 기준 지문)
+PASSAGE = (
+    "The man who lives next door is friendly. "
+    "Some fans dislike it because it stops the game. "
+    "There is a cat on the mat. "
+    "It seems that he is honest. "
+    "The book which I bought yesterday is interesting. "
+    "I think he will come tomorrow. "
+    "This mental training helps them stay calm. "
+    "The students read the passage and answered the questions."
+)
+
+SUBJECTS = [
+    "The teacher", "My brother", "The old farmer", "A young scientist", "The students",
+    "Our neighbors", "The little girl", "The coach", "Many tourists", "The engineer",
+]
+OBJECTS = [
+    "the letter", "a new bridge", "the results", "an old map", "the garden",
+    "the problem", "a small boat", "the answers", "the window", "a long story",
+]
+VERBS_PAST = [
+    "wrote", "built", "checked", "found", "cleaned", "solved", "painted", "read", "opened", "told",
+]
+VERBS_PRESENT = [
+    "likes", "needs", "finds", "remembers", "explains", "visits", "watches", "keeps", "carries", "studies",
+]
+PLACES = ["in the park", "at the station", "near the river", "after school", "on Sunday", "in the library"]
+ADJECTIVES = ["important", "difficult", "interesting", "strange", "useful", "dangerous"]
+NOUNS_PLURAL = ["books", "students", "birds", "problems", "questions", "trees"]
+
+KINDS = ("short", "long", "relative", "expletive")
+
+
+def _simple(rng: random.Random) -> str:
+    return f"{rng.choice(SUBJECTS)} {rng.choice(VERBS_PAST)} {rng.choice(OBJECTS)} {rng.choice(PLACES)}."
+
+
+def _compound(rng: random.Random) -> str:
+    return (
+        f"{rng.choice(SUBJECTS)} {rng.choice(VERBS_PAST)} {rng.choice(OBJECTS)}, "
+        f"and {rng.choice(SUBJECTS).lower()} {rng.choice(VERBS_PAST)} {rng.choice(OBJECTS)}."
+    )
+
+
+def _relative(rng: random.Random) -> str:
+    subject, obj = rng.choice(SUBJECTS), rng.choice(OBJECTS)
+    return rng.choice([
+        f"{subject} who {rng.choice(VERBS_PRESENT)} {obj} {rng.choice(VERBS_PAST)} {rng.choice(OBJECTS)}.",
+        f"{subject} {rng.choice(VERBS_PAST)} {obj} which {rng.choice(SUBJECTS).lower()} {rng.choice(VERBS_PAST)}.",
+        f"The {obj.split()[-1]} that {subject.lower()} {rng.choice(VERBS_PAST)} is {rng.choice(ADJECTIVES)}.",
+        f"The {obj.split()[-1]} {subject.lower()} {rng.choice(VERBS_PAST)} {rng.choice(PLACES)} was {rng.choice(ADJECTIVES)}.",
+        f"{subject} who {rng.choice(VERBS_PAST)} {obj} that {rng.choice(SUBJECTS).lower()} "
+        f"{rng.choice(VERBS_PAST)} is {rng.choice(ADJECTIVES)}.",
+    ])
+
+
+def _expletive(rng: random.Random) -> str:
+    return rng.choice([
+        f"There is {rng.choice(OBJECTS)} {rng.choice(PLACES)}.",
+        f"There are many {rng.choice(NOUNS_PLURAL)} {rng.choice(PLACES)}.",
+        f"It seems that {rng.choice(SUBJECTS).lower()} {rng.choice(VERBS_PRESENT)} {rng.choice(OBJECTS)}.",
+        f"It is {rng.choice(ADJECTIVES)} to understand {rng.choice(OBJECTS)}.",
+        f"It was {rng.choice(SUBJECTS).lower()} who {rng.choice(VERBS_PAST)} {rng.choice(OBJECTS)}.",
+    ])
+
+
+def make_passage(kind: str, rng: random.Random) -> str:
+    if kind == "short":
+        sentences = [_simple(rng) for _ in range(rng.randint(2, 4))]
+    elif kind == "long":
+        makers = (_simple, _compound, _relative, _expletive)
+        sentences = [rng.choice(makers)(rng) for _ in range(rng.randint(30, 60))]
+    elif kind == "relative":
+        sentences = [_relative(rng) if rng.random() < 0.8 else _simple(rng) for _ in range(rng.randint(5, 10))]
+    elif kind == "expletive":
+        sentences = [_expletive(rng) if rng.random() < 0.8 else _simple(rng) for _ in range(rng.randint(5, 10))]
+    else:
+        raise ValueError(f"Unknown corpus kind: {kind}")
+    return " ".join(sentences)
+
+
+def make_corpus(count: int, kinds=KINDS, seed: int = 42) -> Dict[str, List[str]]:
+    """종류마다 `count`개의 서로 다른 지문 (같은 seed면 같은 지문)"""
+    rng = random.Random(seed)
+    return {kind: [make_passage(kind, rng) for _ in range(count)] for kind in kinds}
@@ -0,0 +1,114 @@
+"""
+Synthetic Database Generator - v1.2
+
+N명 학생 × M개 세션(+ 진행 상황, 지문) 규모의 합성 DB를 seed로 재현 가능하게 만듭니다.
+
+Usage:
+    python benchmarks/syndb.py out.db [--students 2000] [--sessions 50000] [--passages 5000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+# server/ 를 path에 추가 (db 패키지 import)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+from db.migrations import migrate
+
+START = datetime(2025, 3, 1)
+
+
+def _timestamp(rng: random.Random) -> str:
+    return (START + timedelta(seconds=rng.randrange(365 * 86400))).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def populate(conn: sqlite3.Connection, students: int, sessions: int, passages: int, seed: int = 42) -> dict:
+    """이미 만들어진 스키마에 합성 데이터를 채웁니다.
+
+    Returns:
+        조회 파라미터를 만들 때 쓰는 id 목록과 진행 상황 행 수
+    """
+    rng = random.Random(seed)
+    names = [f"학생{i:05d}" for i in range(students)]
+    student_ids = [f"st-{i:05d}" for i in range(students)]
+    conn.executemany(
+        "INSERT INTO students (id, display_name) VALUES (?, ?)", zip(student_ids, names)
+    )
+
+    session_rows, map_rows, progress_rows = [], [], []
+    for i in range(sessions):
+        session_id = f"se-{i:07d}"
+        created_at = _timestamp(rng)
+        total = rng.randint(3, 12)
+        session_rows.append((session_id, created_at, "The cat sat on the mat. " * 20, total, rng.choice(["FULL", "CORE"])))
+        if rng.random() < 0.8:
+            map_rows.append((session_id, rng.choice(student_ids)))
+        for index in range(rng.randint(0, total)):
+            progress_rows.append((session_id, index, 0, rng.random() < 0.7, 0, rng.random() < 0.7, created_at))
+
+    conn.executemany(
+        "INSERT INTO sessions (id, created_at, passage_text, total_sentences, mode) VALUES (?, ?, ?, ?, ?)", session_rows
+    )
+    conn.executemany("INSERT INTO session_student_map (session_id, student_id) VALUES (?, ?)", map_rows)
+    conn.executemany(
+        """INSERT INTO progress (session_id, sentence_index, root_answer, root_correct,
+                                 subject_answer, subject_correct, completed_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        progress_rows,
+    )
+    conn.executemany(
+        "INSERT INTO passages (id, title, content, created_at) VALUES (?, ?, ?, ?)",
+        [
+            (f"pa-{i:06d}", f"Passage {i}", "The cat sat on the mat. " * 40, _timestamp(rng))
+            for i in range(passages)
+        ],
+    )
+    conn.commit()
+
+    return {
+        "names": names,
+        "student_ids": student_ids,
+        "session_ids": [row[0] for row in session_rows],
+        "session_totals": {row[0]: row[3] for row in session_rows},
+        "cursors": [(row[1], row[0]) for row in rng.sample(session_rows, min(200, len(session_rows)))],
+        "progress": len(progress_rows),
+    }
+
+
+def create_database(
+    path: str, students: int, sessions: int, passages: int, target: Optional[int] = None, seed: int = 42
+) -> dict:
+    """`target` 스키마 버전(기본값: 최신)으로 DB를 만들고 합성 데이터를 채웁니다."""
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        migrate(conn, target=target)
+        return populate(conn, students, sessions, passages, seed)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=50000)
+    parser.add_argument("--passages", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = create_database(args.path, args.students, args.sessions, args.passages, seed=args.seed)
+    print(
+        f"{args.path}: {args.students} students, {args.sessions} sessions, {data['progress']} progress rows, "
+        f"{args.passages} passages ({time.perf_counter() - start:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import AppHeader from './components/AppHeader';
 import StartScreen from './components/StartScreen';
 import QuizScreen from './components/QuizScreen';
@@ -8,9 +8,12 @@ import TeacherDashboard from './components/TeacherDashboard';
 import { useQuizContext } from './context/QuizContext';
 import {
   analyzePassage,
+  analyzePassageStream,
+  getPassageAnalysis,
   createSession,
   getSession,
-  saveProgress,
+  queueProgress,
+  flushProgress,
   getStoredSessionId,
   storeSessionId,
   clearStoredSession,
@@ -24,6 +27,7 @@ function App() {
   const [sessionId, setSessionId] = useState(null);
   const [savedProgress, setSavedProgress] = useState([]); // 저장된 진행 상황
   const [isLoading, setIsLoading] = useState(false);
+  const pendingProgressRef = useRef([]); // 세션 생성 전(스트리밍 중)에 푼 문제
   const { dispatch } = useQuizContext();
 
   // 페이지 로드 시 저장된 세션 복원 시도
@@ -60,12 +64,25 @@ function App() {
     restoreSession();
   }, []);
 
-  const handleStart = async (text, mode = 'FULL') => {
+  const handleStart = async (text, mode = 'FULL', passageId = null) => {
     setIsLoading(true);
+    pendingProgressRef.current = [];
 
     try {
-      // 1. 지문 분석
-      const data = await analyzePassage(text);
+      // 1. 지문 분석 (저장된 지문은 미리 계산된 결과 사용)
+      let data = passageId ? await getPassageAnalysis(passageId).catch(() => null) : null;
+      if (!data) {
+        // 스트리밍 분석: 첫 문장이 도착하면 바로 퀴즈 시작
+        setPassageData(null);
+        data = await analyzePassageStream(text, (sentence) => {
+          setPassageData((prev) => ({
+            sentences: [...(prev ? prev.sentences : []), sentence],
+            meta: null,
+            isStreaming: true
+          }));
+          setCurrentScreen('QUIZ');
+        });
+      }
 
       // 2. 세션 생성
       const { id } = await createSession(text, data.sentences.length, mode);
@@ -77,32 +94,41 @@ function App() {
 
       setPassageData(data);
       setCurrentScreen('QUIZ');
+
+      // 스트리밍 중에 완료한 문장의 진행 상황 저장
+      pendingProgressRef.current.splice(0).forEach((progress) => queueProgress(id, progress));
     } catch (err) {
       console.error(err);
       alert(`오류: ${err.message}`);
+      setPassageData(null);
+      setCurrentScreen('START');
+      dispatch({ type: 'RESET_QUIZ' });
     } finally {
       setIsLoading(false);
     }
   };
 
   // 문장 완료 시 진행 상황 저장
-  const handleSentenceComplete = useCallback(async (sentenceIndex, rootAnswer, rootCorrect, subjectAnswer, subjectCorrect) => {
-    if (!sessionId) return;
-
-    try {
-      await saveProgress(sessionId, {
-        sentence_index: sentenceIndex,
-        root_answer: rootAnswer,
-        root_correct: rootCorrect,
-        subject_answer: subjectAnswer,
-        subject_correct: subjectCorrect
-      });
-    } catch (err) {
-      console.error('진행 상황 저장 실패:', err);
+  const handleSentenceComplete = useCallback((sentenceIndex, rootAnswer, rootCorrect, subjectAnswer, subjectCorrect) => {
+    const progress = {
+      sentence_index: sentenceIndex,
+      root_answer: rootAnswer,
+      root_correct: rootCorrect,
+      subject_answer: subjectAnswer,
+      subject_correct: subjectCorrect
+    };
+    if (!sessionId) {
+      // 아직 세션이 없으면 (스트리밍 중) 세션 생성 후 저장
+      pendingProgressRef.current.push(progress);
+      return;
     }
+
+    // 버퍼링 후 일괄 저장 (주기적으로, 페이지가 숨겨질 때, 퀴즈 종료 시)
+    queueProgress(sessionId, progress);
   }, [sessionId]);
 
   const handleQuizFinish = () => {
+    flushProgress().catch((err) => console.error('진행 상황 저장 실패:', err));
     setCurrentScreen('SUMMARY');
   };
 
@@ -112,7 +138,9 @@ function App() {
   };
 
   const handleRestart = () => {
+    flushProgress().catch((err) => console.error('진행 상황 저장 실패:', err));
     clearStoredSession();
+    pendingProgressRef.current = [];
     setSessionId(null);
     setSavedProgress([]);
     setCurrentScreen('START');
@@ -4,10 +4,11 @@ import BookOpen from 'lucide-react/dist/esm/icons/book-open';
 import { getPassages, getGradingMode } from '../services/api';
 import './StartScreen.css';
 
-const MAX_CHARS = 2000;
+const MAX_CHARS = 20000; // 서버 VG_MAX_PASSAGE_CHARS 기본값과 동일
 
 const StartScreen = ({ onStart, isLoading }) => {
     const [passage, setPassage] = useState('');
+    const [loadedPassage, setLoadedPassage] = useState(null); // { id, content } of the saved passage
     const [savedPassages, setSavedPassages] = useState([]);
     const [showPassageList, setShowPassageList] = useState(false);
     const charCount = passage.length;
@@ -27,15 +28,18 @@ const StartScreen = ({ onStart, isLoading }) => {
         }
     };
 
-    const handleLoadPassage = (content) => {
-        setPassage(content);
+    const handleLoadPassage = (savedPassage) => {
+        setPassage(savedPassage.content);
+        setLoadedPassage({ id: savedPassage.id, content: savedPassage.content });
         setShowPassageList(false);
     };
 
     const handleSubmit = () => {
         if (isValid && !isLoading) {
             const mode = getGradingMode();
-            onStart(passage, mode);
+            // 저장된 지문을 수정 없이 사용하면 미리 계산된 분석 결과를 사용
+            const passageId = loadedPassage && loadedPassage.content === passage ? loadedPassage.id : null;
+            onStart(passage, mode, passageId);
         }
     };
 
@@ -70,7 +74,7 @@ const StartScreen = ({ onStart, isLoading }) => {
                                     <button
                                         key={p.id}
                                         className="passage-item"
-                                        onClick={() => handleLoadPassage(p.content)}
+                                        onClick={() => handleLoadPassage(p)}
                                     >
                                         <span className="passage-title">{p.title}</span>
                                         <span className="passage-preview">
@@ -14,15 +14,19 @@ import FileText from 'lucide-react/dist/esm/icons/file-text';
 import Settings from 'lucide-react/dist/esm/icons/settings';
 import UserCircle from 'lucide-react/dist/esm/icons/user-circle';
 import CheckCircle2 from 'lucide-react/dist/esm/icons/check-circle-2';
-import { getAdminData, assignStudent, deleteStudent, getPassages, createPassage, deletePassage, deleteSession, clearAllSessions, getGradingMode, setGradingMode as setGradingModeApi } from '../services/api';
+import toast from 'react-hot-toast';
+import { getAdminData, assignStudent, deleteStudent, getPassages, createPassage, deletePassage, deleteSession, clearAllSessions, waitForPurgeJob, getGradingMode, setGradingMode as setGradingModeApi } from '../services/api';
 import './TeacherDashboard.css';
 
 const TeacherDashboard = ({ onLogout }) => {
-    const [data, setData] = useState({ students: [], sessions: [] });
+    const [data, setData] = useState({ students: [], sessions: [], nextCursor: null });
+    const [sessionFilters, setSessionFilters] = useState({ studentId: '', mode: '', dateFrom: '', dateTo: '' });
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
     const [passages, setPassages] = useState([]);
     const [isLoading, setIsLoading] = useState(true);
     const [error, setError] = useState('');
     const [isRefreshing, setIsRefreshing] = useState(false);
+    const [purgeJob, setPurgeJob] = useState(null); // 진행 중인 전체 삭제 작업 ({ status, total, deleted })
     const [showAddPassage, setShowAddPassage] = useState(false);
     const [newPassageTitle, setNewPassageTitle] = useState('');
     const [newPassageContent, setNewPassageContent] = useState('');
@@ -34,10 +38,10 @@ const TeacherDashboard = ({ onLogout }) => {
 
         try {
             const [adminResult, passageResult] = await Promise.all([
-                getAdminData(),
+                getAdminData(sessionFilters),
                 getPassages()
             ]);
-            setData(adminResult);
+            setData({ ...adminResult, students: adminResult.students || [] });
             setPassages(passageResult.passages || []);
         } catch (err) {
             setError('데이터를 불러오지 못했습니다.');
@@ -51,6 +55,39 @@ const TeacherDashboard = ({ onLogout }) => {
         fetchData();
     }, []);
 
+    // 필터 변경 시 세션 목록을 첫 페이지부터 다시 조회
+    const handleFilterChange = async (key, value) => {
+        const filters = { ...sessionFilters, [key]: value };
+        setSessionFilters(filters);
+        setIsRefreshing(true);
+        try {
+            const result = await getAdminData(filters);
+            setData({ ...result, students: result.students || [] });
+        } catch (err) {
+            alert('세션 조회 실패: ' + err.message);
+        } finally {
+            setIsRefreshing(false);
+        }
+    };
+
+    // 다음 페이지 (keyset 커서)
+    const handleLoadMore = async () => {
+        if (!data.nextCursor || isLoadingMore) return;
+        setIsLoadingMore(true);
+        try {
+            const result = await getAdminData({ ...sessionFilters, cursor: data.nextCursor });
+            setData((prev) => ({
+                ...prev,
+                sessions: [...prev.sessions, ...result.sessions],
+                nextCursor: result.nextCursor
+            }));
+        } catch (err) {
+            alert('세션 조회 실패: ' + err.message);
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
+
     const handleAssign = async (sessionId, currentName) => {
         const studentName = window.prompt('학생 이름을 입력하세요:', currentName === '미지정' ? '' : currentName);
         if (studentName === null) return;
@@ -125,11 +162,18 @@ const TeacherDashboard = ({ onLogout }) => {
     const handleClearSessions = async () => {
         if (!window.confirm('모든 세션 기록을 삭제하시겠습니까? 이 작업은 되돌릴 수 없습니다.')) return;
 
+        // 서버는 202로 응답하고 나누어 삭제하므로 작업이 끝날 때까지 진행 상황을 조회한 뒤 새로고침
+        setPurgeJob({ status: 'queued', total: null, deleted: 0 });
         try {
-            await clearAllSessions();
-            fetchData(false);
+            const jobId = await clearAllSessions();
+            const job = await waitForPurgeJob(jobId, setPurgeJob);
+            toast.success(`세션 ${job.deleted}개를 삭제했습니다.`);
         } catch (err) {
-            alert('전체 삭제 실패: ' + err.message);
+            toast.error('전체 삭제 실패: ' + err.message);
+        } finally {
+            // 실패한 경우에도 일부는 삭제되었을 수 있으므로 목록을 다시 조회
+            setPurgeJob(null);
+            fetchData(false);
         }
     };
 
@@ -333,11 +377,37 @@ const TeacherDashboard = ({ onLogout }) => {
                     <div className="section-header">
                         <h2><History size={20} /> 최근 세션 목록</h2>
                         {data.sessions.length > 0 && (
-                            <button className="btn btn-small btn-secondary text-red" onClick={handleClearSessions}>
-                                <Trash2 size={16} /> 전체 삭제
+                            <button className="btn btn-small btn-secondary text-red" onClick={handleClearSessions} disabled={purgeJob !== null}>
+                                <Trash2 size={16} /> {purgeJob ? `삭제 중... ${purgeJob.deleted}/${purgeJob.total ?? '?'}` : '전체 삭제'}
                             </button>
                         )}
                     </div>
+                    <div className="session-filters">
+                        <select value={sessionFilters.studentId} onChange={(e) => handleFilterChange('studentId', e.target.value)}>
+                            <option value="">전체 학생</option>
+                            {data.students.map(student => (
+                                <option key={student.studentId} value={student.studentId}>{student.displayName}</option>
+                            ))}
+                        </select>
+                        <select value={sessionFilters.mode} onChange={(e) => handleFilterChange('mode', e.target.value)}>
+                            <option value="">전체 모드</option>
+                            <option value="CORE">기초</option>
+                            <option value="FULL">심화</option>
+                        </select>
+                        <input
+                            type="date"
+                            value={sessionFilters.dateFrom}
+                            onChange={(e) => handleFilterChange('dateFrom', e.target.value)}
+                            title="시작일"
+                        />
+                        <span className="text-gray">~</span>
+                        <input
+                            type="date"
+                            value={sessionFilters.dateTo}
+                            onChange={(e) => handleFilterChange('dateTo', e.target.value)}
+                            title="종료일"
+                        />
+                    </div>
                     <div className="table-container">
                         <table className="admin-table">
                             <thead>
@@ -395,6 +465,13 @@ const TeacherDashboard = ({ onLogout }) => {
                             </tbody>
                         </table>
                     </div>
+                    {data.nextCursor && (
+                        <div className="load-more">
+                            <button className="btn btn-small btn-secondary" onClick={handleLoadMore} disabled={isLoadingMore}>
+                                {isLoadingMore ? '불러오는 중...' : '더 보기'}
+                            </button>
+                        </div>
+                    )}
                 </section>
             </main>
         </div>
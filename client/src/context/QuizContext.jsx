@@ -45,6 +45,22 @@ function quizReducer(state, action) {
                 results: action.payload
             };
 
+        case 'EXTEND_RESULTS':
+            // 문장 수(payload)만큼 빈 결과를 뒤에 추가
+            return {
+                ...state,
+                results: [
+                    ...state.results,
+                    ...Array.from({ length: Math.max(0, action.payload - state.results.length) }, () => ({
+                        rootCorrect: null,
+                        subjectCorrect: null,
+                        rootWrongTokenId: null,
+                        subjectWrongTokenId: null,
+                        isReviewed: false
+                    }))
+                ]
+            };
+
         case 'UPDATE_RESULT':
             const newResults = [...state.results];
             newResults[state.sentenceIndex] = {
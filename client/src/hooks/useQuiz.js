@@ -15,7 +15,8 @@ export const useQuiz = ({ data, savedProgress = [], onSentenceComplete, onFinish
     const { sentenceIndex, step, selections, isChecked, feedback, results, isReviewMode } = state;
 
     const currentSentence = data.sentences[sentenceIndex];
-    const isLastSentence = sentenceIndex === data.sentences.length - 1;
+    // 스트리밍 중에는 아직 도착하지 않은 문장이 남아 있음
+    const isLastSentence = sentenceIndex === data.sentences.length - 1 && !data.isStreaming;
     const progress = ((sentenceIndex) / data.sentences.length) * 100;
 
     // 현재 문장의 정답 개수 (v1.1)
@@ -30,17 +31,10 @@ export const useQuiz = ({ data, savedProgress = [], onSentenceComplete, onFinish
         : (answerKey.subjectSpans || [[answerKey.subject]]).flat().filter(s => s !== null);
     const expectedSubjectCount = expectedSubjectTokens.length;
 
-    // 초기 결과 구조 생성
+    // 초기 결과 구조 생성 (스트리밍으로 문장이 늘어나면 결과도 확장)
     useEffect(() => {
-        if (results.length === 0 && data.sentences.length > 0) {
-            const initialResults = data.sentences.map(() => ({
-                rootCorrect: null,
-                subjectCorrect: null,
-                rootWrongTokenId: null,
-                subjectWrongTokenId: null,
-                isReviewed: false
-            }));
-            dispatch({ type: 'SET_RESULTS', payload: initialResults });
+        if (results.length < data.sentences.length) {
+            dispatch({ type: 'EXTEND_RESULTS', payload: data.sentences.length });
         }
     }, [data.sentences, results.length, dispatch]);
 
@@ -208,7 +202,8 @@ export const useQuiz = ({ data, savedProgress = [], onSentenceComplete, onFinish
                 onFinish(results);
             } else if (isLastSentence) {
                 onFinish(results);
-            } else {
+            } else if (sentenceIndex < data.sentences.length - 1) {
+                // 스트리밍 중 다음 문장이 아직 없으면 도착할 때까지 대기
                 dispatch({ type: 'NEXT_SENTENCE' });
             }
         }
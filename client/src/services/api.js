@@ -18,12 +18,105 @@ const getApiUrl = () => {
     return ''; // Same origin in production
 };
 
+const MAX_BUSY_RETRIES = 3;
+
+/**
+ * fetch wrapper that waits and retries when the server answers 503 (analysis queue full)
+ */
+async function fetchWithBusyRetry(url, options) {
+    for (let attempt = 0; ; attempt++) {
+        const response = await fetch(url, options);
+        if (response.status !== 503 || attempt >= MAX_BUSY_RETRIES) {
+            return response;
+        }
+        const retryAfter = Number(response.headers.get('Retry-After')) || 1;
+        await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000));
+    }
+}
+
+// Conditional GET: url -> { etag, data } (서버가 304를 보내면 저장된 응답을 재사용)
+// 새로고침 후 세션 복원에서도 쓰도록 sessionStorage에 보관
+const ETAG_CACHE_PREFIX = 'vg_etag:';
+const etagCache = {
+    get(url) {
+        try {
+            return JSON.parse(sessionStorage.getItem(ETAG_CACHE_PREFIX + url));
+        } catch {
+            return null;
+        }
+    },
+    set(url, entry) {
+        try {
+            sessionStorage.setItem(ETAG_CACHE_PREFIX + url, JSON.stringify(entry));
+        } catch {
+            // 저장 공간 부족 등: 다음 요청은 전체 응답을 받음
+        }
+    },
+    delete(url) {
+        sessionStorage.removeItem(ETAG_CACHE_PREFIX + url);
+    },
+};
+
+/**
+ * GET with If-None-Match; returns { status, data } where a 304 is served from etagCache as 200.
+ * Other non-OK responses are returned with data = null.
+ */
+async function fetchWithEtag(url) {
+    const cached = etagCache.get(url);
+    const response = await fetch(url, {
+        headers: cached ? { 'If-None-Match': cached.etag } : {},
+        cache: 'no-store', // 브라우저 HTTP 캐시 대신 직접 재검증
+    });
+
+    if (response.status === 304 && cached) {
+        return { status: 200, data: cached.data };
+    }
+    if (!response.ok) {
+        etagCache.delete(url);
+        return { status: response.status, data: null };
+    }
+
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (etag) {
+        etagCache.set(url, { etag, data });
+    }
+    return { status: response.status, data };
+}
+
+/**
+ * Expand a compact (columnar) analysis payload into the regular AnalysisResponse shape
+ * (see server/nlp/compact.py)
+ * Token offsets count Unicode code points (Python str indexes), not UTF-16 code units.
+ */
+export function decodeCompactAnalysis(payload) {
+    const { labels } = payload;
+    const sentences = payload.sentences.map(({ id, text, tokens, key }) => {
+        const chars = Array.from(text);
+        return {
+            id,
+            text,
+            key,
+            tokens: tokens.start.map((start, i) => ({
+                id: i,
+                text: chars.slice(start, tokens.end[i]).join(''),
+                start,
+                end: tokens.end[i],
+                pos: labels.pos[tokens.pos[i]],
+                tag: labels.tag[tokens.tag[i]],
+                dep: labels.dep[tokens.dep[i]],
+            })),
+        };
+    });
+    return { sentences, meta: payload.meta };
+}
+
 /**
  * Analyze passage using NLP
  */
 export async function analyzePassage(passage) {
     const mode = getGradingMode();
-    const response = await fetch(`${getApiUrl()}/api/analyze-passage`, {
+    const response = await fetchWithBusyRetry(`${getApiUrl()}/api/analyze-passage?format=compact`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ passage, mode }),
@@ -34,7 +127,59 @@ export async function analyzePassage(passage) {
         throw new Error(errData.detail || '분석 중 오류가 발생했습니다.');
     }
 
-    return response.json();
+    return decodeCompactAnalysis(await response.json());
+}
+
+/**
+ * Analyze passage with the streaming endpoint (NDJSON).
+ * onSentence is called with each SentenceItem as soon as it arrives;
+ * resolves with the full { sentences, meta } once the meta frame is received.
+ */
+export async function analyzePassageStream(passage, onSentence) {
+    const mode = getGradingMode();
+    const response = await fetchWithBusyRetry(`${getApiUrl()}/api/analyze-passage/stream?format=ndjson`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ passage, mode }),
+    });
+
+    if (!response.ok) {
+        const errData = await response.json();
+        throw new Error(errData.detail || '분석 중 오류가 발생했습니다.');
+    }
+
+    const sentences = [];
+    let meta = null;
+    const handleLine = (line) => {
+        if (!line.trim()) return;
+        const frame = JSON.parse(line);
+        if (frame.type === 'sentence') {
+            sentences.push(frame.data);
+            onSentence(frame.data);
+        } else if (frame.type === 'meta') {
+            meta = frame.data;
+        } else if (frame.type === 'error') {
+            throw new Error(frame.data.detail || '분석 중 오류가 발생했습니다.');
+        }
+    };
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.forEach(handleLine);
+        if (done) break;
+    }
+    handleLine(buffer);
+
+    if (!meta) {
+        throw new Error('분석 결과를 끝까지 받지 못했습니다.');
+    }
+    return { sentences, meta };
 }
 
 /**
@@ -58,17 +203,17 @@ export async function createSession(passageText, totalSentences, mode = 'FULL')
  * Get session by ID
  */
 export async function getSession(sessionId) {
-    const response = await fetch(`${getApiUrl()}/api/sessions/${sessionId}`);
+    const { status, data } = await fetchWithEtag(`${getApiUrl()}/api/sessions/${sessionId}`);
 
-    if (response.status === 404) {
+    if (status === 404) {
         return null; // Session not found
     }
 
-    if (!response.ok) {
+    if (!data) {
         throw new Error('세션 조회 실패');
     }
 
-    return response.json();
+    return data;
 }
 
 /**
@@ -88,6 +233,87 @@ export async function saveProgress(sessionId, progress) {
     return response.json();
 }
 
+/**
+ * Save progress for many sentences in one request
+ */
+export async function saveProgressBatch(sessionId, items, { keepalive = false } = {}) {
+    const response = await fetch(`${getApiUrl()}/api/sessions/${sessionId}/progress/batch`, {
+        method: 'PUT',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ items }),
+        keepalive, // 페이지가 닫히는 중에도 요청 유지
+    });
+
+    if (!response.ok) {
+        throw new Error('진행 상황 저장 실패');
+    }
+
+    return response.json();
+}
+
+// Progress buffering: 답안을 모아 두었다가 주기적으로(또는 페이지가 숨겨질 때) 한 번에 저장
+const PROGRESS_FLUSH_INTERVAL_MS = 5000;
+const progressBuffer = new Map(); // sessionId -> Map(sentence_index -> progress)
+let progressFlushTimer = null;
+
+/**
+ * Buffer progress for a sentence; it is sent with the next batch flush
+ */
+export function queueProgress(sessionId, progress) {
+    if (!progressBuffer.has(sessionId)) {
+        progressBuffer.set(sessionId, new Map());
+    }
+    progressBuffer.get(sessionId).set(progress.sentence_index, progress);
+
+    if (!progressFlushTimer) {
+        progressFlushTimer = setTimeout(() => {
+            flushProgress().catch((err) => console.error('진행 상황 저장 실패:', err));
+        }, PROGRESS_FLUSH_INTERVAL_MS);
+    }
+}
+
+/**
+ * Send all buffered progress now (failed items are put back for the next flush)
+ */
+export async function flushProgress({ keepalive = false } = {}) {
+    clearTimeout(progressFlushTimer);
+    progressFlushTimer = null;
+
+    const pending = [...progressBuffer.entries()];
+    progressBuffer.clear();
+
+    const results = await Promise.allSettled(pending.map(async ([sessionId, items]) => {
+        try {
+            await saveProgressBatch(sessionId, [...items.values()], { keepalive });
+        } catch (err) {
+            // 더 새로운 답안이 이미 버퍼에 있으면 그것을 유지
+            items.forEach((progress, index) => {
+                const current = progressBuffer.get(sessionId) || new Map();
+                if (!current.has(index)) current.set(index, progress);
+                progressBuffer.set(sessionId, current);
+            });
+            throw err;
+        }
+    }));
+
+    if (progressBuffer.size > 0 && !progressFlushTimer) {
+        progressFlushTimer = setTimeout(() => {
+            flushProgress().catch((err) => console.error('진행 상황 저장 실패:', err));
+        }, PROGRESS_FLUSH_INTERVAL_MS);
+    }
+
+    const failed = results.find((r) => r.status === 'rejected');
+    if (failed) throw failed.reason;
+}
+
+if (typeof document !== 'undefined') {
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') {
+            flushProgress({ keepalive: true }).catch((err) => console.error('진행 상황 저장 실패:', err));
+        }
+    });
+}
+
 // LocalStorage helpers
 const SESSION_KEY = 'verbgravity_session_id';
 const GRADING_MODE_KEY = 'vg_grading_mode';
@@ -145,10 +371,16 @@ export async function adminLogin(password) {
 }
 
 /**
- * Admin: Get all data
+ * Admin: Get student summaries and one page of sessions
+ * params: { cursor, limit, studentId, mode, dateFrom, dateTo } (all optional)
  */
-export async function getAdminData() {
-    const response = await fetch(`${getApiUrl()}/api/manage/sessions`);
+export async function getAdminData(params = {}) {
+    const query = new URLSearchParams();
+    const names = { cursor: 'cursor', limit: 'limit', studentId: 'student_id', mode: 'mode', dateFrom: 'date_from', dateTo: 'date_to' };
+    Object.entries(names).forEach(([key, name]) => {
+        if (params[key]) query.set(name, params[key]);
+    });
+    const response = await fetch(`${getApiUrl()}/api/manage/sessions?${query}`);
 
     if (!response.ok) {
         throw new Error('데이터 조회 실패');
@@ -193,13 +425,27 @@ export async function deleteStudent(studentId) {
  * Get all saved passages
  */
 export async function getPassages() {
-    const response = await fetch(`${getApiUrl()}/api/passages`);
+    const { data } = await fetchWithEtag(`${getApiUrl()}/api/passages`);
 
-    if (!response.ok) {
+    if (!data) {
         throw new Error('지문 목록 조회 실패');
     }
 
-    return response.json();
+    return data;
+}
+
+/**
+ * Get the precomputed analysis of a saved passage
+ */
+export async function getPassageAnalysis(passageId) {
+    const mode = getGradingMode();
+    const response = await fetch(`${getApiUrl()}/api/passages/${passageId}/analysis?mode=${mode}&format=compact`);
+
+    if (!response.ok) {
+        throw new Error('지문 분석 결과 조회 실패');
+    }
+
+    return decodeCompactAnalysis(await response.json());
 }
 
 /**
@@ -249,8 +495,39 @@ export async function deleteSession(sessionId) {
     return response.json();
 }
 
+const PURGE_POLL_INTERVAL_MS = 1000;
+
 /**
- * Admin: Clear all sessions
+ * Admin: Get a background purge job ({ status, total, deleted, ... })
+ */
+export async function getPurgeJob(jobId) {
+    const response = await fetch(`${getApiUrl()}/api/manage/purge/${jobId}`);
+
+    if (!response.ok) {
+        throw new Error('삭제 작업 조회 실패');
+    }
+
+    return response.json();
+}
+
+/**
+ * Admin: Poll a purge job until it finishes; onProgress receives each job snapshot
+ */
+export async function waitForPurgeJob(jobId, onProgress) {
+    for (;;) {
+        const job = await getPurgeJob(jobId);
+        if (onProgress) onProgress(job);
+        if (job.status === 'done') return job;
+        if (job.status === 'failed' || job.status === 'cancelled') {
+            throw new Error(job.error || '삭제 작업이 완료되지 않았습니다.');
+        }
+        await new Promise((resolve) => setTimeout(resolve, PURGE_POLL_INTERVAL_MS));
+    }
+}
+
+/**
+ * Admin: Clear all sessions (202: chunked background job on the server).
+ * Resolves with the purge job id; poll it with waitForPurgeJob.
  */
 export async function clearAllSessions() {
     const response = await fetch(`${getApiUrl()}/api/manage/sessions`, {
@@ -261,5 +538,6 @@ export async function clearAllSessions() {
         throw new Error('세션 전체 삭제 실패');
     }
 
-    return response.json();
+    const { jobId } = await response.json();
+    return jobId;
 }
@@ -1,2 +1,2 @@
 # db package
-from .database import init_db, get_db
+from .database import init_db, get_db, get_pool, close_pool
@@ -3,15 +3,27 @@ SQLite Database Connection and Initialization
 """
 import sqlite3
 import os
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
 
+from monitoring.metrics import db_query_seconds, statement_label
+
 # Database file path (anchor to server/ to avoid cwd-dependent paths)
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DEFAULT_DB_PATH = os.path.join(BASE_DIR, "data", "verbgravity.db")
 DB_PATH = os.environ.get("VG_DB_PATH", DEFAULT_DB_PATH)
 
+# Connection pool settings (v1.2)
+POOL_SIZE = int(os.environ.get("VG_DB_POOL_SIZE", "8"))                      # idle connections kept open
+POOL_HEALTH_CHECK_SECONDS = float(os.environ.get("VG_DB_POOL_HEALTH_CHECK", "30"))  # ping connections idle longer than this
+DB_CACHE_KB = int(os.environ.get("VG_DB_CACHE_KB", "8192"))
+DB_MMAP_MB = int(os.environ.get("VG_DB_MMAP_MB", "64"))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("VG_DB_BUSY_TIMEOUT_MS", "5000"))
+
 def init_db():
-    """Initialize database and create tables if not exist."""
+    """Initialize database and apply pending schema migrations (db/migrations.py)."""
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     
     conn = sqlite3.connect(DB_PATH)
@@ -22,94 +34,192 @@ def init_db():
     
     # Enable WAL mode for better concurrency
     cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.close()
     
-    # Create students table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS students (
-            id TEXT PRIMARY KEY,
-            display_name TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Create sessions table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS sessions (
-            id TEXT PRIMARY KEY,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            passage_text TEXT NOT NULL,
-            total_sentences INTEGER,
-            mode TEXT DEFAULT 'FULL'
-        )
-    """)
-    
-    # Create session_student_map table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS session_student_map (
-            session_id TEXT REFERENCES sessions(id) ON DELETE CASCADE,
-            student_id TEXT REFERENCES students(id) ON DELETE CASCADE,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (session_id, student_id)
-        )
-    """)
-    
-    # Create progress table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS progress (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_id TEXT REFERENCES sessions(id) ON DELETE CASCADE,
-            sentence_index INTEGER,
-            root_answer INTEGER,
-            root_correct BOOLEAN,
-            subject_answer INTEGER,
-            subject_correct BOOLEAN,
-            completed_at DATETIME,
-            UNIQUE(session_id, sentence_index)
-        )
-    """)
-    
-    # Create passages table (v1.1)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS passages (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            content TEXT NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # ---------------------------------------------------------
-    # Schema Migration (Hotfix for v1.1.1)
-    # ---------------------------------------------------------
-    check_and_migrate_schema(cursor)
-    
-    conn.commit()
-    conn.close()
-
-def check_and_migrate_schema(cursor):
-    """Check for missing columns and alter table if necessary."""
+    # Create/upgrade tables and indexes
+    # (지연 import: `python -m db.student_stats` 실행 시 중복 import 방지)
+    from .migrations import migrate
     try:
-        # Check 'sessions' table for 'mode' column
-        cursor.execute("PRAGMA table_info(sessions)")
-        columns = [row[1] for row in cursor.fetchall()]
-        
-        if 'mode' not in columns:
-            print("Migrating: Adding 'mode' column to 'sessions' table...")
-            cursor.execute("ALTER TABLE sessions ADD COLUMN mode TEXT DEFAULT 'FULL'")
-            print("Migration successful.")
-            
-    except Exception as e:
-        print(f"Migration warning: {e}")
+        migrate(conn)
+    finally:
+        conn.close()
 
-@contextmanager
-def get_db():
-    """Get database connection context manager."""
-    conn = sqlite3.connect(DB_PATH)
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that records execute() time per statement (vg_db_query_duration_seconds)."""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            db_query_seconds.observe(time.perf_counter() - started, statement_label(sql))
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            db_query_seconds.observe(time.perf_counter() - started, statement_label(sql))
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors (and execute shortcuts) are TimedCursor."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # sqlite3.Connection.execute() bypasses an overridden Cursor.execute
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def open_connection(path: str) -> sqlite3.Connection:
+    """Open a connection and apply the per-connection pragmas once."""
+    conn = sqlite3.connect(path, check_same_thread=False, factory=TimedConnection)
     conn.row_factory = sqlite3.Row
-    # Enable foreign keys for every session
     conn.execute("PRAGMA foreign_keys = ON")
-    try:
+    conn.execute("PRAGMA synchronous = NORMAL")  # safe with WAL
+    conn.execute(f"PRAGMA cache_size = -{DB_CACHE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_MB * 1024 * 1024}")
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    return conn
+
+
+class ConnectionPool:
+    """Reusable SQLite connections.
+
+    A connection is checked out by one thread at a time; nested get_db() calls
+    in the same thread reuse it. Up to `size` idle connections are kept open.
+    """
+
+    def __init__(self, path: str, size: int = POOL_SIZE, health_check_seconds: float = POOL_HEALTH_CHECK_SECONDS):
+        self.path = path
+        self.size = size
+        self.health_check_seconds = health_check_seconds
+        self._idle = deque()  # (conn, released_at)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._in_use = 0
+        self._counters = {"created": 0, "reused": 0, "closed": 0, "healthCheckFailures": 0, "rollbacks": 0}
+
+    def _checkout(self) -> sqlite3.Connection:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, released_at = self._idle.pop()  # LIFO: warmest connection first
+            if time.monotonic() - released_at < self.health_check_seconds or self._is_healthy(conn):
+                with self._lock:
+                    self._counters["reused"] += 1
+                    self._in_use += 1
+                return conn
+            with self._lock:
+                self._counters["healthCheckFailures"] += 1
+            self._close(conn)
+
+        conn = open_connection(self.path)
+        with self._lock:
+            self._counters["created"] += 1
+            self._in_use += 1
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        try:
+            if conn.in_transaction:
+                # Uncommitted work must not leak into the next request
+                conn.rollback()
+                with self._lock:
+                    self._counters["rollbacks"] += 1
+        except sqlite3.Error:
+            with self._lock:
+                self._in_use -= 1
+            self._close(conn)
+            return
+
+        with self._lock:
+            self._in_use -= 1
+            if len(self._idle) < self.size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        self._close(conn)
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _close(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._counters["closed"] += 1
+
+    @contextmanager
+    def connection(self):
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            # Nested use in the same thread shares the checked-out connection
+            yield held
+            return
+
+        conn = self._checkout()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "inUse": self._in_use,
+                **self._counters,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the pool for the current DB_PATH (recreated if DB_PATH changes)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.path != DB_PATH:
+            if _pool is not None:
+                _pool.close_all()
+            _pool = ConnectionPool(DB_PATH)
+        return _pool
+
+
+def close_pool():
+    """Close all idle pooled connections (app shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+@contextmanager
+def get_db():
+    """Get a pooled database connection context manager."""
+    with get_pool().connection() as conn:
         yield conn
-    finally:
-        conn.close()
@@ -0,0 +1,86 @@
+"""
+Database Lanes - v1.2
+
+async 엔드포인트의 sqlite3 호출을 용도별 전용 스레드 풀(lane)에서 실행합니다.
+Starlette 공용 스레드 풀을 쓰지 않으므로, 오래 걸리는 관리자 조회가 학생의
+진행 상황 저장을 기다리게 만들지 않습니다.
+
+- `read_lane`: 대시보드/목록 조회 (`VG_DB_READ_WORKERS`, 기본 4)
+- `write_lane`: 세션 생성, 진행 상황 저장 등 쓰기 경로 (`VG_DB_WRITE_WORKERS`, 기본 1)
+  SQLite는 한 번에 한 writer만 허용하므로 쓰기를 한 스레드에 모아 busy 대기를 줄입니다.
+
+lane 스레드는 `get_db()` 풀 연결을 그대로 사용합니다. (스레드당 한 연결)
+"""
+import os
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+READ_WORKERS = int(os.environ.get("VG_DB_READ_WORKERS", "4"))
+WRITE_WORKERS = int(os.environ.get("VG_DB_WRITE_WORKERS", "1"))
+
+
+class DatabaseLane:
+    """DB 작업 전용 스레드 풀과 async 진입점."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counters = {"completed": 0, "failed": 0}
+        self._max_wait_ms = 0.0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"db-{self.name}")
+            return self._pool
+
+    def shutdown(self) -> None:
+        """실행 중인 작업이 끝날 때까지 기다린 뒤 스레드를 종료합니다. (다음 run에서 다시 생성)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                **self._counters,
+                "maxWaitMs": round(self._max_wait_ms, 1),
+            }
+
+    def _call(self, submitted_at: float, fn: Callable, args: tuple) -> Any:
+        waited_ms = (time.perf_counter() - submitted_at) * 1000
+        with self._lock:
+            self._max_wait_ms = max(self._max_wait_ms, waited_ms)
+        return fn(*args)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """`fn(*args)`를 lane 스레드에서 실행하고 결과를 기다립니다. (예외는 그대로 전달)"""
+        with self._lock:
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_pool(), self._call, time.perf_counter(), fn, args)
+        except BaseException:
+            with self._lock:
+                self._counters["failed"] += 1
+            raise
+        else:
+            with self._lock:
+                self._counters["completed"] += 1
+            return result
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+read_lane = DatabaseLane("read", READ_WORKERS)
+write_lane = DatabaseLane("write", WRITE_WORKERS)
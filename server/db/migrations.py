@@ -0,0 +1,241 @@
+"""
+Schema Migrations - v1.2
+
+`schema_version` 테이블에 적용된 버전을 기록하고, 아직 적용되지 않은 단계를
+버전 순서대로 단계마다 한 트랜잭션으로 실행합니다.
+
+- 모든 단계는 idempotent합니다. (`schema_version`이 없던 v1.0/v1.1 DB도
+  1단계부터 다시 적용하여 같은 스키마가 됨)
+- 새 단계는 목록 끝에 `@migration(다음 번호, "설명")`으로 추가하고,
+  이미 배포된 단계는 수정하지 않습니다.
+"""
+from typing import Callable, List, Optional, Tuple
+
+from .student_stats import create_student_stats
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = []
+
+
+def migration(version: int, description: str):
+    """마이그레이션 단계를 등록합니다. (버전은 1부터 빈틈없이 증가)"""
+    def register(fn: Callable) -> Callable:
+        assert version == len(MIGRATIONS) + 1, f"Migration {version} is out of order"
+        MIGRATIONS.append((version, description, fn))
+        return fn
+    return register
+
+
+@migration(1, "baseline tables (students, sessions, session_student_map, progress, passages)")
+def _baseline_tables(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS students (
+            id TEXT PRIMARY KEY,
+            display_name TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            passage_text TEXT NOT NULL,
+            total_sentences INTEGER,
+            mode TEXT DEFAULT 'FULL'
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS session_student_map (
+            session_id TEXT REFERENCES sessions(id) ON DELETE CASCADE,
+            student_id TEXT REFERENCES students(id) ON DELETE CASCADE,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (session_id, student_id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS progress (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT REFERENCES sessions(id) ON DELETE CASCADE,
+            sentence_index INTEGER,
+            root_answer INTEGER,
+            root_correct BOOLEAN,
+            subject_answer INTEGER,
+            subject_correct BOOLEAN,
+            completed_at DATETIME,
+            UNIQUE(session_id, sentence_index)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS passages (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+@migration(2, "sessions.mode column (v1.1.1 hotfix)")
+def _sessions_mode(cursor):
+    cursor.execute("PRAGMA table_info(sessions)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if 'mode' not in columns:
+        print("Migrating: Adding 'mode' column to 'sessions' table...")
+        cursor.execute("ALTER TABLE sessions ADD COLUMN mode TEXT DEFAULT 'FULL'")
+
+
+@migration(3, "passage_analyses table")
+def _passage_analyses(cursor):
+    # 저장된 지문의 모드별 분석 결과 (AnalysisResponse JSON)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS passage_analyses (
+            passage_id TEXT REFERENCES passages(id) ON DELETE CASCADE,
+            mode TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            analysis_version TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (passage_id, mode)
+        )
+    """)
+
+
+@migration(4, "admin session list indexes (keyset order, mode filter, student filter)")
+def _admin_session_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_created_at_id ON sessions(created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_mode_created_at_id ON sessions(mode, created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_session_student_map_student ON session_student_map(student_id, session_id)")
+
+
+@migration(5, "student_stats summary table and triggers")
+def _student_stats(cursor):
+    create_student_stats(cursor)
+
+
+@migration(6, "lookup indexes (students.display_name, passages.created_at)")
+def _lookup_indexes(cursor):
+    # assign_student의 이름 조회, 지문 목록 정렬
+    # (session_student_map.student_id, sessions.created_at 은 4단계 인덱스가 처리)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_display_name ON students(display_name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_passages_created_at ON passages(created_at)")
+
+
+@migration(7, "revision counters for conditional GET (sessions.revision, table_revisions)")
+def _revision_counters(cursor):
+    # 세션 조회 ETag: 진행 상황이 바뀔 때마다 증가
+    cursor.execute("PRAGMA table_info(sessions)")
+    if 'revision' not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE sessions ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+    for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS sessions_revision_progress_{event.lower()} AFTER {event} ON progress
+            BEGIN
+                UPDATE sessions SET revision = revision + 1 WHERE id = {row}.session_id;
+            END
+        """)
+
+    # 목록 조회 ETag: 테이블 단위 revision (epoch는 DB를 새로 만들면 달라짐)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS table_revisions (
+            name TEXT PRIMARY KEY,
+            epoch TEXT NOT NULL DEFAULT (lower(hex(randomblob(4)))),
+            revision INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO table_revisions (name) VALUES ('passages')")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS table_revisions_passages_{event.lower()} AFTER {event} ON passages
+            BEGIN
+                UPDATE table_revisions SET revision = revision + 1 WHERE name = 'passages';
+            END
+        """)
+
+
+@migration(8, "archived session index and archived per-student stats (retention)")
+def _archive_tables(cursor):
+    # 보관 파일 안의 위치 + 통계 유지용 세션별 집계 (passage_text는 보관 파일에만 있음)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS archived_sessions (
+            session_id TEXT PRIMARY KEY,
+            student_id TEXT REFERENCES students(id) ON DELETE CASCADE,
+            created_at DATETIME,
+            mode TEXT,
+            total_sentences INTEGER NOT NULL DEFAULT 0,
+            completed_sentences INTEGER NOT NULL DEFAULT 0,
+            root_correct INTEGER NOT NULL DEFAULT 0,
+            subject_correct INTEGER NOT NULL DEFAULT 0,
+            last_completed_at DATETIME,
+            archive_file TEXT NOT NULL,
+            archive_offset INTEGER NOT NULL,
+            archive_length INTEGER NOT NULL,
+            archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # 복원된 세션은 복원 시점부터 다시 보관 기간을 셈
+    cursor.execute("PRAGMA table_info(sessions)")
+    if 'restored_at' not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE sessions ADD COLUMN restored_at DATETIME")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_archived_sessions_student ON archived_sessions(student_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_archived_sessions_file ON archived_sessions(archive_file)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS archived_student_stats (
+            student_id TEXT PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+            total_sentences INTEGER NOT NULL DEFAULT 0,
+            completed_sentences INTEGER NOT NULL DEFAULT 0,
+            root_correct INTEGER NOT NULL DEFAULT 0,
+            subject_correct INTEGER NOT NULL DEFAULT 0,
+            last_completed_at DATETIME,
+            mode TEXT
+        )
+    """)
+
+
+LATEST_VERSION = len(MIGRATIONS)
+
+
+def current_version(conn) -> int:
+    """적용된 최신 스키마 버전 (schema_version이 없던 DB는 0)"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return version
+
+
+def migrate(conn, target: Optional[int] = None) -> List[int]:
+    """아직 적용되지 않은 단계를 target(기본값: 최신) 버전까지 적용합니다.
+
+    Returns:
+        이번에 적용한 버전 목록
+    """
+    target = LATEST_VERSION if target is None else target
+    version = current_version(conn)
+    conn.commit()
+
+    applied = []
+    for step, description, fn in MIGRATIONS:
+        if step <= version or step > target:
+            continue
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            fn(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)", (step, description)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            print(f"Migration {step} ({description}) failed.")
+            raise
+        print(f"Migrated schema to version {step}: {description}")
+        applied.append(step)
+    return applied
@@ -0,0 +1,334 @@
+"""
+Purge Jobs - v1.2
+
+세션 대량 삭제를 백그라운드 작업으로 나누어 실행합니다.
+
+- 작업마다 `VG_PURGE_CHUNK_SIZE`개씩 짧은 트랜잭션으로 삭제하고, 묶음 사이에
+  `VG_PURGE_PAUSE_MS`만큼 쉬어 학생의 진행 상황 저장이 WAL 쓰기 잠금을 기다리지 않게 합니다.
+- 대상은 작업 시작 시점의 세션으로 한정합니다. (`rowid <= 시작 시 최대 rowid`)
+  보관된 세션(archived_sessions)도 같은 조건으로 함께 지웁니다.
+- 삭제한 작업이 끝나면 `wal_checkpoint(TRUNCATE)`로 WAL 파일을 줄이고, 여유 페이지가
+  `VG_VACUUM_FREE_RATIO` 이상이면 `VG_VACUUM_INTERVAL_SECONDS`마다 최대 한 번 VACUUM을 실행합니다.
+  (잠금 등으로 실패하면 `VG_VACUUM_RETRY_SECONDS` 뒤에 다시 시도)
+- 작업 상태는 메모리에만 보관합니다. (최근 `MAX_JOBS`개, 재시작 시 사라짐)
+"""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from .database import get_db
+
+CHUNK_SIZE = int(os.environ.get("VG_PURGE_CHUNK_SIZE", "200"))
+PAUSE_MS = int(os.environ.get("VG_PURGE_PAUSE_MS", "20"))
+VACUUM_FREE_RATIO = float(os.environ.get("VG_VACUUM_FREE_RATIO", "0.25"))
+VACUUM_INTERVAL_SECONDS = int(os.environ.get("VG_VACUUM_INTERVAL_SECONDS", "3600"))
+VACUUM_RETRY_SECONDS = int(os.environ.get("VG_VACUUM_RETRY_SECONDS", "60"))
+MAX_JOBS = 50
+
+PURGE_KINDS = ("ids", "student", "older_than", "all")
+
+
+class PurgeManager:
+    """세션 삭제 작업 대기열과 이를 처리하는 단일 worker 스레드."""
+
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        pause_ms: int = PAUSE_MS,
+        vacuum_free_ratio: float = VACUUM_FREE_RATIO,
+        vacuum_interval_seconds: int = VACUUM_INTERVAL_SECONDS,
+        vacuum_retry_seconds: int = VACUUM_RETRY_SECONDS,
+    ):
+        self.chunk_size = chunk_size
+        self.pause = pause_ms / 1000
+        self.vacuum_free_ratio = vacuum_free_ratio
+        self.vacuum_interval = vacuum_interval_seconds
+        self.vacuum_retry = vacuum_retry_seconds
+
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._vacuum_due = False
+        self._last_vacuum: Optional[float] = None
+        self._vacuum_failed_at: Optional[float] = None  # 마지막 VACUUM 실패 시각 (성공하면 None)
+        self._counters = {"deleted": 0, "checkpoints": 0, "vacuums": 0, "vacuumFailures": 0}
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="purge-jobs", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """진행 중인 묶음까지 끝내고 worker를 종료합니다. (남은 작업은 cancelled)"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._thread = None
+        with self._cond:
+            while self._queue:
+                self._finish(self._jobs[self._queue.popleft()], "cancelled")
+
+    def submit(self, kind: str, session_ids: Optional[List[str]] = None, student_id: Optional[str] = None,
+               before: Optional[str] = None) -> dict:
+        """삭제 작업을 대기열에 넣고 작업 정보를 반환합니다.
+
+        - ids: session_ids의 세션
+        - student: student_id에 배정된 세션 전부와 학생
+        - older_than: created_at < before 인 세션
+        - all: 모든 세션
+        """
+        if kind not in PURGE_KINDS:
+            raise ValueError(f"Unknown purge kind: {kind}")
+        job = {
+            "id": str(uuid.uuid4()),
+            "kind": kind,
+            "status": "queued",
+            "total": None,
+            "deleted": 0,
+            "createdAt": datetime.utcnow().isoformat(),
+            "startedAt": None,
+            "finishedAt": None,
+            "error": None,
+        }
+        with self._cond:
+            self._jobs[job["id"]] = job
+            # 중복 id는 한 번만 (순서 유지; total과 묶음이 같은 목록을 기준으로 함)
+            job["_args"] = (list(dict.fromkeys(session_ids or [])), student_id, before)
+            while len(self._jobs) > MAX_JOBS:
+                oldest = next((job_id for job_id, j in self._jobs.items() if j["status"] not in ("queued", "running")), None)
+                if oldest is None:
+                    break
+                del self._jobs[oldest]
+            self._queue.append(job["id"])
+            self._cond.notify_all()
+        self.start()
+        return self.get(job["id"])
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            return {k: v for k, v in job.items() if not k.startswith("_")} if job else None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[dict]:
+        """작업이 끝날 때까지 기다립니다. (테스트/CLI용)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._jobs.get(job_id, {}).get("status") in ("queued", "running"):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        return self.get(job_id)
+
+    def jobs(self) -> List[dict]:
+        """최근 작업 목록 (최신 순)"""
+        with self._cond:
+            job_ids = list(reversed(self._jobs))
+        return [self.get(job_id) for job_id in job_ids]
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "chunkSize": self.chunk_size,
+                "pauseMs": int(self.pause * 1000),
+                "vacuumDue": self._vacuum_due,
+                "lastVacuumAt": (
+                    datetime.utcfromtimestamp(self._last_vacuum).isoformat() if self._last_vacuum else None
+                ),
+                **self._counters,
+            }
+
+    def _finish(self, job: dict, status: str, error: Optional[str] = None) -> None:
+        job["status"] = status
+        job["error"] = error
+        job["finishedAt"] = datetime.utcnow().isoformat()
+        job.pop("_args", None)
+        self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    # 대기 중에도 주기적으로 VACUUM 필요 여부 확인
+                    if not self._cond.wait(self._maintenance_wait()):
+                        break
+                if self._stopping:
+                    return
+                job = self._jobs[self._queue.popleft()] if self._queue else None
+            if job is not None:
+                self._execute(job)
+            try:
+                if job is not None and job["deleted"]:
+                    self.checkpoint()
+                self.run_maintenance()
+            except Exception as e:
+                # 다른 연결이 잠금을 잡고 있으면 다음 주기에 다시 시도
+                print(f"[PurgeManager] Maintenance failed: {e}")
+
+    def _maintenance_wait(self) -> Optional[float]:
+        if not self._vacuum_due:
+            return None
+        return max(0.0, self._next_vacuum_at() - time.time())
+
+    def _next_vacuum_at(self) -> float:
+        """다음 VACUUM 검사가 가능한 시각 (주기 + 실패 후 재시도 간격)"""
+        next_at = 0.0 if self._last_vacuum is None else self._last_vacuum + self.vacuum_interval
+        if self._vacuum_failed_at is not None:
+            next_at = max(next_at, self._vacuum_failed_at + self.vacuum_retry)
+        return next_at
+
+    def _selector(self, job: dict, max_rowid: int) -> Tuple[str, tuple]:
+        """작업 대상 세션 id를 한 묶음씩 고르는 쿼리."""
+        session_ids, student_id, before = job["_args"]
+        if job["kind"] == "student":
+            return (
+                "SELECT sess.id FROM sessions sess JOIN session_student_map m ON m.session_id = sess.id "
+                "WHERE m.student_id = ? AND sess.rowid <= ? LIMIT ?",
+                (student_id, max_rowid),
+            )
+        if job["kind"] == "older_than":
+            return "SELECT id FROM sessions WHERE created_at < ? AND rowid <= ? LIMIT ?", (before, max_rowid)
+        return "SELECT id FROM sessions WHERE rowid <= ? LIMIT ?", (max_rowid,)
+
+    def _archived_selector(self, job: dict) -> Tuple[str, tuple]:
+        """보관된 세션 중 작업 대상을 한 묶음씩 고르는 쿼리."""
+        session_ids, student_id, before = job["_args"]
+        if job["kind"] == "student":
+            return "SELECT session_id FROM archived_sessions WHERE student_id = ? LIMIT ?", (student_id,)
+        if job["kind"] == "older_than":
+            return "SELECT session_id FROM archived_sessions WHERE created_at < ? LIMIT ?", (before,)
+        return "SELECT session_id FROM archived_sessions LIMIT ?", ()
+
+    def _next_chunk(self, job: dict, max_rowid: int) -> List[str]:
+        if job["kind"] == "ids":
+            ids = job["_args"][0]
+            chunk, job["_args"] = ids[:self.chunk_size], (ids[self.chunk_size:], *job["_args"][1:])
+            return chunk
+        # hot DB의 세션을 모두 지운 뒤 보관된 세션
+        with get_db() as conn:
+            for sql, params in (self._selector(job, max_rowid), self._archived_selector(job)):
+                chunk = [row[0] for row in conn.execute(sql, (*params, self.chunk_size)).fetchall()]
+                if chunk:
+                    return chunk
+        return []
+
+    def _count(self, job: dict, max_rowid: int) -> int:
+        if job["kind"] == "ids":
+            return len(job["_args"][0])
+        with get_db() as conn:
+            return sum(
+                conn.execute(f"SELECT COUNT(*) FROM ({sql})", (*params, -1)).fetchone()[0]
+                for sql, params in (self._selector(job, max_rowid), self._archived_selector(job))
+            )
+
+    def _execute(self, job: dict) -> None:
+        # retention이 purge_manager를 import하므로 여기서 가져옴
+        from .retention import delete_archived_sessions, retention_manager
+
+        with self._cond:
+            job["status"] = "running"
+            job["startedAt"] = datetime.utcnow().isoformat()
+        try:
+            with get_db() as conn:
+                max_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM sessions").fetchone()[0]
+            total = self._count(job, max_rowid)
+            with self._cond:
+                job["total"] = total
+
+            archived = 0
+            while not self._stopping:
+                chunk = self._next_chunk(job, max_rowid)
+                if not chunk:
+                    break
+                with get_db() as conn:
+                    placeholders = ", ".join("?" * len(chunk))
+                    deleted = conn.execute(f"DELETE FROM sessions WHERE id IN ({placeholders})", chunk).rowcount
+                    archived_deleted = delete_archived_sessions(conn, chunk)
+                    conn.commit()
+                archived += archived_deleted
+                deleted += archived_deleted
+                with self._cond:
+                    job["deleted"] += deleted
+                    self._counters["deleted"] += deleted
+                    if deleted:
+                        self._vacuum_due = True
+                    self._cond.notify_all()
+                time.sleep(self.pause)
+
+            if archived:
+                retention_manager.remove_unreferenced_files()
+            if self._stopping:
+                with self._cond:
+                    self._finish(job, "cancelled")
+                return
+
+            if job["kind"] == "student":
+                with get_db() as conn:
+                    conn.execute("DELETE FROM students WHERE id = ?", (job["_args"][1],))
+                    conn.commit()
+            with self._cond:
+                self._finish(job, "done")
+        except Exception as e:
+            print(f"[PurgeManager] Job {job['id']} ({job['kind']}) failed: {e}")
+            with self._cond:
+                self._finish(job, "failed", str(e))
+
+    def mark_vacuum_due(self) -> None:
+        """다른 작업(보관 등)이 많은 행을 지운 뒤 VACUUM 검사를 요청합니다."""
+        with self._cond:
+            self._vacuum_due = True
+            self._cond.notify_all()
+
+    def checkpoint(self) -> None:
+        """WAL 내용을 DB 파일에 반영하고 WAL 파일을 비웁니다."""
+        with get_db() as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        with self._cond:
+            self._counters["checkpoints"] += 1
+
+    def run_maintenance(self, force: bool = False) -> bool:
+        """삭제로 생긴 여유 페이지가 충분하고 주기가 지났으면 VACUUM합니다. 실행 여부를 반환합니다."""
+        with self._cond:
+            if not force and not (self._vacuum_due and time.time() >= self._next_vacuum_at()):
+                return False
+
+        try:
+            with get_db() as conn:
+                page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if not force and (not page_count or free_pages / page_count < self.vacuum_free_ratio):
+                    with self._cond:
+                        self._vacuum_due = False
+                        self._vacuum_failed_at = None
+                    return False
+                conn.execute("VACUUM")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        except Exception:
+            # 바로 다시 시도하지 않도록 실패 시각 기록 (worker가 대기 없이 반복하는 것 방지)
+            with self._cond:
+                self._vacuum_failed_at = time.time()
+                self._counters["vacuumFailures"] += 1
+            raise
+
+        with self._cond:
+            self._vacuum_due = False
+            self._vacuum_failed_at = None
+            self._last_vacuum = time.time()
+            self._counters["vacuums"] += 1
+        print(f"[PurgeManager] VACUUM done ({free_pages}/{page_count} pages were free).")
+        return True
+
+
+purge_manager = PurgeManager()
@@ -0,0 +1,298 @@
+"""
+Session Retention - v1.2
+
+`VG_RETENTION_DAYS`보다 오래된 세션을 압축 보관 파일로 옮기고 hot DB에서 삭제합니다.
+
+- 보관 파일: `<DB 폴더>/archive/sessions-YYYYMMDD-HHMMSS.jsonl.gz` (`VG_ARCHIVE_DIR`로 변경 가능)
+  세션마다 gzip 멤버 하나({"session", "studentId", "progress"} JSON 한 줄)를 이어 붙이므로
+  파일 전체는 일반 `.jsonl.gz`로 읽을 수 있고, 세션 하나는 offset/length로 바로 복원합니다.
+- hot DB에는 `archived_sessions`(파일 위치 + 세션별 집계)와 `archived_student_stats`
+  (학생별 합계, 대시보드에서 student_stats와 합산)만 남습니다.
+- `restore(session_id)`: 보관된 세션을 id로 조회하면 hot DB로 되돌립니다.
+  (`sessions.restored_at`부터 다시 보관 기간을 셈)
+- 세션 삭제(DELETE /api/sessions/{id}, 정리 작업)는 보관된 세션도 함께 지웁니다.
+- `VG_RETENTION_DAYS=0`(기본값)이면 자동 보관을 하지 않습니다.
+  실행 주기는 `VG_RETENTION_INTERVAL_SECONDS`입니다.
+"""
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from . import database
+from .database import get_db
+from .purge import purge_manager
+
+RETENTION_DAYS = int(os.environ.get("VG_RETENTION_DAYS", "0"))
+RETENTION_INTERVAL_SECONDS = int(os.environ.get("VG_RETENTION_INTERVAL_SECONDS", "86400"))
+ARCHIVE_BATCH_SIZE = int(os.environ.get("VG_ARCHIVE_BATCH_SIZE", "200"))
+ARCHIVE_DIR = os.environ.get("VG_ARCHIVE_DIR")
+
+# 학생 한 명의 보관된 세션 합계 (archived_sessions 기준)
+_RECOMPUTE_ARCHIVED_STATS_SQL = """
+    INSERT INTO archived_student_stats
+    (student_id, total_sentences, completed_sentences, root_correct, subject_correct, last_completed_at, mode)
+    SELECT :student_id, COALESCE(SUM(total_sentences), 0), COALESCE(SUM(completed_sentences), 0),
+           COALESCE(SUM(root_correct), 0), COALESCE(SUM(subject_correct), 0), MAX(last_completed_at),
+           (SELECT mode FROM archived_sessions WHERE student_id = :student_id ORDER BY created_at DESC LIMIT 1)
+    FROM archived_sessions WHERE student_id = :student_id
+    ON CONFLICT(student_id) DO UPDATE SET
+        total_sentences = excluded.total_sentences,
+        completed_sentences = excluded.completed_sentences,
+        root_correct = excluded.root_correct,
+        subject_correct = excluded.subject_correct,
+        last_completed_at = excluded.last_completed_at,
+        mode = excluded.mode
+"""
+
+
+def archive_dir() -> str:
+    return ARCHIVE_DIR or os.path.join(os.path.dirname(database.DB_PATH), "archive")
+
+
+def _recompute_archived_stats(conn, student_ids) -> None:
+    for student_id in student_ids:
+        if student_id is not None:
+            conn.execute(_RECOMPUTE_ARCHIVED_STATS_SQL, {"student_id": student_id})
+
+
+def delete_archived_sessions(conn, session_ids) -> int:
+    """보관된 세션 색인을 지우고 학생별 보관 합계를 다시 계산합니다. (commit은 호출한 쪽에서)
+
+    보관 파일 안의 기록은 남지만 색인이 없으면 복원되지 않고,
+    참조가 없어진 파일은 `remove_unreferenced_files()`에서 지워집니다.
+    """
+    if not session_ids:
+        return 0
+    placeholders = ", ".join("?" * len(session_ids))
+    students = {row[0] for row in conn.execute(
+        f"SELECT DISTINCT student_id FROM archived_sessions WHERE session_id IN ({placeholders})", list(session_ids)
+    )}
+    deleted = conn.execute(
+        f"DELETE FROM archived_sessions WHERE session_id IN ({placeholders})", list(session_ids)
+    ).rowcount
+    _recompute_archived_stats(conn, students)
+    return deleted
+
+
+class RetentionManager:
+    """오래된 세션 보관/복원과 주기 실행 스레드."""
+
+    def __init__(
+        self,
+        days: int = RETENTION_DAYS,
+        interval_seconds: int = RETENTION_INTERVAL_SECONDS,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+    ):
+        self.days = days
+        self.interval = interval_seconds
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()  # 보관/복원은 한 번에 하나씩
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_run: Optional[dict] = None
+        self._counters = {"archived": 0, "restored": 0, "filesRemoved": 0}
+
+    def start(self) -> None:
+        self._stop.clear()
+        if self.days <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._run, name="session-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[Retention] Archive run failed: {e}")
+            self._stop.wait(self.interval)
+
+    def run_once(self, days: Optional[int] = None, now: Optional[datetime] = None) -> dict:
+        """created_at이 (now - days)보다 오래된 세션을 모두 보관합니다."""
+        days = self.days if days is None else days
+        now = now or datetime.utcnow()
+        cutoff = (now - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+
+        with self._lock:
+            os.makedirs(archive_dir(), exist_ok=True)
+            file_name = self._new_file_name(now)
+            archived = 0
+            while not self._stop.is_set():
+                count = self._archive_batch(cutoff, file_name)
+                if not count:
+                    break
+                archived += count
+            removed = self._remove_unreferenced_files()
+
+            result = {"cutoff": cutoff, "archived": archived, "file": file_name if archived else None,
+                      "filesRemoved": removed, "finishedAt": datetime.utcnow().isoformat()}
+            self._last_run = result
+            self._counters["archived"] += archived
+            self._counters["filesRemoved"] += removed
+
+        if archived:
+            print(f"[Retention] Archived {archived} sessions older than {cutoff} to {file_name}.")
+            purge_manager.mark_vacuum_due()
+        return result
+
+    def _new_file_name(self, now: datetime) -> str:
+        base = f"sessions-{now.strftime('%Y%m%d-%H%M%S')}"
+        name, n = f"{base}.jsonl.gz", 1
+        while os.path.exists(os.path.join(archive_dir(), name)):
+            n += 1
+            name = f"{base}-{n}.jsonl.gz"
+        return name
+
+    def _archive_batch(self, cutoff: str, file_name: str) -> int:
+        with get_db() as conn:
+            sessions = conn.execute(
+                "SELECT * FROM sessions WHERE created_at < ? AND (restored_at IS NULL OR restored_at < ?) "
+                "ORDER BY created_at, id LIMIT ?",
+                (cutoff, cutoff, self.batch_size)
+            ).fetchall()
+            if not sessions:
+                return 0
+
+            session_ids = [row["id"] for row in sessions]
+            placeholders = ", ".join("?" * len(session_ids))
+            progress = {session_id: [] for session_id in session_ids}
+            for row in conn.execute(
+                f"SELECT * FROM progress WHERE session_id IN ({placeholders}) ORDER BY session_id, sentence_index",
+                session_ids
+            ):
+                item = dict(row)
+                item.pop("id")
+                progress[row["session_id"]].append(item)
+            students = dict(conn.execute(
+                f"SELECT session_id, student_id FROM session_student_map WHERE session_id IN ({placeholders})",
+                session_ids
+            ).fetchall())
+
+            # 보관 파일에 먼저 기록(fsync)한 뒤 hot DB에서 삭제
+            entries = []
+            with open(os.path.join(archive_dir(), file_name), "ab") as f:
+                for session in sessions:
+                    session_id = session["id"]
+                    record = {"session": dict(session), "studentId": students.get(session_id), "progress": progress[session_id]}
+                    data = gzip.compress((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+                    offset = f.tell()
+                    f.write(data)
+                    items = progress[session_id]
+                    entries.append((
+                        session_id,
+                        students.get(session_id),
+                        session["created_at"],
+                        session["mode"],
+                        session["total_sentences"] or 0,
+                        len(items),
+                        sum(1 for p in items if p["root_correct"]),
+                        sum(1 for p in items if p["subject_correct"]),
+                        max((p["completed_at"] for p in items if p["completed_at"]), default=None),
+                        file_name,
+                        offset,
+                        len(data),
+                    ))
+                f.flush()
+                os.fsync(f.fileno())
+
+            conn.executemany("""
+                INSERT OR REPLACE INTO archived_sessions
+                (session_id, student_id, created_at, mode, total_sentences, completed_sentences,
+                 root_correct, subject_correct, last_completed_at, archive_file, archive_offset, archive_length)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, entries)
+            conn.execute(f"DELETE FROM sessions WHERE id IN ({placeholders})", session_ids)
+            _recompute_archived_stats(conn, set(students.values()))
+            conn.commit()
+        return len(sessions)
+
+    def restore(self, session_id: str) -> bool:
+        """보관된 세션을 hot DB로 되돌립니다. 보관된 세션이 아니면 False."""
+        with self._lock, get_db() as conn:
+            entry = conn.execute(
+                "SELECT archive_file, archive_offset, archive_length FROM archived_sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+            if entry is None:
+                return False
+
+            with open(os.path.join(archive_dir(), entry["archive_file"]), "rb") as f:
+                f.seek(entry["archive_offset"])
+                record = json.loads(gzip.decompress(f.read(entry["archive_length"])))
+
+            session_columns = [row[1] for row in conn.execute("PRAGMA table_info(sessions)")]
+            session = {k: v for k, v in record["session"].items() if k in session_columns}
+            session["restored_at"] = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            conn.execute(
+                f"INSERT INTO sessions ({', '.join(session)}) VALUES ({', '.join('?' * len(session))})",
+                list(session.values())
+            )
+            for item in record["progress"]:
+                conn.execute(
+                    f"INSERT INTO progress ({', '.join(item)}) VALUES ({', '.join('?' * len(item))})",
+                    list(item.values())
+                )
+            student_id = record["studentId"]
+            if student_id is not None:
+                # 그 사이 삭제된 학생이면 배정 없이 복원
+                conn.execute(
+                    "INSERT INTO session_student_map (session_id, student_id) "
+                    "SELECT ?, id FROM students WHERE id = ?",
+                    (session_id, student_id)
+                )
+            conn.execute("DELETE FROM archived_sessions WHERE session_id = ?", (session_id,))
+            _recompute_archived_stats(conn, [student_id])
+            conn.commit()
+            self._counters["restored"] += 1
+        return True
+
+    def remove_unreferenced_files(self) -> int:
+        """보관 실행과 겹치지 않게 참조가 없는 보관 파일을 지웁니다. (세션 삭제 후 호출)"""
+        with self._lock:
+            removed = self._remove_unreferenced_files()
+            self._counters["filesRemoved"] += removed
+        return removed
+
+    def _remove_unreferenced_files(self) -> int:
+        """모든 세션이 복원되었거나 삭제로 참조가 없어진 보관 파일을 지웁니다."""
+        with get_db() as conn:
+            referenced = {row[0] for row in conn.execute("SELECT DISTINCT archive_file FROM archived_sessions")}
+        removed = 0
+        for name in self._archive_files():
+            if name not in referenced:
+                os.remove(os.path.join(archive_dir(), name))
+                removed += 1
+        return removed
+
+    def _archive_files(self) -> List[str]:
+        if not os.path.isdir(archive_dir()):
+            return []
+        return sorted(name for name in os.listdir(archive_dir()) if name.endswith(".jsonl.gz"))
+
+    def stats(self) -> dict:
+        with get_db() as conn:
+            archived = conn.execute("SELECT COUNT(*) FROM archived_sessions").fetchone()[0]
+        files = self._archive_files()
+        return {
+            "retentionDays": self.days,
+            "intervalSeconds": self.interval,
+            "archiveDir": archive_dir(),
+            "archivedSessions": archived,
+            "archiveFiles": len(files),
+            "archiveBytes": sum(os.path.getsize(os.path.join(archive_dir(), name)) for name in files),
+            "lastRun": self._last_run,
+            **self._counters,
+        }
+
+
+retention_manager = RetentionManager()
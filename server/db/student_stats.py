@@ -0,0 +1,208 @@
+"""
+Student Statistics Summary - v1.2
+
+교사 대시보드용 학생별 요약(`student_stats`)을 트리거로 갱신합니다.
+
+- 진행 상황 저장/수정/삭제: 해당 세션의 학생 행에 증감만 반영
+- 세션 배정/해제(세션 삭제로 인한 CASCADE 포함): 해당 학생 행을 다시 계산
+- 학생 추가/삭제: 빈 행 추가 / CASCADE 삭제
+
+Usage (server/ 에서):
+    python -m db.student_stats --verify    # 원본 테이블과 비교
+    python -m db.student_stats --rebuild   # 원본 테이블로 다시 생성
+"""
+import argparse
+import sqlite3
+from typing import List
+
+# 원본 테이블에서 학생 한 명(:student)의 요약을 계산하는 식
+_STATS_COLUMNS = {
+    "total_sentences": """
+        SELECT COALESCE(SUM(sess.total_sentences), 0)
+        FROM session_student_map m JOIN sessions sess ON m.session_id = sess.id
+        WHERE m.student_id = {student}""",
+    "completed_sentences": """
+        SELECT COUNT(*)
+        FROM session_student_map m JOIN progress p ON p.session_id = m.session_id
+        WHERE m.student_id = {student}""",
+    "root_correct": """
+        SELECT COALESCE(SUM(CASE WHEN p.root_correct = 1 THEN 1 ELSE 0 END), 0)
+        FROM session_student_map m JOIN progress p ON p.session_id = m.session_id
+        WHERE m.student_id = {student}""",
+    "subject_correct": """
+        SELECT COALESCE(SUM(CASE WHEN p.subject_correct = 1 THEN 1 ELSE 0 END), 0)
+        FROM session_student_map m JOIN progress p ON p.session_id = m.session_id
+        WHERE m.student_id = {student}""",
+    "last_completed_at": """
+        SELECT MAX(p.completed_at)
+        FROM session_student_map m JOIN progress p ON p.session_id = m.session_id
+        WHERE m.student_id = {student}""",
+    "mode": """
+        SELECT sess.mode
+        FROM session_student_map m JOIN sessions sess ON m.session_id = sess.id
+        WHERE m.student_id = {student}
+        ORDER BY sess.created_at DESC
+        LIMIT 1""",
+}
+
+
+def _recompute_sql(student: str) -> str:
+    assignments = ",\n".join(
+        f"{column} = ({query.format(student=student)})" for column, query in _STATS_COLUMNS.items()
+    )
+    return f"UPDATE student_stats SET\n{assignments}\nWHERE student_id = {student};"
+
+
+def _progress_delta_sql(session: str, sign: str, row: str) -> str:
+    return f"""
+        UPDATE student_stats SET
+            completed_sentences = completed_sentences {sign} 1,
+            root_correct = root_correct {sign} ({row}.root_correct = 1),
+            subject_correct = subject_correct {sign} ({row}.subject_correct = 1)
+        WHERE student_id IN (SELECT student_id FROM session_student_map WHERE session_id = {session});"""
+
+
+def _latest_completed_sql(session: str) -> str:
+    return f"""
+        UPDATE student_stats SET
+            last_completed_at = CASE
+                WHEN last_completed_at IS NULL OR NEW.completed_at > last_completed_at THEN NEW.completed_at
+                ELSE last_completed_at
+            END
+        WHERE student_id IN (SELECT student_id FROM session_student_map WHERE session_id = {session});"""
+
+
+STUDENT_STATS_TABLE = """
+    CREATE TABLE IF NOT EXISTS student_stats (
+        student_id TEXT PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+        total_sentences INTEGER NOT NULL DEFAULT 0,
+        completed_sentences INTEGER NOT NULL DEFAULT 0,
+        root_correct INTEGER NOT NULL DEFAULT 0,
+        subject_correct INTEGER NOT NULL DEFAULT 0,
+        last_completed_at DATETIME,
+        mode TEXT
+    )
+"""
+
+STUDENT_STATS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS student_stats_student_insert AFTER INSERT ON students
+    BEGIN
+        INSERT OR IGNORE INTO student_stats (student_id) VALUES (NEW.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS student_stats_map_insert AFTER INSERT ON session_student_map
+    BEGIN
+        INSERT OR IGNORE INTO student_stats (student_id) VALUES (NEW.student_id);
+        {_recompute_sql("NEW.student_id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS student_stats_map_delete AFTER DELETE ON session_student_map
+    BEGIN
+        {_recompute_sql("OLD.student_id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS student_stats_progress_insert AFTER INSERT ON progress
+    BEGIN
+        {_progress_delta_sql("NEW.session_id", "+", "NEW")}
+        {_latest_completed_sql("NEW.session_id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS student_stats_progress_update AFTER UPDATE ON progress
+    BEGIN
+        {_progress_delta_sql("OLD.session_id", "-", "OLD")}
+        {_progress_delta_sql("NEW.session_id", "+", "NEW")}
+        {_latest_completed_sql("NEW.session_id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS student_stats_progress_delete AFTER DELETE ON progress
+    BEGIN
+        {_progress_delta_sql("OLD.session_id", "-", "OLD")}
+        UPDATE student_stats SET
+            last_completed_at = ({_STATS_COLUMNS["last_completed_at"].format(student="student_stats.student_id")})
+        WHERE student_id IN (SELECT student_id FROM session_student_map WHERE session_id = OLD.session_id);
+    END
+    """,
+]
+
+# 원본 테이블에서 계산한 전체 학생 요약 (rebuild/verify 기준)
+_LIVE_STATS_SQL = "SELECT s.id AS student_id, " + ", ".join(
+    f"({query.format(student='s.id')}) AS {column}" for column, query in _STATS_COLUMNS.items()
+) + " FROM students s"
+
+
+def create_student_stats(cursor) -> None:
+    """student_stats 테이블과 트리거를 만듭니다. 테이블이 새로 생기면 채워 넣습니다."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'student_stats'")
+    existed = cursor.fetchone() is not None
+
+    cursor.execute(STUDENT_STATS_TABLE)
+    for trigger in STUDENT_STATS_TRIGGERS:
+        cursor.execute(trigger)
+
+    if not existed:
+        rebuild_student_stats(cursor)
+
+
+def rebuild_student_stats(cursor) -> int:
+    """원본 테이블에서 student_stats를 다시 계산합니다. (커밋은 호출자가 함)"""
+    cursor.execute("DELETE FROM student_stats")
+    columns = ", ".join(["student_id", *_STATS_COLUMNS])
+    cursor.execute(f"INSERT INTO student_stats ({columns}) {_LIVE_STATS_SQL}")
+    return cursor.rowcount
+
+
+def verify_student_stats(cursor) -> List[dict]:
+    """student_stats와 원본 테이블에서 계산한 값이 다른 학생 목록을 반환합니다."""
+    columns = ["student_id", *_STATS_COLUMNS]
+    cursor.execute(_LIVE_STATS_SQL)
+    live = {row[0]: tuple(row) for row in cursor.fetchall()}
+    cursor.execute(f"SELECT {', '.join(columns)} FROM student_stats")
+    stored = {row[0]: tuple(row) for row in cursor.fetchall()}
+
+    mismatches = []
+    for student_id in sorted(live.keys() | stored.keys()):
+        expected, actual = live.get(student_id), stored.get(student_id)
+        if expected != actual:
+            mismatches.append({
+                "studentId": student_id,
+                "expected": dict(zip(columns, expected)) if expected else None,
+                "actual": dict(zip(columns, actual)) if actual else None,
+            })
+    return mismatches
+
+
+def main():
+    from . import database
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="원본 테이블로 student_stats 다시 생성")
+    parser.add_argument("--verify", action="store_true", help="student_stats와 원본 테이블 비교")
+    args = parser.parse_args()
+
+    database.init_db()
+    conn = sqlite3.connect(database.DB_PATH)
+    try:
+        cursor = conn.cursor()
+        if args.rebuild:
+            count = rebuild_student_stats(cursor)
+            conn.commit()
+            print(f"Rebuilt student_stats for {count} students.")
+        if args.verify or not args.rebuild:
+            mismatches = verify_student_stats(cursor)
+            for mismatch in mismatches:
+                print(f"Mismatch for {mismatch['studentId']}: expected {mismatch['expected']}, got {mismatch['actual']}")
+            print("student_stats OK." if not mismatches else f"{len(mismatches)} students out of date.")
+            if mismatches:
+                raise SystemExit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
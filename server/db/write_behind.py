@@ -0,0 +1,222 @@
+"""
+Progress Write-Behind Queue - v1.2
+
+진행 상황 저장(upsert)을 메모리 대기열에 넣고 단일 writer 스레드가
+`VG_PROGRESS_FLUSH_MS`마다 또는 `VG_PROGRESS_FLUSH_ROWS`개가 모이면
+한 트랜잭션으로 묶어 커밋합니다. (group commit)
+
+- 같은 (session_id, sentence_index)에 대한 대기 중인 쓰기는 마지막 값만 남습니다.
+- `pending_for(session_id)`로 아직 커밋되지 않은 쓰기를 조회할 수 있습니다. (read-your-writes)
+- 대기열이 `VG_PROGRESS_QUEUE_SIZE`를 넘으면 `ProgressQueueFull`을 발생시킵니다.
+- 잠금 등 일시적 오류(`sqlite3.OperationalError`)면 묶음을 대기열로 되돌려
+  `VG_PROGRESS_RETRY_MS`부터 두 배씩 늘려 가며 `VG_PROGRESS_RETRIES`번까지 다시 시도합니다.
+  (그 사이 들어온 같은 문장의 쓰기가 우선) 다른 오류나 재시도를 모두 실패하면 버립니다.
+- 종료 시 `stop()`이 남은 쓰기를 모두 커밋합니다.
+- `VG_PROGRESS_WRITE_BEHIND=0`이면 호출 스레드에서 바로 커밋합니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .database import get_db
+
+FLUSH_INTERVAL_MS = int(os.environ.get("VG_PROGRESS_FLUSH_MS", "50"))
+FLUSH_MAX_ROWS = int(os.environ.get("VG_PROGRESS_FLUSH_ROWS", "500"))
+MAX_PENDING_ROWS = int(os.environ.get("VG_PROGRESS_QUEUE_SIZE", "10000"))
+WRITE_BEHIND_ENABLED = os.environ.get("VG_PROGRESS_WRITE_BEHIND", "1") == "1"
+MAX_RETRIES = int(os.environ.get("VG_PROGRESS_RETRIES", "5"))
+RETRY_BACKOFF_MS = int(os.environ.get("VG_PROGRESS_RETRY_MS", "100"))
+
+# ON CONFLICT DO UPDATE (not INSERT OR REPLACE) so student_stats update triggers see OLD/NEW
+UPSERT_PROGRESS_SQL = """
+    INSERT INTO progress
+    (session_id, sentence_index, root_answer, root_correct, subject_answer, subject_correct, completed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_id, sentence_index) DO UPDATE SET
+        root_answer = excluded.root_answer,
+        root_correct = excluded.root_correct,
+        subject_answer = excluded.subject_answer,
+        subject_correct = excluded.subject_correct,
+        completed_at = excluded.completed_at
+"""
+
+# (session_id, sentence_index, root_answer, root_correct, subject_answer, subject_correct, completed_at)
+ProgressRow = Tuple[str, int, Optional[int], bool, Optional[int], bool, str]
+
+
+class ProgressQueueFull(Exception):
+    """쓰기 대기열이 가득 찬 경우."""
+
+
+class ProgressWriter:
+    """진행 상황 upsert를 모아서 커밋하는 write-behind 대기열."""
+
+    def __init__(
+        self,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+        max_rows: int = FLUSH_MAX_ROWS,
+        max_pending: int = MAX_PENDING_ROWS,
+        enabled: bool = WRITE_BEHIND_ENABLED,
+        max_retries: int = MAX_RETRIES,
+        retry_backoff_ms: int = RETRY_BACKOFF_MS,
+    ):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self.enabled = enabled
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff_ms / 1000
+
+        self._pending: Dict[Tuple[str, int], ProgressRow] = {}
+        self._writing: Dict[Tuple[str, int], ProgressRow] = {}  # 커밋 중인 묶음 (커밋 전까지 읽기에 포함)
+        self._cond = threading.Condition()
+        self._drain_lock = threading.Lock()  # 한 번에 한 묶음만 커밋
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._failures = 0  # 연속으로 실패한 커밋 수
+        self._retry_at = 0.0  # 이 시각(monotonic) 전에는 다시 커밋하지 않음
+        self._counters = {"submitted": 0, "written": 0, "dropped": 0, "commits": 0, "rejected": 0, "retries": 0}
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """남은 쓰기를 모두 커밋하고 writer 스레드를 종료합니다."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._thread = None
+        # 스레드가 없었던 경우에도 남은 쓰기 처리
+        self._drain_until_done()
+
+    def submit(self, rows: List[ProgressRow]) -> None:
+        """upsert를 대기열에 넣습니다. (비활성화 시 바로 커밋)"""
+        if not self.enabled:
+            self._write(rows)
+            return
+
+        with self._cond:
+            new_keys = {(row[0], row[1]) for row in rows} - self._pending.keys()
+            if len(self._pending) + len(new_keys) > self.max_pending:
+                self._counters["rejected"] += len(rows)
+                raise ProgressQueueFull()
+            for row in rows:
+                self._pending[(row[0], row[1])] = row
+            self._counters["submitted"] += len(rows)
+            if len(self._pending) >= self.max_rows:
+                self._cond.notify_all()
+        self.start()
+
+    def pending_for(self, session_id: str) -> Dict[int, ProgressRow]:
+        """아직 커밋되지 않은 세션의 쓰기 (sentence_index -> row)."""
+        with self._cond:
+            rows = {key[1]: row for key, row in self._writing.items() if key[0] == session_id}
+            rows.update({key[1]: row for key, row in self._pending.items() if key[0] == session_id})
+        return rows
+
+    def flush(self) -> None:
+        """대기 중인 쓰기를 지금 커밋합니다. (커밋 중인 묶음이 있으면 끝날 때까지 대기)"""
+        self._drain_until_done()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "enabled": self.enabled,
+                "pending": len(self._pending) + len(self._writing),
+                "maxPending": self.max_pending,
+                "flushIntervalMs": int(self.flush_interval * 1000),
+                "flushMaxRows": self.max_rows,
+                **self._counters,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # 첫 쓰기가 들어오면 flush_interval 동안(또는 max_rows까지) 더 모음
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                # 재시도 대기 중이면 max_rows가 모여도 backoff가 끝날 때까지 기다림
+                deadline = max(time.monotonic() + self.flush_interval, self._retry_at)
+                while not self._stopping:
+                    now = time.monotonic()
+                    if now >= deadline or (len(self._pending) >= self.max_rows and now >= self._retry_at):
+                        break
+                    self._cond.wait(deadline - now)
+                if self._stopping:
+                    # 남은 쓰기(재시도 포함)는 stop()이 커밋
+                    return
+            self._drain()
+
+    def _drain_until_done(self) -> None:
+        while self._drain():
+            time.sleep(max(0.0, self._retry_at - time.monotonic()))
+
+    def _drain(self) -> bool:
+        """대기 중인 쓰기를 한 묶음으로 커밋합니다. 일시적 오류로 다시 시도해야 하면 True."""
+        with self._drain_lock:
+            with self._cond:
+                if not self._pending:
+                    return False
+                self._writing, self._pending = self._pending, {}
+                rows = list(self._writing.values())
+            try:
+                self._write(rows)
+                with self._cond:
+                    self._failures = 0
+                return False
+            except sqlite3.OperationalError as e:
+                with self._cond:
+                    self._failures += 1
+                    if self._failures <= self.max_retries:
+                        # 대기열로 되돌림 (그 사이 들어온 같은 키의 쓰기가 더 최신)
+                        self._pending = {**self._writing, **self._pending}
+                        self._retry_at = time.monotonic() + self.retry_backoff * 2 ** (self._failures - 1)
+                        self._counters["retries"] += 1
+                        print(f"[ProgressWriter] Failed to write {len(rows)} progress rows, retrying: {e}")
+                        return True
+                    self._failures = 0
+                    self._counters["dropped"] += len(rows)
+                print(f"[ProgressWriter] Failed to write {len(rows)} progress rows after {self.max_retries} retries: {e}")
+                return False
+            except Exception as e:
+                print(f"[ProgressWriter] Failed to write {len(rows)} progress rows: {e}")
+                with self._cond:
+                    self._counters["dropped"] += len(rows)
+                return False
+            finally:
+                with self._cond:
+                    self._writing = {}
+
+    def _write(self, rows: List[ProgressRow]) -> None:
+        with get_db() as conn:
+            try:
+                conn.executemany(UPSERT_PROGRESS_SQL, rows)
+                conn.commit()
+                written = len(rows)
+            except sqlite3.IntegrityError:
+                # 그 사이 삭제된 세션의 행이 섞여 있으면 한 행씩 다시 시도
+                conn.rollback()
+                written = 0
+                for row in rows:
+                    try:
+                        conn.execute(UPSERT_PROGRESS_SQL, row)
+                        written += 1
+                    except sqlite3.IntegrityError:
+                        pass
+                conn.commit()
+        with self._cond:
+            self._counters["written"] += written
+            self._counters["dropped"] += len(rows) - written
+            self._counters["commits"] += 1
+
+
+progress_writer = ProgressWriter()
@@ -1,23 +1,43 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from models import (
-    PassageRequest, AnalysisResponse,
-    CreateSessionRequest, SessionResponse, ProgressRequest, ProgressItem,
-    AdminLoginRequest, AdminSessionsResponse, StudentSummary, AssignStudentRequest,
+    PassageRequest, AnalysisResponse, PassageBatchRequest, BatchAnalysisResponse,
+    CreateSessionRequest, SessionResponse, ProgressRequest, ProgressBatchRequest, ProgressItem,
+    AdminLoginRequest, AdminSessionsResponse, StudentSummary, AssignStudentRequest, PurgeRequest,
     PassageCreateRequest, PassageItem, PassageListResponse
 )
-from nlp.analyzer import analyze_passage
-from db.database import init_db, get_db
+from nlp.analyzer import get_analysis_version
+from nlp.cache import analysis_cache, hash_passage
+from nlp.compact import encode_compact
+from nlp.error_tracker import error_tracker, get_error_stats, log_analysis_error
+from nlp.failure_store import GROUP_BY as FAILURE_GROUP_BY
+from nlp.executor import (
+    analysis_executor, analyze_passage_async, analyze_passages_async, stream_passage_async, AnalysisQueueFull
+)
+from db.database import init_db, get_db, get_pool, close_pool
+from db.lanes import read_lane, write_lane
+from db.purge import purge_manager
+from db.retention import delete_archived_sessions, retention_manager
+from db.write_behind import progress_writer, ProgressQueueFull
 from auth.middleware import limiter
+from monitoring.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_family, render_metrics
+from monitoring.middleware import MetricsMiddleware
+from monitoring.profiling import ProfilingMiddleware, request_profiler
 import uvicorn
 import uuid
 import os
 import bcrypt
+import json
+import base64
+import hashlib
+import sqlite3
 from datetime import datetime
+from typing import List, Optional
 
 app = FastAPI(title="VerbGravity API")
 
@@ -25,10 +45,52 @@ app = FastAPI(title="VerbGravity API")
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Analysis modes precomputed for saved passages
+ANALYSIS_MODES = ("FULL", "CORE")
+
+# Passage limits (longer passages are analyzed in chunks; this is the hard cap)
+MAX_PASSAGE_CHARS = int(os.environ.get("VG_MAX_PASSAGE_CHARS", "20000"))
+MAX_BATCH_PASSAGES = int(os.environ.get("VG_BATCH_MAX_PASSAGES", "50"))
+MAX_PROGRESS_BATCH = int(os.environ.get("VG_PROGRESS_BATCH_MAX", "200"))
+
+# Admin session list page size
+ADMIN_SESSIONS_PAGE_SIZE = 50
+MAX_ADMIN_SESSIONS_PAGE_SIZE = 200
+
+# Max session ids in one purge request
+MAX_PURGE_IDS = 10000
+
+# NLP failure list page size
+NLP_FAILURES_PAGE_SIZE = 50
+MAX_NLP_FAILURES_PAGE_SIZE = 200
+
+# Analysis response formats: "json" = AnalysisResponse, "compact" = columnar (nlp/compact.py)
+RESPONSE_FORMATS = ("json", "compact")
+
+# Streaming analysis formats -> media type
+STREAM_FORMATS = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
 # Initialize database on startup
 @app.on_event("startup")
 def startup_event():
     init_db()
+    progress_writer.start()
+    purge_manager.start()
+    retention_manager.start()
+    # Load the spaCy model in the background; /api/health/ready reports when done
+    analysis_executor.warm_up_in_background()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    analysis_executor.shutdown()
+    # Let in-flight DB calls finish, then commit queued progress writes before closing connections
+    read_lane.shutdown()
+    write_lane.shutdown()
+    retention_manager.stop()
+    purge_manager.stop()
+    progress_writer.stop()
+    error_tracker.stop()
+    close_pool()
 
 # CORS Setup (Allow frontend to connect from any origin for LAN access)
 app.add_middleware(
@@ -39,112 +101,305 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in stack sampling of single requests (X-VG-Profile: <VG_PROFILE_TOKEN> or VG_PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware)
+
+# Per-route request latency for /metrics (outermost, so CORS preflights are counted too)
+app.add_middleware(MetricsMiddleware)
+
 # Root API endpoint (Optional, can be removed to let StaticFiles serve /)
 # @app.get("/")
 # def read_root():
 #    return {"status": "ok", "message": "VerbGravity API is running"}
 
+def compact_response(result: dict) -> Response:
+    """Serialize an analysis result in the compact format, skipping per-token Pydantic validation."""
+    payload = json.dumps(encode_compact(result), ensure_ascii=False, separators=(",", ":"))
+    return Response(content=payload, media_type="application/json")
+
+def check_response_format(format: str):
+    if format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid format. Use 'json' or 'compact'.")
+
 @app.post("/api/analyze-passage", response_model=AnalysisResponse)
 @limiter.limit("30/minute")
-def analyze_passage_endpoint(request: Request, body: PassageRequest):
-    if len(body.passage) > 2000:
-        raise HTTPException(status_code=400, detail="Passage is too long (max 2000 chars).")
+async def analyze_passage_endpoint(request: Request, body: PassageRequest, format: str = "json"):
+    check_response_format(format)
+    if len(body.passage) > MAX_PASSAGE_CHARS:
+        raise HTTPException(status_code=400, detail=f"Passage is too long (max {MAX_PASSAGE_CHARS} chars).")
     
     try:
-        result = analyze_passage(body.passage, mode=body.mode)
+        # Parsing runs in the analysis worker pool, not on the event loop
+        result = await analyze_passage_async(body.passage, mode=body.mode)
+        if format == "compact":
+            return compact_response(result)
         return result
+    except AnalysisQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Analysis server is busy. Please try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except Exception as e:
+        print(f"Analysis Error: {e}")
+        log_analysis_error(body.passage, "parse_error", {"mode": body.mode, "error": str(e)})
+        raise HTTPException(status_code=500, detail=str(e))
+
+def encode_stream_frame(kind: str, data: dict, fmt: str) -> str:
+    """Encode one streaming frame as an NDJSON line or an SSE event."""
+    if fmt == "sse":
+        return f"event: {kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    return json.dumps({"type": kind, "data": data}, ensure_ascii=False) + "\n"
+
+@app.post("/api/analyze-passage/stream")
+@limiter.limit("30/minute")
+async def analyze_passage_stream_endpoint(request: Request, body: PassageRequest, format: str = "ndjson"):
+    """Stream each SentenceItem as soon as it is parsed, followed by a final meta frame."""
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid format. Use 'ndjson' or 'sse'.")
+    if len(body.passage) > MAX_PASSAGE_CHARS:
+        raise HTTPException(status_code=400, detail=f"Passage is too long (max {MAX_PASSAGE_CHARS} chars).")
+    
+    frames = stream_passage_async(body.passage, mode=body.mode)
+    try:
+        # Wait for the first sentence so a busy/failed analysis still gets a proper status code
+        first = await frames.__anext__()
+    except AnalysisQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Analysis server is busy. Please try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         print(f"Analysis Error: {e}")
+        log_analysis_error(body.passage, "parse_error", {"mode": body.mode, "error": str(e)})
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def stream():
+        yield encode_stream_frame(*first, format)
+        try:
+            async for frame in frames:
+                yield encode_stream_frame(*frame, format)
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            print(f"Analysis Error: {e}")
+            log_analysis_error(body.passage, "parse_error", {"mode": body.mode, "error": str(e)})
+            yield encode_stream_frame("error", {"detail": str(e)}, format)
+        finally:
+            await frames.aclose()
+    
+    return StreamingResponse(
+        stream(),
+        media_type=STREAM_FORMATS[format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/analyze-passages", response_model=BatchAnalysisResponse)
+@limiter.limit("10/minute")
+async def analyze_passages_endpoint(request: Request, body: PassageBatchRequest):
+    """Analyze many passages at once; failures are reported per item."""
+    if len(body.passages) > MAX_BATCH_PASSAGES:
+        raise HTTPException(status_code=400, detail=f"Too many passages (max {MAX_BATCH_PASSAGES}).")
+    
+    items = [None] * len(body.passages)
+    valid_indexes = []
+    for i, passage in enumerate(body.passages):
+        if len(passage) > MAX_PASSAGE_CHARS:
+            items[i] = {"index": i, "result": None, "error": f"Passage is too long (max {MAX_PASSAGE_CHARS} chars)."}
+        else:
+            valid_indexes.append(i)
+    
+    try:
+        # Cache misses are parsed together as one job in the analysis worker pool
+        results = await analyze_passages_async([body.passages[i] for i in valid_indexes], mode=body.mode)
+    except AnalysisQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Analysis server is busy. Please try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except Exception as e:
+        print(f"Batch Analysis Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    for i, item in zip(valid_indexes, results):
+        items[i] = {"index": i, **item}
+    
+    failed = sum(1 for item in items if item["error"] is not None)
+    return {
+        "items": items,
+        "meta": {"total": len(items), "succeeded": len(items) - failed, "failed": failed}
+    }
+
+# Health APIs
+@app.get("/api/health/ready")
+async def readiness_probe():
+    """Readiness probe: 503 until the spaCy model is loaded and warmed up."""
+    body = {"status": analysis_executor.state, "model": get_analysis_version()}
+    if analysis_executor.is_ready:
+        return body
+    if analysis_executor.error:
+        body["error"] = analysis_executor.error
+    return JSONResponse(status_code=503, content=body, headers={"Retry-After": "5"})
+
+# Conditional GET (ETag / If-None-Match)
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names this (weak) ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def session_etag(revision: int, pending: dict) -> str:
+    """ETag from sessions.revision (bumped by progress triggers) plus any queued write-behind rows."""
+    if not pending:
+        return f'W/"{revision}"'
+    digest = hashlib.sha1(repr(sorted(pending.items())).encode()).hexdigest()[:12]
+    return f'W/"{revision}+{digest}"'
 
 # Session APIs
 @app.post("/api/sessions")
 @limiter.limit("30/minute")
-def create_session(request: Request, body: CreateSessionRequest):
+async def create_session(request: Request, body: CreateSessionRequest):
     """Create a new session and return its UUID."""
     session_id = str(uuid.uuid4())
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO sessions (id, passage_text, total_sentences, mode) VALUES (?, ?, ?, ?)",
-            (session_id, body.passage_text, body.total_sentences, body.mode)
-        )
-        conn.commit()
+    def write():
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO sessions (id, passage_text, total_sentences, mode) VALUES (?, ?, ?, ?)",
+                (session_id, body.passage_text, body.total_sentences, body.mode)
+            )
+            conn.commit()
     
+    await write_lane.run(write)
     return {"id": session_id}
 
 @app.get("/api/sessions/{session_id}", response_model=SessionResponse)
 @limiter.limit("30/minute")
-def get_session(request: Request, session_id: str):
-    """Get session info with progress."""
-    with get_db() as conn:
-        cursor = conn.cursor()
+async def get_session(request: Request, response: Response, session_id: str):
+    """Get session info with progress (304 if If-None-Match matches the session revision)."""
+    def read():
+        with get_db() as conn:
+            cursor = conn.cursor()
         
-        # Get session
-        cursor.execute("SELECT * FROM sessions WHERE id = ?", (session_id,))
-        session = cursor.fetchone()
+            # Get session
+            cursor.execute("SELECT * FROM sessions WHERE id = ?", (session_id,))
+            session = cursor.fetchone()
         
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
+            if not session:
+                raise HTTPException(status_code=404, detail="Session not found")
         
-        # Get progress
-        cursor.execute(
-            "SELECT sentence_index, root_answer, root_correct, subject_answer, subject_correct FROM progress WHERE session_id = ? ORDER BY sentence_index",
-            (session_id,)
-        )
-        progress_rows = cursor.fetchall()
+            # Unchanged since the client's copy: skip the progress query
+            pending = progress_writer.pending_for(session_id)
+            etag = session_etag(session["revision"], pending)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
         
-        progress = [
-            ProgressItem(
-                sentence_index=row["sentence_index"],
-                root_answer=row["root_answer"],
-                root_correct=bool(row["root_correct"]),
-                subject_answer=row["subject_answer"],
-                subject_correct=bool(row["subject_correct"])
+            # Get progress
+            cursor.execute(
+                "SELECT sentence_index, root_answer, root_correct, subject_answer, subject_correct FROM progress WHERE session_id = ? ORDER BY sentence_index",
+                (session_id,)
             )
-            for row in progress_rows
-        ]
+            progress_rows = {row["sentence_index"]: tuple(row) for row in cursor.fetchall()}
         
-        return SessionResponse(
-            id=session["id"],
-            created_at=session["created_at"],
-            passage_text=session["passage_text"],
-            total_sentences=session["total_sentences"],
-            mode=session["mode"] if "mode" in session.keys() else "FULL", # Handle legacy data
-            progress=progress
-        )
+            # Read-your-writes: overlay progress still waiting in the write-behind queue
+            for sentence_index, row in pending.items():
+                progress_rows[sentence_index] = row[1:6]
+        
+            progress = [
+                ProgressItem(
+                    sentence_index=sentence_index,
+                    root_answer=root_answer,
+                    root_correct=bool(root_correct),
+                    subject_answer=subject_answer,
+                    subject_correct=bool(subject_correct)
+                )
+                for sentence_index, root_answer, root_correct, subject_answer, subject_correct
+                in (progress_rows[i] for i in sorted(progress_rows))
+            ]
+        
+            return SessionResponse(
+                id=session["id"],
+                created_at=session["created_at"],
+                passage_text=session["passage_text"],
+                total_sentences=session["total_sentences"],
+                mode=session["mode"] if "mode" in session.keys() else "FULL", # Handle legacy data
+                progress=progress
+            )
+    
+    try:
+        return await read_lane.run(read)
+    except HTTPException as e:
+        # Sessions moved to the cold store by retention are restored on lookup
+        if e.status_code != 404 or not await write_lane.run(retention_manager.restore, session_id):
+            raise
+    return await read_lane.run(read)
 
-@app.put("/api/sessions/{session_id}/progress")
-@limiter.limit("60/minute")
-def save_progress(request: Request, session_id: str, body: ProgressRequest):
-    """Save progress for a sentence."""
+def check_session_exists(session_id: str):
+    # Runs on the write lane as part of the progress save path
     with get_db() as conn:
         cursor = conn.cursor()
-        
-        # Check session exists
         cursor.execute("SELECT id FROM sessions WHERE id = ?", (session_id,))
         if not cursor.fetchone():
             raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Upsert progress (INSERT OR REPLACE)
-        cursor.execute("""
-            INSERT OR REPLACE INTO progress 
-            (session_id, sentence_index, root_answer, root_correct, subject_answer, subject_correct, completed_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            session_id,
-            body.sentence_index,
-            body.root_answer,
-            body.root_correct,
-            body.subject_answer,
-            body.subject_correct,
-            datetime.utcnow().isoformat()
-        ))
-        conn.commit()
+
+def queue_progress(session_id: str, items: List[ProgressRequest]):
+    """Queue progress upserts for the write-behind writer (committed within VG_PROGRESS_FLUSH_MS)."""
+    completed_at = datetime.utcnow().isoformat()
+    try:
+        progress_writer.submit([
+            (
+                session_id,
+                item.sentence_index,
+                item.root_answer,
+                item.root_correct,
+                item.subject_answer,
+                item.subject_correct,
+                completed_at
+            )
+            for item in items
+        ])
+    except ProgressQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Progress queue is full. Please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+@app.put("/api/sessions/{session_id}/progress")
+@limiter.limit("60/minute")
+async def save_progress(request: Request, session_id: str, body: ProgressRequest):
+    """Save progress for a sentence."""
+    def write():
+        check_session_exists(session_id)
+        queue_progress(session_id, [body])
     
+    await write_lane.run(write)
     return {"status": "ok"}
 
+@app.put("/api/sessions/{session_id}/progress/batch")
+@limiter.limit("30/minute")
+async def save_progress_batch(request: Request, session_id: str, body: ProgressBatchRequest):
+    """Save progress for many sentences in one transaction."""
+    if len(body.items) > MAX_PROGRESS_BATCH:
+        raise HTTPException(status_code=400, detail=f"Too many progress items (max {MAX_PROGRESS_BATCH}).")
+    
+    def write():
+        check_session_exists(session_id)
+        # Later items for the same sentence win
+        queue_progress(session_id, body.items)
+    
+    await write_lane.run(write)
+    return {"status": "ok", "saved": len(body.items)}
+
 # Admin APIs
 @app.post("/api/manage/login")
 @limiter.limit("5/minute")
@@ -172,196 +427,564 @@ def admin_login(request: Request, body: AdminLoginRequest):
             
     raise HTTPException(status_code=401, detail="Invalid password")
 
+def encode_session_cursor(created_at: str, session_id: str) -> str:
+    """Opaque keyset cursor for the admin session list."""
+    return base64.urlsafe_b64encode(json.dumps([created_at, session_id]).encode()).decode()
+
+def decode_session_cursor(cursor: str):
+    try:
+        created_at, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(created_at), str(session_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @app.get("/api/manage/sessions")
-def get_admin_sessions(request: Request):
-    """Get all students and sessions for dashboard."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # 1. Get student summaries
-        cursor.execute("""
-            SELECT 
-                s.id as studentId,
-                s.display_name as displayName,
-                (SELECT COALESCE(SUM(sess2.total_sentences), 0) 
-                 FROM session_student_map m2 
-                 JOIN sessions sess2 ON m2.session_id = sess2.id 
-                 WHERE m2.student_id = s.id) as totalSentences,
-                COUNT(p.id) as completedSentences,
-                COALESCE(SUM(CASE WHEN p.root_correct = 1 THEN 1 ELSE 0 END), 0) as rootCorrect,
-                COALESCE(SUM(CASE WHEN p.subject_correct = 1 THEN 1 ELSE 0 END), 0) as subjectCorrect,
-                MAX(p.completed_at) as lastCompletedAt,
-                (SELECT sess3.mode 
-                 FROM session_student_map m3 
-                 JOIN sessions sess3 ON m3.session_id = sess3.id 
-                 WHERE m3.student_id = s.id 
-                 ORDER BY sess3.created_at DESC 
-                 LIMIT 1) as mode
-            FROM students s
-            LEFT JOIN session_student_map m ON s.id = m.student_id
-            LEFT JOIN sessions sess ON m.session_id = sess.id
-            LEFT JOIN progress p ON sess.id = p.session_id
-            GROUP BY s.id
-        """)
-        student_rows = cursor.fetchall()
-        
-        students = [
-            StudentSummary(
-                studentId=row["studentId"],
-                displayName=row["displayName"],
-                totalSentences=row["totalSentences"],
-                completedSentences=row["completedSentences"],
-                rootCorrect=row["rootCorrect"],
-                subjectCorrect=row["subjectCorrect"],
-                mode=row["mode"] or "FULL",
-                lastCompletedAt=row["lastCompletedAt"]
-            )
-            for row in student_rows
-        ]
-        
-        # 2. Get all sessions with their matched student
-        cursor.execute("""
-            SELECT 
-                sess.id, 
-                sess.created_at, 
-                sess.passage_text, 
-                sess.total_sentences,
-                sess.mode,
-                s.id as student_id,
-                s.display_name as student_name
-            FROM sessions sess
-            LEFT JOIN session_student_map m ON sess.id = m.session_id
-            LEFT JOIN students s ON m.student_id = s.id
-            ORDER BY sess.created_at DESC
-        """)
-        session_rows = cursor.fetchall()
+async def get_admin_sessions(
+    request: Request,
+    limit: int = ADMIN_SESSIONS_PAGE_SIZE,
+    page_cursor: Optional[str] = Query(None, alias="cursor"),
+    student_id: Optional[str] = None,
+    mode: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+):
+    """Get student summaries and one page of sessions (newest first) for dashboard.
+
+    Sessions are paginated with a keyset cursor on (created_at, id); pass the
+    returned nextCursor to get the next page. Students are only returned on the
+    first page. date_from/date_to are inclusive YYYY-MM-DD dates.
+    """
+    if not 1 <= limit <= MAX_ADMIN_SESSIONS_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_ADMIN_SESSIONS_PAGE_SIZE}")
+    if mode is not None and mode not in ANALYSIS_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode: {mode}")
+    for value in (date_from, date_to):
+        if value is not None:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+    
+    # Session filters
+    conditions = []
+    params = []
+    if page_cursor is not None:
+        conditions.append("(sess.created_at, sess.id) < (?, ?)")
+        params.extend(decode_session_cursor(page_cursor))
+    if student_id is not None:
+        conditions.append("m.student_id = ?")
+        params.append(student_id)
+    if mode is not None:
+        conditions.append("sess.mode = ?")
+        params.append(mode)
+    if date_from is not None:
+        conditions.append("sess.created_at >= ?")
+        params.append(date_from)
+    if date_to is not None:
+        conditions.append("sess.created_at < date(?, '+1 day')")
+        params.append(date_to)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    def read():
+        with get_db() as conn:
+            cursor = conn.cursor()
         
-        sessions = [
-            {
-                "id": row["id"],
-                "created_at": row["created_at"],
-                "passage_text": row["passage_text"][:50] + "...",
-                "total_sentences": row["total_sentences"],
-                "mode": row["mode"] or "FULL",
-                "student_id": row["student_id"],
-                "student_name": row["student_name"] or "미지정"
-            }
-            for row in session_rows
-        ]
+            # 1. Get student summaries (first page only; student_stats is kept up to date by triggers,
+            #    archived_student_stats adds the totals of sessions moved to the cold store)
+            students = None
+            if page_cursor is None:
+                cursor.execute("""
+                    SELECT 
+                        s.id as studentId,
+                        s.display_name as displayName,
+                        COALESCE(st.total_sentences, 0) + COALESCE(ast.total_sentences, 0) as totalSentences,
+                        COALESCE(st.completed_sentences, 0) + COALESCE(ast.completed_sentences, 0) as completedSentences,
+                        COALESCE(st.root_correct, 0) + COALESCE(ast.root_correct, 0) as rootCorrect,
+                        COALESCE(st.subject_correct, 0) + COALESCE(ast.subject_correct, 0) as subjectCorrect,
+                        CASE
+                            WHEN ast.last_completed_at IS NULL OR st.last_completed_at >= ast.last_completed_at
+                            THEN st.last_completed_at ELSE ast.last_completed_at
+                        END as lastCompletedAt,
+                        COALESCE(st.mode, ast.mode) as mode
+                    FROM students s
+                    LEFT JOIN student_stats st ON st.student_id = s.id
+                    LEFT JOIN archived_student_stats ast ON ast.student_id = s.id
+                """)
+                student_rows = cursor.fetchall()
+            
+                students = [
+                    StudentSummary(
+                        studentId=row["studentId"],
+                        displayName=row["displayName"],
+                        totalSentences=row["totalSentences"],
+                        completedSentences=row["completedSentences"],
+                        rootCorrect=row["rootCorrect"],
+                        subjectCorrect=row["subjectCorrect"],
+                        mode=row["mode"] or "FULL",
+                        lastCompletedAt=row["lastCompletedAt"]
+                    )
+                    for row in student_rows
+                ]
         
-        return {"students": students, "sessions": sessions}
+            # 2. Get one page of sessions with their matched student (preview cut in SQL)
+            cursor.execute(f"""
+                SELECT 
+                    sess.id, 
+                    sess.created_at, 
+                    substr(sess.passage_text, 1, 50) as passage_preview, 
+                    sess.total_sentences,
+                    sess.mode,
+                    s.id as student_id,
+                    s.display_name as student_name
+                FROM sessions sess
+                LEFT JOIN session_student_map m ON sess.id = m.session_id
+                LEFT JOIN students s ON m.student_id = s.id
+                {where}
+                ORDER BY sess.created_at DESC, sess.id DESC
+                LIMIT ?
+            """, (*params, limit + 1))
+            session_rows = cursor.fetchall()
+        return students, session_rows
+    
+    students, session_rows = await read_lane.run(read)
+    has_more = len(session_rows) > limit
+    session_rows = session_rows[:limit]
+    sessions = [
+        {
+            "id": row["id"],
+            "created_at": row["created_at"],
+            "passage_text": row["passage_preview"] + "...",
+            "total_sentences": row["total_sentences"],
+            "mode": row["mode"] or "FULL",
+            "student_id": row["student_id"],
+            "student_name": row["student_name"] or "미지정"
+        }
+        for row in session_rows
+    ]
+    next_cursor = (
+        encode_session_cursor(session_rows[-1]["created_at"], session_rows[-1]["id"]) if has_more else None
+    )
+    
+    return {"students": students, "sessions": sessions, "nextCursor": next_cursor}
+
+@app.get("/api/manage/analysis-cache")
+async def get_analysis_cache_stats():
+    """Get analysis cache hit/miss/eviction counters and executor queue state."""
+    return {**analysis_cache.stats(), "executor": analysis_executor.stats()}
+
+@app.get("/api/manage/db-pool")
+async def get_db_pool_stats():
+    """Get database connection pool counters, DB lane queues and progress write-behind queue state."""
+    return {**get_pool().stats(), "lanes": {"read": read_lane.stats(), "write": write_lane.stats()}, "progressWriter": progress_writer.stats()}
+
+def runtime_metrics() -> List[str]:
+    """Gauges and counters read from the components' stats() at scrape time."""
+    pool = get_pool().stats()
+    lanes = {"read": read_lane.stats(), "write": write_lane.stats()}
+    cache = analysis_cache.stats()
+    executor = analysis_executor.stats()
+    writer = progress_writer.stats()
+    tracker = error_tracker.stats()
+    return [
+        render_family("vg_db_pool_connections", "gauge", "Pooled SQLite connections by state.", [
+            ({"state": "in_use"}, pool["inUse"]), ({"state": "idle"}, pool["idle"]),
+        ]),
+        render_family("vg_db_pool_events_total", "counter", "Connection pool events.", [
+            ({"event": event}, pool[event]) for event in ("created", "reused", "closed", "healthCheckFailures", "rollbacks")
+        ]),
+        render_family("vg_db_lane_pending", "gauge", "DB calls queued or running per lane.", [
+            ({"lane": lane}, stats["pending"]) for lane, stats in lanes.items()
+        ]),
+        render_family("vg_db_lane_workers", "gauge", "Threads per DB lane.", [
+            ({"lane": lane}, stats["workers"]) for lane, stats in lanes.items()
+        ]),
+        render_family("vg_progress_writer_pending", "gauge", "Progress writes waiting to be committed.", [
+            ({}, writer["pending"]),
+        ]),
+        render_family("vg_analysis_cache_lookups_total", "counter", "Analysis cache lookups by result.", [
+            ({"result": "hit"}, cache["hits"]), ({"result": "l2_hit"}, cache["l2Hits"]), ({"result": "miss"}, cache["misses"]),
+        ]),
+        render_family("vg_analysis_cache_hit_ratio", "gauge", "Analysis cache hit ratio since start (memory + L2).", [
+            ({}, cache["hitRatio"]),
+        ]),
+        render_family("vg_analysis_cache_entries", "gauge", "Analysis results held in memory.", [({}, cache["entries"])]),
+        render_family("vg_analysis_cache_bytes", "gauge", "Approximate size of cached analysis results.", [({}, cache["bytes"])]),
+        render_family("vg_analysis_executor_pending", "gauge", "Analysis jobs queued or running.", [({}, executor["pending"])]),
+        render_family("vg_analysis_executor_workers", "gauge", "Analysis worker processes.", [({}, executor["workers"])]),
+        render_family("vg_analysis_model_ready", "gauge", "1 once the spaCy model is loaded and warmed up.", [
+            ({}, analysis_executor.is_ready),
+        ]),
+        render_family("vg_nlp_errors_total", "counter", "Logged analysis failures by type.", [
+            ({"type": error_type}, count) for error_type, count in sorted(get_error_stats().items())
+        ]),
+        render_family("vg_nlp_error_log_dropped_total", "counter", "Failure log entries dropped because the queue was full.", [
+            ({}, tracker["dropped"]),
+        ]),
+    ]
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus scrape endpoint (text exposition format 0.0.4)."""
+    return Response(content=render_metrics(runtime_metrics()), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/api/manage/profiles")
+async def list_request_profiles():
+    """List the most recent request profiles (newest first) and the profiler settings."""
+    return {"items": request_profiler.recent(), "profiler": request_profiler.stats()}
+
+@app.get("/api/manage/profiles/{profile_id}")
+async def get_request_profile(profile_id: str):
+    """Collapsed stacks of one profile (`thread;frame;frame count`), for flamegraph.pl / speedscope."""
+    collapsed = request_profiler.collapsed(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(content=collapsed, media_type="text/plain; charset=utf-8")
+
+def encode_failure_cursor(count: int, item_id: str) -> str:
+    """Opaque keyset cursor for the NLP failure list."""
+    return base64.urlsafe_b64encode(json.dumps([count, item_id]).encode()).decode()
+
+def decode_failure_cursor(cursor: str):
+    try:
+        count, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(count), str(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@app.get("/api/manage/nlp-failures")
+async def get_nlp_failures(
+    limit: int = NLP_FAILURES_PAGE_SIZE,
+    page_cursor: Optional[str] = Query(None, alias="cursor"),
+    error_type: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    group_by: str = "sentence"
+):
+    """Page through the most frequent analysis failures (deduplicated sentences or POS tag patterns).
+
+    Ordered by occurrence count (within date_from/date_to if given, inclusive
+    YYYY-MM-DD); pass the returned nextCursor to get the next page.
+    """
+    if not 1 <= limit <= MAX_NLP_FAILURES_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_NLP_FAILURES_PAGE_SIZE}")
+    if group_by not in FAILURE_GROUP_BY:
+        raise HTTPException(status_code=400, detail="Invalid group_by. Use 'sentence' or 'pattern'.")
+    for value in (date_from, date_to):
+        if value is not None:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+    after = decode_failure_cursor(page_cursor) if page_cursor is not None else None
+    
+    rows = await read_lane.run(
+        error_tracker.store.top, error_type, date_from, date_to, group_by, limit + 1, after
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_failure_cursor(rows[-1]["count"], rows[-1]["id"])
+    
+    items = []
+    for row in rows:
+        item = {
+            "id": row["id"],
+            "errorType": row["error_type"],
+            "pattern": row["pattern"],
+            "count": row["count"],
+            "firstSeen": row["first_seen"],
+            "lastSeen": row["last_seen"],
+        }
+        if group_by == "sentence":
+            item.update(sentence=row["sentence"], details=row["details"])
+        else:
+            item.update(example=row["example"], sentences=row["sentences"])
+        items.append(item)
+    
+    return {"items": items, "nextCursor": next_cursor, "totals": get_error_stats(), "tracker": error_tracker.stats()}
 
 @app.put("/api/manage/sessions/{session_id}/assign-student")
-def assign_student(session_id: str, body: AssignStudentRequest):
+async def assign_student(session_id: str, body: AssignStudentRequest):
     """Assign a session to a student (creates student if not exists)."""
-    with get_db() as conn:
-        cursor = conn.cursor()
+    def write():
+        with get_db() as conn:
+            cursor = conn.cursor()
         
-        # Find or create student
-        cursor.execute("SELECT id FROM students WHERE display_name = ?", (body.student_name,))
-        student = cursor.fetchone()
+            # Find or create student
+            cursor.execute("SELECT id FROM students WHERE display_name = ?", (body.student_name,))
+            student = cursor.fetchone()
         
-        if student:
-            student_id = student["id"]
-        else:
-            student_id = str(uuid.uuid4())
-            cursor.execute("INSERT INTO students (id, display_name) VALUES (?, ?)", (student_id, body.student_name))
+            if student:
+                student_id = student["id"]
+            else:
+                student_id = str(uuid.uuid4())
+                cursor.execute("INSERT INTO students (id, display_name) VALUES (?, ?)", (student_id, body.student_name))
             
-        # Update mapping
-        cursor.execute("DELETE FROM session_student_map WHERE session_id = ?", (session_id,))
-        cursor.execute("INSERT INTO session_student_map (session_id, student_id) VALUES (?, ?)", (session_id, student_id))
+            # Update mapping
+            cursor.execute("DELETE FROM session_student_map WHERE session_id = ?", (session_id,))
+            cursor.execute("INSERT INTO session_student_map (session_id, student_id) VALUES (?, ?)", (session_id, student_id))
         
-        conn.commit()
+            conn.commit()
+        return student_id
+    
+    student_id = await write_lane.run(write)
     
     return {"status": "ok", "student_id": student_id}
     
 @app.delete("/api/manage/sessions/{session_id}")
-def delete_session(session_id: str):
-    """Delete a single session."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
-        conn.commit()
+async def delete_session(session_id: str):
+    """Delete a single session (also when it was moved to the cold store by retention)."""
+    def write():
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            archived = delete_archived_sessions(conn, [session_id])
+            conn.commit()
+        if archived:
+            retention_manager.remove_unreferenced_files()
+    
+    await write_lane.run(write)
     return {"status": "ok"}
 
-@app.delete("/api/manage/sessions")
-def clear_all_sessions():
-    """Delete all sessions."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM sessions")
-        conn.commit()
-    return {"status": "ok"}
+@app.delete("/api/manage/sessions", status_code=202)
+async def clear_all_sessions():
+    """Delete all sessions as a chunked background purge job (poll /api/manage/purge/{jobId})."""
+    job = purge_manager.submit("all")
+    return {"status": "accepted", "jobId": job["id"]}
+
+@app.post("/api/manage/purge", status_code=202)
+async def create_purge_job(body: PurgeRequest):
+    """Start a chunked background delete of sessions by id list, student, age or all."""
+    criteria = [body.session_ids is not None, body.student_id is not None, body.older_than is not None, body.all]
+    if sum(criteria) != 1:
+        raise HTTPException(status_code=400, detail="Specify exactly one of session_ids, student_id, older_than, all.")
+    if body.session_ids is not None and len(body.session_ids) > MAX_PURGE_IDS:
+        raise HTTPException(status_code=400, detail=f"Too many session ids (max {MAX_PURGE_IDS}).")
+    if body.older_than is not None:
+        try:
+            datetime.strptime(body.older_than, "%Y-%m-%d")
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid date: {body.older_than}")
+    
+    if body.session_ids is not None:
+        job = purge_manager.submit("ids", session_ids=body.session_ids)
+    elif body.student_id is not None:
+        job = purge_manager.submit("student", student_id=body.student_id)
+    elif body.older_than is not None:
+        job = purge_manager.submit("older_than", before=body.older_than)
+    else:
+        job = purge_manager.submit("all")
+    return job
+
+@app.get("/api/manage/retention")
+async def get_retention_stats():
+    """Get retention settings, cold store size and the last archive run."""
+    return await read_lane.run(retention_manager.stats)
+
+@app.post("/api/manage/retention/run")
+async def run_retention(days: Optional[int] = None):
+    """Archive sessions older than `days` (default VG_RETENTION_DAYS) to the cold store now."""
+    days = retention_manager.days if days is None else days
+    if days <= 0:
+        raise HTTPException(status_code=400, detail="Retention is disabled. Pass days > 0 or set VG_RETENTION_DAYS.")
+    # Archives in small committed batches; runs off the DB lanes so writes are not queued behind it
+    return await run_in_threadpool(retention_manager.run_once, days)
+
+@app.get("/api/manage/purge")
+async def get_purge_jobs():
+    """Get recent purge jobs (newest first) and VACUUM/checkpoint state."""
+    return {"jobs": purge_manager.jobs(), "maintenance": purge_manager.stats()}
+
+@app.get("/api/manage/purge/{job_id}")
+async def get_purge_job(job_id: str):
+    """Get the progress of one purge job."""
+    job = purge_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Purge job not found")
+    return job
 
 @app.delete("/api/manage/students/{student_id}")
-def delete_student(student_id: str):
+async def delete_student(student_id: str):
     """Delete a student and all their related data (mappings and progress)."""
-    with get_db() as conn:
-        cursor = conn.cursor()
+    def write():
+        with get_db() as conn:
+            cursor = conn.cursor()
         
-        # Cascade delete is enabled via PRAGMA, but session_student_map only cascades its own entry.
-        # If we want to delete sessions too, we should do it explicitly if they are only for this student.
-        # For now, let's keep sessions but delete mappings and progress (via mappings).
-        # Actually, progress is linked to session_id, not student_id.
-        # If we delete a student, the map is gone. The progress remains on the session.
-        # To delete EVERYTHING, we should probably delete the sessions associated with this student.
-        
-        cursor.execute("SELECT session_id FROM session_student_map WHERE student_id = ?", (student_id,))
-        sessions = cursor.fetchall()
-        
-        for row in sessions:
-            cursor.execute("DELETE FROM sessions WHERE id = ?", (row["session_id"],)) # This will cascade to progress and map
+            # Deleting the student only cascades its session_student_map rows, so delete
+            # the student's sessions first (cascades to progress and map) in one statement.
+            # Students with very many sessions: use POST /api/manage/purge {"student_id": ...}
+            cursor.execute(
+                "DELETE FROM sessions WHERE id IN (SELECT session_id FROM session_student_map WHERE student_id = ?)",
+                (student_id,)
+            )
             
-        cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
-        
-        conn.commit()
+            # archived_sessions / archived_student_stats rows cascade with the student
+            cursor.execute("SELECT 1 FROM archived_sessions WHERE student_id = ? LIMIT 1", (student_id,))
+            archived = cursor.fetchone() is not None
+            cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
         
+            conn.commit()
+        if archived:
+            retention_manager.remove_unreferenced_files()
+    
+    await write_lane.run(write)
     return {"status": "ok"}
 
 # Passage APIs (v1.1)
 @app.get("/api/passages")
-def get_passages():
-    """Get all saved passages."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, title, content, created_at, updated_at FROM passages ORDER BY created_at DESC")
-        rows = cursor.fetchall()
+async def get_passages(request: Request, response: Response):
+    """Get all saved passages (304 if If-None-Match matches the passages revision)."""
+    def read():
+        with get_db() as conn:
+            cursor = conn.cursor()
+            
+            # Unchanged since the client's copy: skip the passage query
+            cursor.execute("SELECT epoch, revision FROM table_revisions WHERE name = 'passages'")
+            version = cursor.fetchone()
+            etag = f'W/"{version["epoch"]}-{version["revision"]}"'
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
+            
+            cursor.execute("SELECT id, title, content, created_at, updated_at FROM passages ORDER BY created_at DESC")
+            rows = cursor.fetchall()
         
-        passages = [
-            PassageItem(
-                id=row["id"],
-                title=row["title"],
-                content=row["content"],
-                created_at=row["created_at"],
-                updated_at=row["updated_at"]
-            )
-            for row in rows
-        ]
+            passages = [
+                PassageItem(
+                    id=row["id"],
+                    title=row["title"],
+                    content=row["content"],
+                    created_at=row["created_at"],
+                    updated_at=row["updated_at"]
+                )
+                for row in rows
+            ]
         
-        return {"passages": passages}
+            return {"passages": passages}
+    
+    return await read_lane.run(read)
 
 @app.post("/api/passages")
-def create_passage(body: PassageCreateRequest):
+async def create_passage(body: PassageCreateRequest, background_tasks: BackgroundTasks):
     """Create a new passage (teacher only)."""
     passage_id = str(uuid.uuid4())
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO passages (id, title, content) VALUES (?, ?, ?)",
-            (passage_id, body.title, body.content)
-        )
-        conn.commit()
+    def write():
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO passages (id, title, content) VALUES (?, ?, ?)",
+                (passage_id, body.title, body.content)
+            )
+            conn.commit()
+    
+    await write_lane.run(write)
+    
+    # v1.2: 학생이 지문을 선택하기 전에 FULL/CORE 분석을 미리 저장
+    background_tasks.add_task(precompute_passage_analyses, passage_id, body.content)
     
     return {"id": passage_id, "status": "ok"}
 
+@app.get("/api/passages/{passage_id}/analysis", response_model=AnalysisResponse)
+@limiter.limit("30/minute")
+async def get_passage_analysis(request: Request, passage_id: str, mode: str = "FULL", format: str = "json"):
+    """Get the stored analysis of a saved passage (re-analyzes if stale)."""
+    if mode not in ANALYSIS_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode: {mode}")
+    check_response_format(format)
+    
+    def read():
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT content FROM passages WHERE id = ?", (passage_id,))
+            passage = cursor.fetchone()
+            
+            if not passage:
+                raise HTTPException(status_code=404, detail="Passage not found")
+            
+            cursor.execute(
+                "SELECT content_hash, analysis_version, payload FROM passage_analyses WHERE passage_id = ? AND mode = ?",
+                (passage_id, mode)
+            )
+            stored = cursor.fetchone()
+        return passage, stored
+    
+    passage, stored = await read_lane.run(read)
+    content = passage["content"]
+    if (
+        stored
+        and stored["content_hash"] == hash_passage(content)
+        and stored["analysis_version"] == get_analysis_version()
+    ):
+        if format == "compact":
+            return compact_response(json.loads(stored["payload"]))
+        # Stored payload is already a serialized AnalysisResponse
+        return Response(content=stored["payload"], media_type="application/json")
+    
+    # Missing or stale (passage edited / model upgraded): analyze and store again
+    try:
+        # Parsing runs in the analysis worker pool, not on the DB lanes or the event loop
+        result = await analyze_passage_async(content, mode=mode)
+    except AnalysisQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Analysis server is busy. Please try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except Exception as e:
+        print(f"Analysis Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    await write_lane.run(save_passage_analysis, passage_id, mode, content, result)
+    if format == "compact":
+        return compact_response(result)
+    return result
+
+def save_passage_analysis(passage_id: str, mode: str, content: str, result: dict):
+    """Persist a serialized AnalysisResponse for a passage/mode pair."""
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO passage_analyses
+                (passage_id, mode, content_hash, analysis_version, payload)
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                passage_id,
+                mode,
+                hash_passage(content),
+                get_analysis_version(),
+                json.dumps(result, ensure_ascii=False)
+            ))
+            conn.commit()
+    except sqlite3.IntegrityError:
+        # Passage was deleted while the analysis was running
+        pass
+
+async def precompute_passage_analyses(passage_id: str, content: str):
+    """Analyze a saved passage in every mode and store the results (background task).
+    
+    A skipped mode (busy queue, parse error) is analyzed on the first lookup instead.
+    """
+    for mode in ANALYSIS_MODES:
+        try:
+            result = await analyze_passage_async(content, mode=mode)
+        except Exception as e:
+            print(f"Precompute Error ({passage_id}, {mode}): {e}")
+            continue
+        await write_lane.run(save_passage_analysis, passage_id, mode, content, result)
+
 @app.delete("/api/passages/{passage_id}")
-def delete_passage(passage_id: str):
+async def delete_passage(passage_id: str):
     """Delete a passage (teacher only)."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM passages WHERE id = ?", (passage_id,))
-        conn.commit()
+    def write():
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM passages WHERE id = ?", (passage_id,))
+            conn.commit()
+    
+    await write_lane.run(write)
     
     return {"status": "ok"}
 
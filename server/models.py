@@ -35,6 +35,25 @@ class AnalysisResponse(BaseModel):
     sentences: List[SentenceItem]
     meta: AnalysisMeta
 
+# Batch analysis models (v1.2)
+class PassageBatchRequest(BaseModel):
+    passages: List[str]
+    mode: str = 'FULL'
+
+class BatchAnalysisItem(BaseModel):
+    index: int
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+class BatchAnalysisMeta(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+
+class BatchAnalysisResponse(BaseModel):
+    items: List[BatchAnalysisItem]
+    meta: BatchAnalysisMeta
+
 # Session models
 class CreateSessionRequest(BaseModel):
     passage_text: str
@@ -55,6 +74,9 @@ class ProgressRequest(BaseModel):
     subject_answer: Optional[int] = None
     subject_correct: bool
 
+class ProgressBatchRequest(BaseModel):
+    items: List[ProgressRequest]
+
 class SessionResponse(BaseModel):
     id: str
     created_at: str
@@ -78,12 +100,20 @@ class StudentSummary(BaseModel):
     lastCompletedAt: Optional[str] = None
 
 class AdminSessionsResponse(BaseModel):
-    students: List[StudentSummary]
+    students: Optional[List[StudentSummary]] = None  # first page only
     sessions: List[dict] # Detailed session mapping info
+    nextCursor: Optional[str] = None  # keyset cursor for the next page of sessions
 
 class AssignStudentRequest(BaseModel):
     student_name: str # In MVP, we might just use display name to find/create student
 
+class PurgeRequest(BaseModel):
+    # Exactly one criterion (v1.2 background purge jobs)
+    session_ids: Optional[List[str]] = None
+    student_id: Optional[str] = None
+    older_than: Optional[str] = None  # YYYY-MM-DD; sessions created before this date
+    all: bool = False
+
 # Passage models (v1.1)
 class PassageCreateRequest(BaseModel):
     title: str
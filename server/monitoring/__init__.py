@@ -0,0 +1 @@
+# Monitoring module initialization
@@ -0,0 +1,206 @@
+"""
+Prometheus Metrics - v1.2
+
+`GET /metrics`로 내보내는 카운터/히스토그램과 Prometheus 텍스트 형식(0.0.4) 렌더러입니다.
+(prometheus_client 없이 필요한 만큼만 구현)
+
+- 요청 경로에서는 라벨별 버킷 카운트만 올리고, 문자열 렌더링은 수집 시점에만 합니다.
+- 분석 단계별 시간(nlp/stages.py)은 수집 시점에 꺼내 `vg_analyzer_*`에 반영합니다.
+- 연결 수/캐시 적중률 등 상태 값은 각 컴포넌트의 `stats()`를 수집 시점에 읽어
+  `render_family()`로 추가합니다. (main.py의 /metrics)
+"""
+import bisect
+import re
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from nlp import stages
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 초 단위 버킷 (요청/분석 단계용, DB 문장용)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_family(name: str, kind: str, help_text: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> str:
+    """`({라벨: 값}, 숫자)` 목록을 한 메트릭 묶음의 텍스트로 만듭니다. (gauge/counter)"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if value is None:
+            continue
+        lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+    return "\n".join(lines)
+
+
+class Counter:
+    """라벨별 누적 카운터"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> str:
+        with self._lock:
+            values = sorted(self._values.items())
+        return render_family(
+            self.name, "counter", self.help,
+            ((dict(zip(self.labelnames, labels)), value) for labels, value in values),
+        )
+
+
+class Histogram:
+    """라벨별 누적 버킷 히스토그램 (관측 1회 = bisect + 잠금 안에서 정수 증가)"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [버킷별 개수 ..., +Inf 개수, 합계]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[:-1]) if series else 0
+
+    def render(self) -> str:
+        with self._lock:
+            snapshot = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = f'le="{_number(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return "\n".join(lines)
+
+
+# ---------------------------------------------------------
+# Registry
+# ---------------------------------------------------------
+http_requests = Counter(
+    "vg_http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+http_request_seconds = Histogram(
+    "vg_http_request_duration_seconds", "HTTP request latency until the response is fully sent.", ("method", "route")
+)
+db_query_seconds = Histogram(
+    "vg_db_query_duration_seconds", "SQLite execute() time by statement (verb and table).", ("statement",), DB_BUCKETS
+)
+analyzer_stage_seconds = Histogram(
+    "vg_analyzer_stage_duration_seconds", "Analyzer time per analysis call by stage.", ("stage",)
+)
+analyzer_sentences = Counter("vg_analyzer_sentences_total", "Sentences analyzed by spaCy (cache misses).")
+analyzer_tokens = Counter("vg_analyzer_tokens_total", "Tokens analyzed by spaCy (cache misses).")
+
+REGISTRY = (
+    http_requests, http_request_seconds, db_query_seconds,
+    analyzer_stage_seconds, analyzer_sentences, analyzer_tokens,
+)
+
+
+def collect_analyzer_stages() -> int:
+    """nlp/stages.py에 쌓인 샘플을 히스토그램/카운터로 옮깁니다. (옮긴 샘플 수 반환)"""
+    samples = stages.drain()
+    for sample in samples:
+        for index, stage in enumerate(stages.STAGES):
+            analyzer_stage_seconds.observe(sample[index], stage)
+        analyzer_sentences.inc(amount=sample[stages.SENTENCES])
+        analyzer_tokens.inc(amount=sample[stages.TOKENS])
+    return len(samples)
+
+
+def render_metrics(extra: Iterable[str] = ()) -> str:
+    """등록된 메트릭과 `extra` 묶음을 Prometheus 텍스트 형식으로 렌더링합니다."""
+    collect_analyzer_stages()
+    return "\n".join([metric.render() for metric in REGISTRY] + list(extra)) + "\n"
+
+
+# ---------------------------------------------------------
+# DB statement labels
+# ---------------------------------------------------------
+_VERB = re.compile(r"\s*([A-Za-z]+)")
+_CTE_BODY = re.compile(r"\)\s*(SELECT|INSERT|REPLACE|UPDATE|DELETE)\b", re.IGNORECASE)
+_TARGETS = {
+    "SELECT": re.compile(r"\bFROM\s+([A-Za-z_]\w*)", re.IGNORECASE),
+    "DELETE": re.compile(r"\bFROM\s+([A-Za-z_]\w*)", re.IGNORECASE),
+    "INSERT": re.compile(r"\bINTO\s+([A-Za-z_]\w*)", re.IGNORECASE),
+    "REPLACE": re.compile(r"\bINTO\s+([A-Za-z_]\w*)", re.IGNORECASE),
+    "UPDATE": re.compile(r"UPDATE\s+(?:OR\s+\w+\s+)?([A-Za-z_]\w*)", re.IGNORECASE),
+    "PRAGMA": re.compile(r"PRAGMA\s+([A-Za-z_]\w*)", re.IGNORECASE),
+    "CREATE": re.compile(r"\b(?:TABLE|INDEX|TRIGGER|VIEW)\s+(?:IF\s+NOT\s+EXISTS\s+)?([A-Za-z_]\w*)", re.IGNORECASE),
+    "DROP": re.compile(r"\b(?:TABLE|INDEX|TRIGGER|VIEW)\s+(?:IF\s+EXISTS\s+)?([A-Za-z_]\w*)", re.IGNORECASE),
+    "ALTER": re.compile(r"\bTABLE\s+([A-Za-z_]\w*)", re.IGNORECASE),
+}
+_statement_labels: Dict[str, str] = {}
+MAX_STATEMENT_LABELS = 2000
+
+
+def statement_label(sql: str) -> str:
+    """SQL 문을 `VERB table` 라벨로 줄입니다. (예: "SELECT sessions", "PRAGMA foreign_keys")
+
+    파라미터 바인딩을 쓰는 한 SQL 문자열 종류는 한정되므로 결과를 캐시합니다.
+    """
+    label = _statement_labels.get(sql)
+    if label is not None:
+        return label
+    match = _VERB.match(sql)
+    verb = match.group(1).upper() if match else "OTHER"
+    body = sql
+    if verb == "WITH":
+        # CTE 뒤의 본문 문장 기준
+        bodies = list(_CTE_BODY.finditer(sql))
+        if bodies:
+            verb = bodies[-1].group(1).upper()
+            body = sql[bodies[-1].start(1):]
+    target = _TARGETS.get(verb)
+    found = target.search(body) if target is not None else None
+    label = f"{verb} {found.group(1).lower()}" if found else verb
+    if len(_statement_labels) < MAX_STATEMENT_LABELS:
+        _statement_labels[sql] = label
+    return label
@@ -0,0 +1,47 @@
+"""
+Request Metrics Middleware - v1.2
+
+요청마다 라우트 템플릿(`/api/sessions/{session_id}`)과 상태 코드별로 지연 시간을 기록합니다.
+
+- 순수 ASGI 미들웨어이므로 응답 본문(스트리밍 포함)을 감싸지 않고 그대로 전달합니다.
+- 라우트는 FastAPI가 scope에 남기는 `route`로 정하며, 매칭되지 않은 요청(404)은
+  "unmatched"로 묶어 라벨 수가 늘어나지 않게 합니다.
+"""
+import time
+
+from .metrics import http_request_seconds, http_requests
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_label(scope: dict) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return UNMATCHED_ROUTE
+    return path or "/"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = route_label(scope)
+            http_request_seconds.observe(time.perf_counter() - started, scope["method"], route)
+            http_requests.inc(scope["method"], route, str(status[0]))
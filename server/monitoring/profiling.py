@@ -0,0 +1,231 @@
+"""
+Request Profiling - v1.2
+
+"퀴즈가 느리다"는 보고를 재현하기 위해 요청 단위로 스택 샘플링 프로파일을 남깁니다.
+
+- `X-VG-Profile: <VG_PROFILE_TOKEN>` 헤더를 보낸 요청이나 `VG_PROFILE_SAMPLE_RATE` 비율로
+  뽑힌 요청만 프로파일합니다. (`VG_PROFILE_PATHS` 경로만) 토큰을 설정하지 않으면 헤더는 무시하므로
+  익명 사용자가 프로파일링을 켤 수 없습니다.
+- 프로파일 중인 요청이 있는 동안에만 샘플링 스레드가 `VG_PROFILE_INTERVAL_MS`마다
+  API 프로세스의 모든 스레드(이벤트 루프, DB lane, 분석 스레드) 스택을 모읍니다.
+  대기 중인 스레드(락/큐/셀렉터)는 제외하며, 동시에 실행된 다른 요청도 함께 잡힐 수 있습니다.
+- 분석 워커 프로세스 안의 파싱은 워커 결과를 기다리는 스택으로 보입니다.
+  (단계별 시간은 /metrics, 파싱 내부는 `VG_ANALYSIS_WORKERS=0`으로 프로파일)
+- 최근 `VG_PROFILE_KEEP`개를 보관하며, 관리자 API가 flamegraph.pl / speedscope에서
+  읽을 수 있는 collapsed stack 텍스트(`thread;frame;frame 횟수`)로 내보냅니다.
+- 꺼져 있으면(비율 0, 헤더 없음) 요청마다 헤더 확인만 합니다.
+"""
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SAMPLE_RATE = float(os.environ.get("VG_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_HEADER = os.environ.get("VG_PROFILE_HEADER", "x-vg-profile").lower()
+PROFILE_TOKEN = os.environ.get("VG_PROFILE_TOKEN", "")
+KEEP_PROFILES = int(os.environ.get("VG_PROFILE_KEEP", "20"))
+INTERVAL_MS = float(os.environ.get("VG_PROFILE_INTERVAL_MS", "1"))
+PROFILE_PATHS = tuple(p for p in os.environ.get("VG_PROFILE_PATHS", "/api/").split(",") if p)
+
+# 프로파일 API 자신과 /metrics는 프로파일하지 않음
+EXCLUDED_PATHS = ("/api/manage/profiles", "/metrics")
+
+# 이 파일들의 함수에서 멈춰 있는 스레드는 대기 중으로 보고 제외
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+
+
+def collapse_stack(frame) -> Optional[str]:
+    """바깥 → 안쪽 순서의 `file:func;file:func` 문자열 (대기 중인 스레드는 None)"""
+    if os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+        return None
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class RequestProfiler:
+    """요청별 스택 샘플 수집기 + 최근 프로파일 보관소"""
+
+    def __init__(
+        self,
+        sample_rate: float = SAMPLE_RATE,
+        keep: int = KEEP_PROFILES,
+        interval_ms: float = INTERVAL_MS,
+        token: str = PROFILE_TOKEN,
+        paths=PROFILE_PATHS,
+    ):
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.token = token
+        self.paths = tuple(paths)
+        self._profiles: deque = deque(maxlen=keep)
+        self._active: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._counters = {"captured": 0, "samples": 0}
+
+    # ---------------------------------------------------------
+    # Selection
+    # ---------------------------------------------------------
+    def wants(self, path: str, header_value: Optional[str]) -> Optional[str]:
+        """이 요청을 프로파일할 이유("header" | "sample")를 돌려줍니다. (아니면 None)"""
+        if not path.startswith(self.paths) or path.startswith(EXCLUDED_PATHS):
+            return None
+        if self.token and header_value is not None and self._token_matches(header_value):
+            return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    def _token_matches(self, header_value: str) -> bool:
+        # Starlette는 헤더를 latin-1로 디코딩하므로 원래 바이트로 되돌려 비교
+        # (str끼리의 compare_digest는 ASCII가 아닌 문자에서 TypeError)
+        return hmac.compare_digest(header_value.encode("latin-1"), self.token.encode("utf-8"))
+
+    # ---------------------------------------------------------
+    # Recording
+    # ---------------------------------------------------------
+    def begin(self, method: str, path: str, reason: str) -> dict:
+        profile = {
+            "id": uuid.uuid4().hex[:12],
+            "method": method,
+            "path": path,
+            "route": None,
+            "status": None,
+            "reason": reason,
+            "startedAt": datetime.utcnow().isoformat(),
+            "durationMs": None,
+            "samples": 0,
+            "stacks": Counter(),
+            "_started": time.perf_counter(),
+        }
+        with self._lock:
+            self._active[profile["id"]] = profile
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._sampler.start()
+        return profile
+
+    def end(self, profile: dict, status: int, route: Optional[str]) -> None:
+        with self._lock:
+            self._active.pop(profile["id"], None)
+            profile["durationMs"] = round((time.perf_counter() - profile.pop("_started")) * 1000, 1)
+            profile["status"] = status
+            profile["route"] = route
+            self._profiles.append(profile)
+            self._counters["captured"] += 1
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            names = {t.ident: t.name for t in threading.enumerate()}
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = collapse_stack(frame)
+                if stack is not None:
+                    stacks.append(f"{names.get(ident, ident)};{stack}")
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                for profile in self._active.values():
+                    profile["samples"] += 1
+                    profile["stacks"].update(stacks)
+                self._counters["samples"] += 1
+
+    # ---------------------------------------------------------
+    # Reading
+    # ---------------------------------------------------------
+    def recent(self) -> List[dict]:
+        """보관 중인 프로파일 요약 (최신순, 스택 제외)"""
+        with self._lock:
+            profiles = list(self._profiles)
+        return [
+            {key: value for key, value in p.items() if key != "stacks"}
+            for p in reversed(profiles)
+        ]
+
+    def collapsed(self, profile_id: str) -> Optional[str]:
+        """flamegraph collapsed stack 텍스트 (`stack count` 줄, 많이 잡힌 순)"""
+        with self._lock:
+            profile = next((p for p in self._profiles if p["id"] == profile_id), None)
+            if profile is None:
+                return None
+            stacks = profile["stacks"].most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sampleRate": self.sample_rate,
+                "intervalMs": self.interval * 1000,
+                "keep": self._profiles.maxlen,
+                "stored": len(self._profiles),
+                "active": len(self._active),
+                "tokenRequired": bool(self.token),
+                **self._counters,
+            }
+
+
+request_profiler = RequestProfiler()
+
+
+class ProfilingMiddleware:
+    """선택된 요청만 `request_profiler`로 감싸고 응답에 `X-VG-Profile-Id`를 붙입니다."""
+
+    def __init__(self, app, profiler: RequestProfiler = request_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header_value = None
+        header_name = PROFILE_HEADER.encode("latin-1")
+        for name, value in scope["headers"]:
+            if name == header_name:
+                header_value = value.decode("latin-1")
+                break
+        if header_value is None and self.profiler.sample_rate <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        reason = self.profiler.wants(scope["path"], header_value)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.profiler.begin(scope["method"], scope["path"], reason)
+        status = [500]
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-vg-profile-id", profile["id"].encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            route = getattr(scope.get("route"), "path", None)
+            self.profiler.end(profile, status[0], route)
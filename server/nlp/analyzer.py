@@ -1,19 +1,92 @@
+import os
+import re
+import threading
+import time
 import spacy
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+from . import stages
+from .cache import (
+    analysis_cache, sentence_cache, normalize_passage, make_cache_key,
+    ANALYZER_VERSION, SENTENCE_CACHE_ENABLED
+)
+
+MODEL_NAME = "en_core_web_sm"
+
+# 파이프라인 프로필: 로드 시 제외할 컴포넌트
+# 분석기는 tag_/pos_/dep_/문장 경계만 사용합니다. en_core_web_sm 에서 pos_ 는
+# attribute_ruler 가 tag_ 로부터 매핑하므로 attribute_ruler 는 제외하면 안 됩니다.
+PIPELINE_PROFILES = {
+    "minimal": ["ner", "lemmatizer"],
+    "full": [],
+}
+PIPELINE_PROFILE = os.environ.get("VG_SPACY_PIPELINE", "minimal")
+
+# nlp.pipe 설정 (배치 분석)
+PIPE_BATCH_SIZE = int(os.environ.get("VG_PIPE_BATCH_SIZE", "16"))
+PIPE_N_PROCESS = int(os.environ.get("VG_PIPE_N_PROCESS", "1"))
+
+# 이 길이를 넘는 지문은 문단/문장 경계에서 조각내어 nlp.pipe로 파싱
+CHUNK_CHARS = int(os.environ.get("VG_ANALYSIS_CHUNK_CHARS", "2000"))
+
+WARM_UP_TEXT = "The students who read this passage find the root verb quickly."
 
 nlp_model = None
+model_id = None
+_model_lock = threading.Lock()
 
 def load_model():
+    """spaCy 모델을 로드합니다. (네트워크 다운로드는 하지 않음)
+
+    모델은 빌드 시(Dockerfile) 또는 `python -m spacy download en_core_web_sm`으로
+    미리 설치되어 있어야 합니다.
+    """
     global nlp_model
-    if nlp_model is None:
-        print("Loading spaCy model...")
-        try:
-            nlp_model = spacy.load("en_core_web_sm")
-        except OSError:
-            print("Model not found. Downloading...")
-            from spacy.cli import download
-            download("en_core_web_sm")
-            nlp_model = spacy.load("en_core_web_sm")
+    if nlp_model is not None:
+        return
+    with _model_lock:
+        if nlp_model is None:
+            print("Loading spaCy model...")
+            try:
+                nlp_model = spacy.load(MODEL_NAME, exclude=get_excluded_components())
+            except OSError as e:
+                raise RuntimeError(
+                    f"spaCy model '{MODEL_NAME}' is not installed. "
+                    f"Run: python -m spacy download {MODEL_NAME}"
+                ) from e
+
+
+def warm_up() -> bool:
+    """모델을 로드하고 예시 문장을 한 번 분석하여 첫 요청 지연을 없앱니다."""
+    load_model()
+    _analyze_doc(nlp_model(WARM_UP_TEXT), 'FULL')
+    return True
+
+
+def get_model_id() -> str:
+    """캐시 키에 사용할 모델 식별자 (이름@버전/파이프라인 프로필).
+
+    설치된 모델 패키지 버전을 사용하므로 모델을 메모리에 올리지 않아도 됩니다.
+    (분석 워커 프로세스만 모델을 로드하는 경우)
+    """
+    global model_id
+    if model_id is None:
+        version = spacy.util.get_package_version(MODEL_NAME) or "unknown"
+        model_id = f"{MODEL_NAME}@{version}/{PIPELINE_PROFILE}"
+    return model_id
+
+
+def get_excluded_components(profile: Optional[str] = None) -> List[str]:
+    """파이프라인 프로필에 해당하는 제외 컴포넌트 목록."""
+    profile = profile or PIPELINE_PROFILE
+    if profile not in PIPELINE_PROFILES:
+        raise ValueError(f"Unknown spaCy pipeline profile: {profile}")
+    return PIPELINE_PROFILES[profile]
+
+
+def get_analysis_version() -> str:
+    """저장된 분석 결과의 유효성 판단에 사용하는 버전 (모델 + 분석 로직)."""
+    return f"{get_model_id()}+analyzer{ANALYZER_VERSION}"
 
 
 def find_all_roots(sent) -> List:
@@ -100,62 +173,392 @@ def find_subjects_for_roots(roots: List, token_map: Dict[int, int]) -> tuple:
 
 
 def analyze_passage(text: str, mode: str = 'FULL') -> dict:
+    """지문을 분석합니다. 동일 지문/모드/모델 조합은 캐시된 결과를 반환합니다.
+
+    반환된 dict는 캐시와 공유되므로 수정하지 마세요.
+    """
+    text = normalize_passage(text)
+    key = make_cache_key(text, mode, get_model_id())
+
+    cached = analysis_cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = parse_passage(text, mode)
+    analysis_cache.put(key, result)
+    return result
+
+
+def parse_passage(text: str, mode: str = 'FULL') -> dict:
+    """지문 캐시를 거치지 않고 지문을 분석합니다. (분석 워커 프로세스에서 실행)
+
+    문장 캐시가 켜져 있으면 모든 문장이 검증된 캐시 항목인 지문은 파싱하지 않습니다.
+    """
     load_model()
-    doc = nlp_model(text)
-    
+    text = normalize_passage(text)
+    with stages.analysis_call():
+        if SENTENCE_CACHE_ENABLED:
+            return _parse_with_sentence_cache(text, mode)
+        return _parse_in_context(text, mode)
+
+
+def _parse_in_context(text: str, mode: str) -> dict:
+    if len(text) > CHUNK_CHARS:
+        return _parse_chunked(text, mode)
+    return _analyze_doc(_timed_parse(text), mode)
+
+
+def split_into_chunks(text: str, max_chars: Optional[int] = None) -> List[str]:
+    """긴 지문을 max_chars(기본값 CHUNK_CHARS) 이하의 조각으로 나눕니다.
+
+    문단(빈 줄) 경계를 우선하고, 한도를 넘는 문단은 문장 경계에서,
+    한도를 넘는 문장은 공백에서 자릅니다. 이웃한 조각은 한도 안에서 다시 합칩니다.
+    """
+    max_chars = max_chars or CHUNK_CHARS
+    pieces = []  # (앞 조각과의 구분자, 조각)
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(("\n\n", paragraph))
+            continue
+        sep = "\n\n"
+        for sent in _get_segmenter()(paragraph).sents:
+            sentence = sent.text.strip()
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars + 1)
+                cut = cut if cut > 0 else max_chars
+                pieces.append((sep, sentence[:cut].rstrip()))
+                sentence = sentence[cut:].lstrip()
+                sep = " "
+            if sentence:
+                pieces.append((sep, sentence))
+                sep = " "
+
+    chunks = []
+    current = ""
+    for sep, piece in pieces:
+        if current and len(current) + len(sep) + len(piece) <= max_chars:
+            current += sep + piece
+        else:
+            if current:
+                chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _parse_chunked(text: str, mode: str) -> dict:
+    """긴 지문을 조각으로 나누어 nlp.pipe로 파싱하고 문장 id를 전역으로 이어 붙입니다.
+
+    Doc은 조각마다 문장 결과만 뽑고 버리므로 메모리 사용량은 배치 크기로 제한됩니다.
+    """
     sentences_data = []
-    
-    for sent_idx, sent in enumerate(doc.sents):
-        # 1. Tokenization with mapping
-        sent_tokens_data = []
-        token_map = {}  # global_idx -> local_idx
-        
-        for local_idx, token in enumerate(sent):
-            token_map[token.i] = local_idx
-            
-            sent_tokens_data.append({
-                "id": local_idx,
-                "text": token.text,
-                "start": token.idx - sent.start_char,
-                "end": token.idx - sent.start_char + len(token.text),
-                "pos": token.pos_,
-                "tag": token.tag_,
-                "dep": token.dep_
-            })
-        
-        # 2. Find all roots
-        root_tokens = find_all_roots(sent)
-        
-        # v1.1.2 원칙 적용: 기초 모드(CORE)인 경우 메인 ROOT 1개만 남김
-        if mode == 'CORE' and len(root_tokens) > 1:
-            # find_all_roots는 이미 정렬되어 있으므로, 
-            # 실제 sent.root에 해당하는 토큰을 찾거나 첫 번째 것을 선택
-            main_root = next((t for t in root_tokens if t == sent.root), root_tokens[0])
-            root_tokens = [main_root]
-            
-        roots = [token_map.get(t.i) for t in root_tokens]
-        
-        # 3. Find subjects for each root
-        subjects, subject_spans = find_subjects_for_roots(root_tokens, token_map)
-        
-        # Create Key object
-        key_data = {
-            "roots": roots,
-            "subjects": subjects,
-            "subjectSpans": subject_spans
-        }
-        
-        sentences_data.append({
-            "id": sent_idx,
-            "text": sent.text,
-            "tokens": sent_tokens_data,
-            "key": key_data
-        })
-    
+    chunks = split_into_chunks(text)
+    for doc in _timed_docs(nlp_model.pipe(chunks, batch_size=PIPE_BATCH_SIZE, n_process=PIPE_N_PROCESS)):
+        for item in iter_sentences(doc, mode):
+            sentences_data.append({"id": len(sentences_data), **item})
+    return _build_result(sentences_data)
+
+
+def passage_chunks(text: str) -> List[str]:
+    """`parse_passage`가 문맥으로 삼는 파싱 단위로 지문을 나눕니다.
+
+    CHUNK_CHARS 이하면 지문 전체, 넘으면 split_into_chunks 조각입니다.
+    spaCy 모델을 로드하지 않으므로 API 프로세스에서도 호출할 수 있습니다.
+    """
+    text = normalize_passage(text)
+    return split_into_chunks(text) if len(text) > CHUNK_CHARS else [text]
+
+
+def parse_chunk(chunk: str, mode: str = 'FULL') -> List[dict]:
+    """passage_chunks 조각 하나를 파싱하여 doc.sents 순서의 문장 결과(id 제외)를 돌려줍니다. (워커에서 실행)"""
+    load_model()
+    with stages.analysis_call():
+        return list(iter_sentences(_timed_parse(chunk), mode))
+
+
+# 문장 분리 전용 파이프라인 (모델 없이 규칙 기반으로 문장 경계만 계산)
+_segmenter = None
+_SENTENCE_END = (".", "!", "?", '."', '!"', '?"', ".'", "!'", "?'", ".”", "!”", "?”")
+_OPENING_QUOTES = ('"', "'", "“", "‘")
+
+
+def _get_segmenter():
+    global _segmenter
+    if _segmenter is None:
+        segmenter = spacy.blank("en")
+        segmenter.add_pipe("sentencizer")
+        _segmenter = segmenter
+    return _segmenter
+
+
+def _is_context_free(segment: str) -> bool:
+    """문장 캐시에 넣어 볼 만한 완결된 문장인지 미리 거릅니다. (검증은 _verify_sentences)
+
+    대문자/숫자로 시작하고 종결 부호로 끝나며 따옴표/괄호가 짝을 이루는
+    문장만 허용합니다. 소문자로 시작하는 조각(잘못 분리된 약어 뒤 등)이나
+    여러 문장에 걸친 인용문은 앞뒤 문맥에 따라 파싱이 달라질 수 있습니다.
+    """
+    body = segment.lstrip("".join(_OPENING_QUOTES) + "(")
+    if not body or not (body[0].isupper() or body[0].isdigit()):
+        return False
+    if not segment.endswith(_SENTENCE_END):
+        return False
+    if segment.count('"') % 2 or segment.count("“") != segment.count("”"):
+        return False
+    if segment.count("(") != segment.count(")"):
+        return False
+    return True
+
+
+def split_passage(text: str) -> Optional[List[str]]:
+    """지문을 문장 캐시 단위의 문장들로 나눕니다.
+
+    spaCy 모델을 로드하지 않으므로 API 프로세스에서도 호출할 수 있습니다.
+    문맥에 의존할 수 있는 문장이 하나라도 있으면 None을 반환합니다.
+    """
+    segments = [sent.text.strip() for sent in _get_segmenter()(normalize_passage(text)).sents]
+    segments = [seg for seg in segments if seg]
+    if not segments or not all(_is_context_free(seg) for seg in segments):
+        return None
+    return segments
+
+
+def _parse_with_sentence_cache(text: str, mode: str) -> dict:
+    """문장 단위 캐시를 사용해 지문을 분석합니다.
+
+    모든 문장이 캐시에 있을 때만 캐시 결과를 조립합니다. 하나라도 없으면 지문을
+    문맥 안에서 파싱하고(반환값), 처음 보는 문장은 단독 파싱 결과가 문맥 안 결과와
+    같을 때만 캐시에 넣습니다.
+    """
+    segments = split_passage(text)
+    if segments is None:
+        return _parse_in_context(text, mode)
+
+    model = f"{get_model_id()}/sentence"
+    keys = [make_cache_key(seg, mode, model) for seg in segments]
+    found = [sentence_cache.get(key) for key in keys]
+    if all(items is not None for items in found):
+        items = [item for cached in found for item in cached]
+        return _build_result([{"id": i, **item} for i, item in enumerate(items)])
+
+    result = _parse_in_context(text, mode)
+    missing = {key: seg for key, seg, cached in zip(keys, segments, found) if cached is None}
+    _verify_sentences(missing, _group_by_segment(segments, result["sentences"], keys), mode)
+    return result
+
+
+def _group_by_segment(segments: List[str], sentences: List[dict], keys: List[str]) -> Dict[str, List[dict]]:
+    """문맥 안 문장 결과(id 제외)를 split_passage 문장별로 묶습니다.
+
+    파서의 문장 경계가 문장 하나를 넘어가면 그 뒤 문장은 묶지 않습니다.
+    """
+    groups: Dict[str, List[dict]] = {}
+    pos = 0
+    for seg, key in zip(segments, keys):
+        target = "".join(seg.split())
+        group, joined = [], ""
+        while pos < len(sentences) and len(joined) < len(target):
+            group.append({k: v for k, v in sentences[pos].items() if k != "id"})
+            joined += "".join(sentences[pos]["text"].split())
+            pos += 1
+        if joined != target:
+            break
+        groups.setdefault(key, group)
+    return groups
+
+
+def _verify_sentences(missing: Dict[str, str], groups: Dict[str, List[dict]], mode: str) -> None:
+    """처음 보는 문장을 단독으로 파싱하여 문맥 안 결과와 같은 문장만 캐시에 넣습니다."""
+    candidates = [(key, seg) for key, seg in missing.items() if key in groups]
+    docs = _timed_docs(nlp_model.pipe([seg for _, seg in candidates], batch_size=PIPE_BATCH_SIZE))
+    for (key, seg), doc in zip(candidates, docs):
+        standalone = list(iter_sentences(doc, mode))
+        if standalone == groups[key]:
+            sentence_cache.put(key, standalone)
+
+
+def analyze_passages(
+    texts: List[str],
+    mode: str = 'FULL',
+    batch_size: int = PIPE_BATCH_SIZE,
+    n_process: int = PIPE_N_PROCESS,
+) -> List[Dict[str, Any]]:
+    """여러 지문을 nlp.pipe로 한 번에 분석합니다.
+
+    Returns:
+        입력 순서와 같은 순서의 `{"result": dict | None, "error": str | None}` 목록.
+        한 지문의 실패가 나머지 지문의 분석을 막지 않습니다.
+    """
+    model = get_model_id()
+    items: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+
+    # 1. 캐시 확인 (같은 지문이 여러 번 들어오면 한 번만 분석)
+    pending: Dict[str, List[int]] = {}  # cache key -> input indexes
+    pending_texts: Dict[str, str] = {}
+    for i, raw in enumerate(texts):
+        text = normalize_passage(raw)
+        key = make_cache_key(text, mode, model)
+        cached = analysis_cache.get(key)
+        if cached is not None:
+            items[i] = {"result": cached, "error": None}
+        else:
+            pending.setdefault(key, []).append(i)
+            pending_texts[key] = text
+
+    # 2. 남은 지문을 nlp.pipe로 배치 분석
+    parsed = parse_passages(list(pending_texts.values()), mode, batch_size, n_process)
+    for key, item in zip(pending, parsed):
+        if item["result"] is not None:
+            analysis_cache.put(key, item["result"])
+        for i in pending[key]:
+            items[i] = item
+
+    return items
+
+
+def parse_passages(
+    texts: List[str],
+    mode: str = 'FULL',
+    batch_size: int = PIPE_BATCH_SIZE,
+    n_process: int = PIPE_N_PROCESS,
+) -> List[Dict[str, Any]]:
+    """지문 캐시를 거치지 않고 여러 지문을 nlp.pipe로 분석합니다. (분석 워커 프로세스에서 실행)
+
+    반환 형식은 `analyze_passages`와 같습니다.
+    """
+    if not texts:
+        return []
+    load_model()
+    texts = [normalize_passage(text) for text in texts]
+    items: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+
+    def finish(i: int, result: Optional[dict], error: Optional[str]) -> None:
+        items[i] = {"result": result, "error": error}
+
+    with stages.analysis_call():
+        try:
+            docs = _timed_docs(nlp_model.pipe(texts, batch_size=batch_size, n_process=n_process))
+            for i, doc in enumerate(docs):
+                try:
+                    finish(i, _analyze_doc(doc, mode), None)
+                except Exception as e:
+                    finish(i, None, str(e))
+        except Exception as e:
+            # 파싱 중 예외는 pipe 전체를 중단시키므로 남은 지문은 하나씩 분석
+            print(f"Batch pipe aborted, falling back to single parses: {e}")
+            for i, text in enumerate(texts):
+                if items[i] is not None:
+                    continue
+                try:
+                    finish(i, _analyze_doc(_timed_parse(text), mode), None)
+                except Exception as single_error:
+                    finish(i, None, str(single_error))
+
+    return items
+
+
+def _timed_parse(text: str):
+    """nlp_model(text) + spaCy 파싱 시간 기록 (nlp/stages.py)"""
+    start = time.perf_counter()
+    doc = nlp_model(text)
+    stages.record_parse(time.perf_counter() - start)
+    return doc
+
+
+def _timed_docs(docs: Iterable) -> Iterator:
+    """nlp.pipe 결과를 그대로 생성하면서 다음 Doc을 기다린 시간을 파싱 시간으로 기록합니다."""
+    docs = iter(docs)
+    while True:
+        start = time.perf_counter()
+        doc = next(docs, None)
+        stages.record_parse(time.perf_counter() - start)
+        if doc is None:
+            return
+        yield doc
+
+
+def _analyze_doc(doc, mode: str) -> dict:
+    sentences_data = [
+        {"id": sent_idx, **item} for sent_idx, item in enumerate(iter_sentences(doc, mode))
+    ]
+    return _build_result(sentences_data)
+
+
+def iter_sentences(doc, mode: str = 'FULL') -> Iterator[dict]:
+    """doc.sents를 따라 문장 결과(id 제외)를 하나씩 생성합니다."""
+    for sent in doc.sents:
+        yield _analyze_sentence(sent, mode)
+
+
+def _build_result(sentences_data: List[dict]) -> dict:
     return {
         "sentences": sentences_data,
         "meta": {
             "totalSentences": len(sentences_data),
-            "nlp_model": "en_core_web_sm"
+            "nlp_model": MODEL_NAME
         }
     }
+
+
+def _analyze_sentence(sent, mode: str) -> dict:
+    """문장 하나의 토큰/정답 키를 만듭니다. (문장 id는 호출자가 붙임)"""
+    started = time.perf_counter()
+    
+    # 1. Tokenization with mapping
+    sent_tokens_data = []
+    token_map = {}  # global_idx -> local_idx
+    
+    for local_idx, token in enumerate(sent):
+        token_map[token.i] = local_idx
+        
+        sent_tokens_data.append({
+            "id": local_idx,
+            "text": token.text,
+            "start": token.idx - sent.start_char,
+            "end": token.idx - sent.start_char + len(token.text),
+            "pos": token.pos_,
+            "tag": token.tag_,
+            "dep": token.dep_
+        })
+    
+    # 2. Find all roots
+    roots_started = time.perf_counter()
+    root_tokens = find_all_roots(sent)
+    roots_seconds = time.perf_counter() - roots_started
+    
+    # v1.1.2 원칙 적용: 기초 모드(CORE)인 경우 메인 ROOT 1개만 남김
+    if mode == 'CORE' and len(root_tokens) > 1:
+        # find_all_roots는 이미 정렬되어 있으므로, 
+        # 실제 sent.root에 해당하는 토큰을 찾거나 첫 번째 것을 선택
+        main_root = next((t for t in root_tokens if t == sent.root), root_tokens[0])
+        root_tokens = [main_root]
+        
+    roots = [token_map.get(t.i) for t in root_tokens]
+    
+    # 3. Find subjects for each root
+    subjects_started = time.perf_counter()
+    subjects, subject_spans = find_subjects_for_roots(root_tokens, token_map)
+    subjects_seconds = time.perf_counter() - subjects_started
+    
+    # Create Key object
+    key_data = {
+        "roots": roots,
+        "subjects": subjects,
+        "subjectSpans": subject_spans
+    }
+    
+    item = {
+        "text": sent.text,
+        "tokens": sent_tokens_data,
+        "key": key_data
+    }
+    # 나머지(토큰/키 dict 생성)는 직렬화 시간
+    total_seconds = time.perf_counter() - started
+    stages.record_sentence(
+        roots_seconds, subjects_seconds, total_seconds - roots_seconds - subjects_seconds, len(sent_tokens_data)
+    )
+    return item
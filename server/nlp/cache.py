@@ -0,0 +1,235 @@
+"""
+Analysis Result Cache - v1.2
+
+같은 지문이 짧은 시간에 여러 학생에게서 반복 분석되는 경우를 위해
+`analyze_passage` 결과를 캐싱합니다.
+
+- 키: 정규화된 지문 텍스트 + 모드 + 모델 이름/버전 + 분석기 버전의 SHA-256 해시
+- 1차 캐시: 바이트 크기 기준으로 제한되는 메모리 LRU
+- 2차 캐시(선택): SQLite 파일 (`VG_ANALYSIS_CACHE_PATH` 설정 시 활성화)
+"""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+# 분석 로직(find_all_roots 등)이 바뀌면 올려서 기존 캐시를 무효화합니다.
+ANALYZER_VERSION = "1.2.1"
+
+DEFAULT_MAX_BYTES = int(os.environ.get("VG_ANALYSIS_CACHE_MB", "64")) * 1024 * 1024
+DEFAULT_MAX_ENTRIES = int(os.environ.get("VG_ANALYSIS_CACHE_ENTRIES", "2048"))
+DEFAULT_L2_PATH = os.environ.get("VG_ANALYSIS_CACHE_PATH", "")
+DEFAULT_L2_MAX_ROWS = int(os.environ.get("VG_ANALYSIS_CACHE_L2_ROWS", "20000"))
+
+# 문장 단위 캐시 (분석 워커 프로세스마다 별도로 유지)
+# 단독 파싱 결과가 지문 안 결과와 같은 문장만 저장하므로 처음 보는 문장은 두 번 파싱됨
+# (반복 문장이 많은 배포에서만 이득이라 기본값은 꺼짐)
+SENTENCE_CACHE_ENABLED = os.environ.get("VG_SENTENCE_CACHE", "0") == "1"
+SENTENCE_CACHE_MAX_BYTES = int(os.environ.get("VG_SENTENCE_CACHE_MB", "32")) * 1024 * 1024
+SENTENCE_CACHE_MAX_ENTRIES = int(os.environ.get("VG_SENTENCE_CACHE_ENTRIES", "50000"))
+
+
+def normalize_passage(text: str) -> str:
+    """캐시 키와 분석 입력에 공통으로 쓰이는 지문 정규화.
+
+    유니코드 NFC 정규화, 줄바꿈 통일(CRLF → LF), 앞뒤 공백 제거만 수행합니다.
+    문장 내부 공백은 토큰 오프셋에 영향을 주므로 건드리지 않습니다.
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text.strip()
+
+
+def hash_passage(text: str) -> str:
+    """정규화된 지문 내용의 해시 (저장된 분석 결과의 무효화 판단용)."""
+    return hashlib.sha256(normalize_passage(text).encode("utf-8")).hexdigest()
+
+
+def make_cache_key(text: str, mode: str, model_id: str) -> str:
+    """정규화된 지문, 모드, 모델 식별자로 캐시 키를 만듭니다."""
+    h = hashlib.sha256()
+    for part in (ANALYZER_VERSION, model_id, mode, text):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """바이트 크기 제한 LRU + 선택적 SQLite 2차 캐시.
+
+    캐시된 결과(dict/list)는 여러 요청이 공유하므로 호출자는 수정하면 안 됩니다.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        l2_path: str = DEFAULT_L2_PATH,
+        l2_max_rows: int = DEFAULT_L2_MAX_ROWS,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.l2_path = l2_path
+        self.l2_max_rows = l2_max_rows
+
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._l2_lock = threading.Lock()
+        self._l2_conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.l2_path:
+            self._init_l2()
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        payload = self._l2_get(key)
+        if payload is not None:
+            result = json.loads(payload)
+            with self._lock:
+                self.l2_hits += 1
+            self._put_memory(key, result, len(payload.encode("utf-8")))
+            return result
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, result: Any) -> None:
+        payload = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+        size = len(payload.encode("utf-8"))
+        self._put_memory(key, result, size)
+        self._l2_put(key, payload, size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self._l2_conn is not None:
+            with self._l2_lock:
+                self._l2_conn.execute("DELETE FROM analysis_cache")
+                self._l2_conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.l2_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxBytes": self.max_bytes,
+                "maxEntries": self.max_entries,
+                "hits": self.hits,
+                "l2Hits": self.l2_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRatio": round((self.hits + self.l2_hits) / lookups, 4) if lookups else 0.0,
+                "l2Enabled": self._l2_conn is not None,
+            }
+
+    # ---------------------------------------------------------
+    # Memory tier
+    # ---------------------------------------------------------
+    def _put_memory(self, key: str, result: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while self._entries and (
+                self._bytes > self.max_bytes or len(self._entries) > self.max_entries
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    # ---------------------------------------------------------
+    # SQLite tier
+    # ---------------------------------------------------------
+    def _init_l2(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.l2_path)), exist_ok=True)
+            conn = sqlite3.connect(self.l2_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_access ON analysis_cache(last_access)"
+            )
+            conn.commit()
+            self._l2_conn = conn
+        except sqlite3.Error as e:
+            print(f"[AnalysisCache] SQLite tier disabled: {e}")
+            self._l2_conn = None
+
+    def _l2_get(self, key: str) -> Optional[str]:
+        if self._l2_conn is None:
+            return None
+        try:
+            with self._l2_lock:
+                row = self._l2_conn.execute(
+                    "SELECT payload FROM analysis_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self._l2_conn.execute(
+                    "UPDATE analysis_cache SET last_access = ? WHERE key = ?", (time.time(), key)
+                )
+                self._l2_conn.commit()
+                return row[0]
+        except sqlite3.Error as e:
+            print(f"[AnalysisCache] SQLite read failed: {e}")
+            return None
+
+    def _l2_put(self, key: str, payload: str, size: int) -> None:
+        if self._l2_conn is None:
+            return
+        try:
+            with self._l2_lock:
+                self._l2_conn.execute(
+                    "INSERT OR REPLACE INTO analysis_cache (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, payload, size, time.time())
+                )
+                # 오래된 항목 정리 (최근 접근 기준)
+                self._l2_conn.execute("""
+                    DELETE FROM analysis_cache WHERE key IN (
+                        SELECT key FROM analysis_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.l2_max_rows,))
+                self._l2_conn.commit()
+        except sqlite3.Error as e:
+            print(f"[AnalysisCache] SQLite write failed: {e}")
+
+
+# 프로세스 전역 캐시 인스턴스
+analysis_cache = AnalysisCache()
+sentence_cache = AnalysisCache(
+    max_bytes=SENTENCE_CACHE_MAX_BYTES, max_entries=SENTENCE_CACHE_MAX_ENTRIES, l2_path=""
+)
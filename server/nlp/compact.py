@@ -0,0 +1,84 @@
+"""
+Compact Analysis Encoding - v1.2
+
+`AnalysisResponse`를 문장별 병렬 배열(columnar) 형식으로 변환합니다.
+
+- POS/tag/dep 문자열은 응답 전체에서 한 번만 `labels` 테이블에 저장하고
+  토큰에는 정수 코드만 남깁니다.
+- 토큰 텍스트와 id는 저장하지 않습니다. (`sentence.text[start:end]`, 배열 순서로 복원)
+- start/end는 유니코드 코드 포인트 기준입니다. (JS에서는 UTF-16 단위가 아니므로 `Array.from(text)`로 자름)
+
+    {
+      "format": "compact-v1",
+      "labels": {"pos": ["DET", ...], "tag": [...], "dep": [...]},
+      "sentences": [{"id": 0, "text": "...", "key": {...},
+                     "tokens": {"start": [...], "end": [...], "pos": [...], "tag": [...], "dep": [...]}}],
+      "meta": {...}
+    }
+"""
+from typing import Dict, List
+
+COMPACT_FORMAT = "compact-v1"
+_LABEL_FIELDS = ("pos", "tag", "dep")
+
+
+def encode_compact(result: dict) -> dict:
+    """분석 결과(dict)를 compact 형식으로 변환합니다."""
+    tables: Dict[str, List[str]] = {field: [] for field in _LABEL_FIELDS}
+    codes: Dict[str, Dict[str, int]] = {field: {} for field in _LABEL_FIELDS}
+
+    def intern(field: str, label: str) -> int:
+        code = codes[field].get(label)
+        if code is None:
+            code = codes[field][label] = len(tables[field])
+            tables[field].append(label)
+        return code
+
+    sentences = []
+    for sentence in result["sentences"]:
+        tokens = sentence["tokens"]
+        columns = {
+            "start": [t["start"] for t in tokens],
+            "end": [t["end"] for t in tokens],
+        }
+        for field in _LABEL_FIELDS:
+            columns[field] = [intern(field, t[field]) for t in tokens]
+        sentences.append({
+            "id": sentence["id"],
+            "text": sentence["text"],
+            "tokens": columns,
+            "key": sentence["key"],
+        })
+
+    return {
+        "format": COMPACT_FORMAT,
+        "labels": tables,
+        "sentences": sentences,
+        "meta": result["meta"],
+    }
+
+
+def decode_compact(payload: dict) -> dict:
+    """compact 형식을 `AnalysisResponse`와 같은 구조로 되돌립니다."""
+    labels = payload["labels"]
+    sentences = []
+    for sentence in payload["sentences"]:
+        text = sentence["text"]
+        columns = sentence["tokens"]
+        tokens = [
+            {
+                "id": i,
+                "text": text[start:end],
+                "start": start,
+                "end": end,
+                "pos": labels["pos"][pos],
+                "tag": labels["tag"][tag],
+                "dep": labels["dep"][dep],
+            }
+            for i, (start, end, pos, tag, dep) in enumerate(zip(
+                columns["start"], columns["end"], columns["pos"], columns["tag"], columns["dep"]
+            ))
+        ]
+        sentences.append({"id": sentence["id"], "text": text, "tokens": tokens, "key": sentence["key"]})
+
+    return {"sentences": sentences, "meta": payload["meta"]}
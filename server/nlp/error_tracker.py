@@ -1,69 +1,347 @@
 """
-NLP Error Tracker - v1.1.2
+NLP Error Tracker - v1.2
 
 NLP 분석 실패 케이스를 로깅하여 향후 분석 개선에 활용합니다.
+
+- `log_analysis_error`는 메모리 대기열에 넣기만 하고 바로 반환합니다.
+  writer 스레드가 `VG_NLP_ERROR_FLUSH_MS`마다 또는 `VG_NLP_ERROR_FLUSH_ROWS`개가 모이면
+  한 번에 파일에 씁니다. 대기열이 `VG_NLP_ERROR_QUEUE_SIZE`를 넘으면 새 항목은 버립니다.
+- 로그 파일이 `VG_NLP_ERROR_LOG_MB`를 넘거나 `VG_NLP_ERROR_ROTATE_HOURS`(0이면 사용 안 함)보다
+  오래되면 `nlp_errors-YYYYMMDD-HHMMSS-ffffff.log.gz`로 압축 교체하고, 최근 `VG_NLP_ERROR_LOG_BACKUPS`개만 남깁니다.
+- 오류 유형별 횟수는 메모리에 유지하고 flush마다 `nlp_errors.stats.json`에 저장하므로
+  `get_error_stats()`는 로그 크기와 관계없이 파일을 다시 읽지 않습니다.
+- 같은 묶음을 `nlp_errors.db`(`FailureStore`)에 문장별로 중복 제거하여 기록합니다. (관리자 조회용)
+- `track_analysis_result`는 분석 결과에서 뿌리 동사/주어를 찾지 못한 문장을 골라 기록합니다.
 """
 import os
 import json
+import gzip
+import shutil
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+from .failure_store import FailureStore
 
 # 로그 파일 경로
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 LOG_PATH = os.path.join(BASE_DIR, "data", "nlp_errors.log")
 
+FLUSH_INTERVAL_MS = int(os.environ.get("VG_NLP_ERROR_FLUSH_MS", "1000"))
+FLUSH_MAX_ROWS = int(os.environ.get("VG_NLP_ERROR_FLUSH_ROWS", "200"))
+MAX_PENDING_ROWS = int(os.environ.get("VG_NLP_ERROR_QUEUE_SIZE", "5000"))
+ROTATE_MAX_BYTES = int(float(os.environ.get("VG_NLP_ERROR_LOG_MB", "10")) * 1024 * 1024)
+ROTATE_MAX_HOURS = float(os.environ.get("VG_NLP_ERROR_ROTATE_HOURS", "0"))
+ROTATE_BACKUPS = int(os.environ.get("VG_NLP_ERROR_LOG_BACKUPS", "5"))
+
+# 주어가 있어야 하는 정형 동사 태그 (명령문의 VB는 제외)
+FINITE_TAGS = {"VBD", "VBP", "VBZ", "MD"}
+VERB_POS = {"VERB", "AUX"}
+SKIP_POS = {"PUNCT", "SPACE", "SYM", "X"}
+
+
+def _stats_path(log_path: str) -> str:
+    return os.path.splitext(log_path)[0] + ".stats.json"
+
+
+class ErrorTracker:
+    """NLP 오류 로그를 모아서 기록하는 writer 스레드와 유형별 카운터."""
+
+    def __init__(
+        self,
+        log_path: Optional[str] = None,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+        max_rows: int = FLUSH_MAX_ROWS,
+        max_pending: int = MAX_PENDING_ROWS,
+        rotate_bytes: int = ROTATE_MAX_BYTES,
+        rotate_hours: float = ROTATE_MAX_HOURS,
+        backups: int = ROTATE_BACKUPS,
+    ):
+        self._log_path = log_path
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_hours * 3600
+        self.backups = backups
+
+        self._pending: deque = deque()
+        self._cond = threading.Condition()
+        self._drain_lock = threading.Lock()  # 한 번에 한 묶음만 기록
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+        self._store: Optional[FailureStore] = None
+        self._stats: Optional[Dict[str, int]] = None  # 오류 유형별 누적 횟수 (처음 조회/기록 시 로드)
+        self._stats_log_path: Optional[str] = None
+        self._file_started: Optional[float] = None
+        self._counters = {"logged": 0, "written": 0, "dropped": 0, "flushes": 0, "rotations": 0}
+
+    @property
+    def log_path(self) -> str:
+        # 지정하지 않으면 모듈의 LOG_PATH를 따름 (테스트에서 교체 가능)
+        return self._log_path or LOG_PATH
+
+    @property
+    def store(self) -> FailureStore:
+        path = os.path.splitext(self.log_path)[0] + ".db"
+        if self._store is None or self._store.path != path:
+            self._store = FailureStore(path)
+        return self._store
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="nlp-error-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """남은 로그를 모두 기록하고 writer 스레드를 종료합니다."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._thread = None
+        self._drain()
+
+    def log(self, sentence: str, error_type: str, details: Optional[Dict[str, Any]] = None) -> None:
+        """로그 항목을 대기열에 넣습니다. (대기열이 가득 차면 버림)"""
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "sentence": sentence,
+            "error_type": error_type,
+            "details": details or {}
+        }
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                self._counters["dropped"] += 1
+                return
+            self._pending.append(entry)
+            self._counters["logged"] += 1
+            if len(self._pending) >= self.max_rows:
+                self._cond.notify_all()
+        self.start()
+
+    def flush(self) -> None:
+        """대기 중인 로그를 지금 기록합니다."""
+        self._drain()
+
+    def error_stats(self) -> Dict[str, int]:
+        with self._cond:
+            self._load_stats()
+            return dict(self._stats)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "maxPending": self.max_pending,
+                "flushIntervalMs": int(self.flush_interval * 1000),
+                "flushMaxRows": self.max_rows,
+                **self._counters,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._pending) < self.max_rows and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._pending and self._stopping:
+                    return
+            self._drain()
+
+    def _drain(self) -> None:
+        with self._drain_lock:
+            with self._cond:
+                if not self._pending:
+                    return
+                entries = list(self._pending)
+                self._pending.clear()
+            try:
+                self._write(entries)
+            except Exception as e:
+                # 로깅 실패는 무시 (메인 기능에 영향을 주지 않음)
+                print(f"[ErrorTracker] Failed to write {len(entries)} errors: {e}")
+                with self._cond:
+                    self._counters["dropped"] += len(entries)
+
+    def _write(self, entries: List[dict]) -> None:
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        with self._cond:
+            self._load_stats()  # 기존 로그 재집계는 이번 묶음을 쓰기 전에
+        self._rotate_if_needed()
+
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(data)
+        try:
+            self.store.record(entries)
+        except Exception as e:
+            print(f"[ErrorTracker] Failed to index {len(entries)} errors: {e}")
+
+        with self._cond:
+            for entry in entries:
+                self._stats[entry["error_type"]] = self._stats.get(entry["error_type"], 0) + 1
+            stats = dict(self._stats)
+            self._counters["written"] += len(entries)
+            self._counters["flushes"] += 1
+        self._save_stats(stats)
+
+    def _load_stats(self) -> None:
+        """저장된 카운터를 읽습니다. (없으면 v1.1.2 로그 파일에서 한 번만 다시 집계)"""
+        if self._stats is not None and self._stats_log_path == self.log_path:
+            return
+        self._stats_log_path = self.log_path
+        try:
+            with open(_stats_path(self.log_path), "r", encoding="utf-8") as f:
+                self._stats = {k: int(v) for k, v in json.load(f).items()}
+            return
+        except (OSError, ValueError):
+            pass
+        self._stats = {}
+        if os.path.exists(self.log_path):
+            try:
+                with open(self.log_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            error_type = json.loads(line.strip()).get("error_type", "unknown")
+                        except json.JSONDecodeError:
+                            continue
+                        self._stats[error_type] = self._stats.get(error_type, 0) + 1
+            except Exception:
+                pass
+
+    def _save_stats(self, stats: Dict[str, int]) -> None:
+        path = _stats_path(self.log_path)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _rotate_if_needed(self) -> None:
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            self._file_started = time.time()
+            return
+        if self._file_started is None:
+            self._file_started = os.path.getmtime(self.log_path) if size else time.time()
+
+        too_big = self.rotate_bytes > 0 and size >= self.rotate_bytes
+        too_old = self.rotate_seconds > 0 and time.time() - self._file_started >= self.rotate_seconds
+        if size and (too_big or too_old):
+            self._rotate()
+
+    def _rotate(self) -> None:
+        base = os.path.splitext(self.log_path)[0]
+        # 이름순 = 시간순 (같은 초에 여러 번 교체되어도 구분되도록 마이크로초까지)
+        target = f"{base}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.log.gz"
+
+        with open(self.log_path, "rb") as src, gzip.open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(self.log_path)
+        self._file_started = time.time()
+        with self._cond:
+            self._counters["rotations"] += 1
+
+        if self.backups > 0:
+            for old in self.rotated_files()[:-self.backups]:
+                os.remove(old)
+
+    def rotated_files(self) -> List[str]:
+        """압축 교체된 로그 파일 (오래된 순)"""
+        directory = os.path.dirname(self.log_path)
+        prefix = os.path.basename(os.path.splitext(self.log_path)[0]) + "-"
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.startswith(prefix) and name.endswith(".log.gz")
+        )
+
+
+error_tracker = ErrorTracker()
+
 
 def log_analysis_error(
     sentence: str,
     error_type: str,
     details: Optional[Dict[str, Any]] = None
 ) -> None:
-    """NLP 분석 오류를 로그 파일에 기록합니다.
-    
+    """NLP 분석 오류를 기록합니다. (대기열에 넣고 바로 반환)
+
     Args:
         sentence: 분석에 실패한 문장
         error_type: 오류 유형 (예: "no_root", "no_subject", "parse_error")
         details: 추가 세부 정보 (선택)
     """
     try:
-        os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
-        
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "sentence": sentence,
-            "error_type": error_type,
-            "details": details or {}
-        }
-        
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
-            
+        error_tracker.log(sentence, error_type, details)
     except Exception as e:
         # 로깅 실패는 무시 (메인 기능에 영향을 주지 않음)
         print(f"[ErrorTracker] Failed to log error: {e}")
 
 
 def get_error_stats() -> Dict[str, int]:
-    """로그 파일에서 오류 통계를 집계합니다.
-    
+    """오류 유형별 발생 횟수 (아직 기록되지 않은 대기열 항목은 제외)
+
     Returns:
         오류 유형별 발생 횟수
     """
-    stats: Dict[str, int] = {}
-    
-    if not os.path.exists(LOG_PATH):
-        return stats
-    
+    return error_tracker.error_stats()
+
+
+def classify_sentence(item: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """분석된 문장(SentenceItem)에서 실패 유형을 찾습니다.
+
+    - no_root: 동사/조동사인 뿌리가 없음 (명사구 조각 등으로 파싱됨)
+    - no_subject: 정형 동사 뿌리에 주어가 없음
+    """
+    tokens = item["tokens"]
+    if all(token["pos"] in SKIP_POS for token in tokens):
+        return []
+    key = item["key"]
+    roots = [root for root in key["roots"] if root is not None]
+
+    failures = []
+    if not any(tokens[root]["pos"] in VERB_POS for root in roots):
+        failures.append(("no_root", {"roots": [tokens[root]["text"] for root in roots]}))
+    missing = [
+        tokens[root]["text"] for root, subject in zip(key["roots"], key["subjects"])
+        if root is not None and subject is None
+        and tokens[root]["pos"] in VERB_POS and tokens[root]["tag"] in FINITE_TAGS
+    ]
+    if missing:
+        failures.append(("no_subject", {"roots": missing}))
+    return failures
+
+
+def track_sentence(item: Dict[str, Any], mode: str) -> None:
+    """분석된 문장 하나의 실패를 기록합니다."""
     try:
-        with open(LOG_PATH, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    error_type = entry.get("error_type", "unknown")
-                    stats[error_type] = stats.get(error_type, 0) + 1
-                except json.JSONDecodeError:
-                    continue
-    except Exception:
-        pass
-    
-    return stats
+        failures = classify_sentence(item)
+        if not failures:
+            return
+        pattern = " ".join(token["tag"] for token in item["tokens"] if token["pos"] != "SPACE")
+        for error_type, details in failures:
+            log_analysis_error(item["text"], error_type, {"mode": mode, "pattern": pattern, **details})
+    except Exception as e:
+        # 결과 형식이 예상과 달라도 분석 응답에는 영향 없음
+        print(f"[ErrorTracker] Failed to check sentence: {e}")
+
+
+def track_analysis_result(result: Dict[str, Any], mode: str) -> None:
+    """분석 결과(AnalysisResponse)의 문장별 실패를 기록합니다."""
+    for item in result.get("sentences", []):
+        track_sentence(item, mode)
@@ -0,0 +1,263 @@
+"""
+Analysis Executor - v1.2
+
+spaCy 파싱을 별도 워커 프로세스 풀에서 실행하여 이벤트 루프와 GIL을
+다른 API(세션, 진행 상황 저장 등)와 분리합니다.
+
+- 워커 프로세스마다 `en_core_web_sm`을 한 번만 로드합니다.
+- 대기 중인 작업 수가 `VG_ANALYSIS_QUEUE_SIZE`를 넘으면 `AnalysisQueueFull`을
+  발생시킵니다. (엔드포인트에서 503 + Retry-After로 변환)
+- `VG_ANALYSIS_WORKERS=0`이면 프로세스 풀 없이 스레드에서 실행합니다. (개발/테스트용)
+- `analyze_passages_async`는 캐시에 없는 지문만 모아 한 번의 워커 작업으로 분석합니다.
+- `stream_passage_async`는 긴 지문을 파싱 조각(VG_ANALYSIS_CHUNK_CHARS) 단위로 분석하여
+  앞 조각의 문장을 먼저 돌려줍니다. 대기열을 차지하지 않도록 한 번에 `VG_STREAM_WINDOW`개 조각까지만 제출합니다.
+- 분석 실패(뿌리 동사/주어 없음)는 새로 파싱한 결과만 기록합니다. (캐시 적중은 제외)
+- 워커에서 쌓인 분석 단계별 시간(nlp/stages.py)은 작업 결과와 함께 부모 프로세스로 옮깁니다.
+"""
+import os
+import asyncio
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from . import analyzer, stages
+from .cache import normalize_passage, make_cache_key
+from .error_tracker import log_analysis_error, track_analysis_result, track_sentence
+
+DEFAULT_WORKERS = int(os.environ.get("VG_ANALYSIS_WORKERS", "1"))
+DEFAULT_QUEUE_SIZE = int(os.environ.get("VG_ANALYSIS_QUEUE_SIZE", "32"))
+RETRY_AFTER_SECONDS = int(os.environ.get("VG_ANALYSIS_RETRY_AFTER", "2"))
+STREAM_WINDOW = int(os.environ.get("VG_STREAM_WINDOW", "2"))
+
+
+class AnalysisQueueFull(Exception):
+    """분석 대기열이 가득 찬 경우."""
+
+    def __init__(self, retry_after: int = RETRY_AFTER_SECONDS):
+        super().__init__("Analysis queue is full")
+        self.retry_after = retry_after
+
+
+def _init_worker() -> None:
+    """워커 프로세스 시작 시 모델을 한 번 로드합니다."""
+    analyzer.load_model()
+
+
+def _run_with_stages(fn: Callable, *args) -> Tuple[Any, list]:
+    """워커에서 `fn(*args)`를 실행하고, 이 워커에 쌓인 단계별 시간 샘플을 함께 돌려줍니다."""
+    return fn(*args), stages.drain()
+
+
+class AnalysisExecutor:
+    """제한된 대기열을 가진 분석용 프로세스 풀."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_QUEUE_SIZE):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+
+        # 모델 준비 상태: "loading" | "ready" | "failed"
+        self.state = "loading"
+        self.error: Optional[str] = None
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self.workers > 0 and self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+
+    def warm_up(self) -> None:
+        """워커(또는 현재 프로세스)에 모델을 로드하고 워밍업 파싱을 실행합니다. (블로킹)"""
+        self.state = "loading"
+        self.error = None
+        try:
+            self.start()
+            if self._pool is None:
+                analyzer.warm_up()
+            else:
+                futures = [self._pool.submit(analyzer.warm_up) for _ in range(self.workers)]
+                for future in futures:
+                    future.result()
+            self.state = "ready"
+            print("[AnalysisExecutor] Model ready.")
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e) or e.__class__.__name__
+            print(f"[AnalysisExecutor] Model warm-up failed: {self.error}")
+
+    def warm_up_in_background(self) -> None:
+        threading.Thread(target=self.warm_up, name="analysis-warm-up", daemon=True).start()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == "ready"
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "workers": self.workers,
+            "pending": self._pending,
+            "maxPending": self.max_pending,
+        }
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """`fn(*args)`를 워커에서 실행하고 결과를 기다립니다.
+
+        `fn`은 워커 프로세스에서 import 가능한 모듈 수준 함수여야 합니다.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise AnalysisQueueFull()
+            self._pending += 1
+
+        try:
+            self.start()
+            loop = asyncio.get_running_loop()
+            try:
+                pool = self._pool
+                if pool is None:
+                    return await loop.run_in_executor(None, fn, *args)
+                result, samples = await loop.run_in_executor(pool, _run_with_stages, fn, *args)
+                stages.extend(samples)
+                return result
+            except BrokenProcessPool:
+                # 워커가 비정상 종료되면 풀을 새로 만들고 오류를 전달
+                print("[AnalysisExecutor] Worker pool broken, restarting...")
+                with self._start_lock:
+                    broken, self._pool = self._pool, None
+                if broken is not None:
+                    broken.shutdown(wait=False)
+                self.warm_up_in_background()
+                raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+analysis_executor = AnalysisExecutor()
+
+# 같은 지문에 대한 동시 요청은 하나의 파싱 작업을 공유 (cache key -> Task)
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def analyze_passage_async(text: str, mode: str = 'FULL') -> dict:
+    """캐시를 확인한 뒤 미스인 경우에만 워커 풀에서 분석합니다.
+
+    파싱은 요청과 분리된 작업으로 실행되므로 먼저 온 요청이 취소되어도(연결 종료 등)
+    같은 지문을 기다리는 다른 요청은 결과를 받고, 결과는 캐시에 저장됩니다.
+    """
+    text = normalize_passage(text)
+    key = make_cache_key(text, mode, analyzer.get_model_id())
+
+    cached = analyzer.analysis_cache.get(key)
+    if cached is not None:
+        return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.ensure_future(_parse_and_cache(key, text, mode))
+        # 기다리는 요청이 모두 취소되어도 "exception was never retrieved" 경고 방지
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    return await asyncio.shield(task)
+
+
+async def _parse_and_cache(key: str, text: str, mode: str) -> dict:
+    try:
+        result = await analysis_executor.run(analyzer.parse_passage, text, mode)
+        analyzer.analysis_cache.put(key, result)
+        track_analysis_result(result, mode)
+        return result
+    finally:
+        del _inflight[key]
+
+
+async def analyze_passages_async(texts: List[str], mode: str = 'FULL') -> List[dict]:
+    """`analyze_passages`의 비동기 버전: 캐시는 이 프로세스에서 확인하고,
+    미스인 지문만 모아 워커에서 한 번의 작업(nlp.pipe)으로 분석합니다.
+    """
+    model = analyzer.get_model_id()
+    keys = [make_cache_key(normalize_passage(text), mode, model) for text in texts]
+    items: List[Optional[dict]] = [None] * len(texts)
+    missing: Dict[str, str] = {}  # cache key -> text (같은 지문은 한 번만 분석)
+    for i, (text, key) in enumerate(zip(texts, keys)):
+        cached = analyzer.analysis_cache.get(key)
+        if cached is not None:
+            items[i] = {"result": cached, "error": None}
+        else:
+            missing.setdefault(key, normalize_passage(text))
+
+    if missing:
+        parsed = dict(zip(missing, await analysis_executor.run(analyzer.parse_passages, list(missing.values()), mode)))
+        for key, item in parsed.items():
+            if item["result"] is not None:
+                analyzer.analysis_cache.put(key, item["result"])
+                track_analysis_result(item["result"], mode)
+            else:
+                log_analysis_error(missing[key], "parse_error", {"mode": mode, "error": item["error"]})
+        for i, key in enumerate(keys):
+            if items[i] is None:
+                items[i] = parsed[key]
+    return items
+
+
+async def stream_passage_async(text: str, mode: str = 'FULL') -> AsyncIterator[Tuple[str, dict]]:
+    """분석 결과를 `("sentence", SentenceItem)` 프레임으로 준비되는 대로 생성하고
+    마지막에 `("meta", meta)` 프레임을 생성합니다.
+
+    지문은 `parse_passage`와 같은 조각(analyzer.passage_chunks)으로 나누어 조각마다
+    문맥 안에서 파싱하고, 조각의 doc.sents 순서대로 문장을 내보냅니다. 결과가 일반
+    분석과 같으므로 완성된 결과는 지문 캐시에 저장됩니다. 조각이 하나인 지문은
+    `analyze_passage_async`를 그대로 사용합니다. (같은 지문의 동시 요청과 파싱 공유)
+    """
+    text = normalize_passage(text)
+    key = make_cache_key(text, mode, analyzer.get_model_id())
+
+    cached = analyzer.analysis_cache.get(key)
+    chunks = analyzer.passage_chunks(text) if cached is None else None
+    if chunks is None or len(chunks) == 1:
+        result = cached if cached is not None else await analyze_passage_async(text, mode)
+        for sentence in result["sentences"]:
+            yield "sentence", sentence
+        yield "meta", result["meta"]
+        return
+
+    # 조각은 최대 STREAM_WINDOW개만 미리 제출 (나머지 요청의 대기열 자리를 남김)
+    pending = deque(chunks)
+    tasks: deque = deque()
+    sentences = []
+    try:
+        while pending or tasks:
+            while pending and len(tasks) < max(1, STREAM_WINDOW):
+                tasks.append(asyncio.ensure_future(
+                    analysis_executor.run(analyzer.parse_chunk, pending.popleft(), mode)
+                ))
+            for item in await tasks.popleft():
+                sentence = {"id": len(sentences), **item}
+                sentences.append(sentence)
+                track_sentence(sentence, mode)
+                yield "sentence", sentence
+    finally:
+        # 오류나 연결 종료 시 진행 중인 조각은 취소
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()
+
+    result = analyzer._build_result(sentences)
+    analyzer.analysis_cache.put(key, result)
+    yield "meta", result["meta"]
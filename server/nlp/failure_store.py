@@ -0,0 +1,290 @@
+"""
+NLP Failure Store - v1.2
+
+분석 실패 문장을 SQLite 파일(로그 파일 옆 `nlp_errors.db`)에 (오류 유형, 문장) 해시 기준으로
+중복 제거하여 발생 횟수와 함께 저장합니다. `ErrorTracker`의 writer 스레드가 로그를 쓸 때
+같은 묶음을 한 트랜잭션으로 기록합니다.
+
+- `nlp_failures`: 문장별 누적 횟수, 품사 태그 패턴, 처음/마지막 발생 시각
+- `nlp_failure_patterns`: 품사 태그 패턴별 누적 (문장 수, 횟수, 예문)
+- `nlp_failure_days`: 문장별 날짜별 횟수 (기간 조회용)
+- `top()`: 오류 유형/기간으로 거른 상위 실패 문장(또는 패턴)을 (횟수 내림차순, id)
+  keyset 커서로 페이지 조회합니다. 기간이 없으면 누적 횟수 인덱스에서 한 페이지만 읽습니다.
+"""
+import json
+import hashlib
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+GROUP_BY = ("sentence", "pattern")
+
+# 한 번에 IN (...)으로 조회할 id 수
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS nlp_failures (
+        id TEXT PRIMARY KEY,
+        error_type TEXT NOT NULL,
+        sentence TEXT NOT NULL,
+        pattern TEXT NOT NULL,
+        pattern_id TEXT NOT NULL,
+        details TEXT NOT NULL,
+        occurrences INTEGER NOT NULL DEFAULT 0,
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_nlp_failures_top ON nlp_failures(occurrences DESC, id)",
+    "CREATE INDEX IF NOT EXISTS idx_nlp_failures_type_top ON nlp_failures(error_type, occurrences DESC, id)",
+    """
+    CREATE TABLE IF NOT EXISTS nlp_failure_patterns (
+        id TEXT PRIMARY KEY,
+        error_type TEXT NOT NULL,
+        pattern TEXT NOT NULL,
+        example TEXT NOT NULL,
+        sentences INTEGER NOT NULL DEFAULT 0,
+        occurrences INTEGER NOT NULL DEFAULT 0,
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_nlp_failure_patterns_top ON nlp_failure_patterns(occurrences DESC, id)",
+    "CREATE INDEX IF NOT EXISTS idx_nlp_failure_patterns_type_top ON nlp_failure_patterns(error_type, occurrences DESC, id)",
+    """
+    CREATE TABLE IF NOT EXISTS nlp_failure_days (
+        day TEXT NOT NULL,
+        error_type TEXT NOT NULL,
+        failure_id TEXT NOT NULL,
+        pattern_id TEXT NOT NULL,
+        occurrences INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, failure_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_nlp_failure_days_type ON nlp_failure_days(error_type, day)",
+]
+
+
+def _hash(error_type: str, text: str) -> str:
+    return hashlib.sha256(f"{error_type}\x00{text}".encode("utf-8")).hexdigest()[:32]
+
+
+class FailureStore:
+    """분석 실패 문장의 중복 제거 저장소."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode = WAL").fetchone()
+                    for statement in _SCHEMA:
+                        conn.execute(statement)
+                    conn.commit()
+                    self._initialized = True
+        return conn
+
+    def record(self, entries: List[dict]) -> None:
+        """ErrorTracker 로그 항목({"timestamp", "sentence", "error_type", "details"})을 반영합니다."""
+        failures: Dict[str, dict] = {}
+        days: Counter = Counter()
+        for entry in entries:
+            error_type = entry["error_type"]
+            sentence = " ".join(entry["sentence"].split())
+            pattern = entry["details"].get("pattern", "")
+            failure_id = _hash(error_type, sentence)
+            item = failures.get(failure_id)
+            if item is None:
+                item = failures[failure_id] = {
+                    "id": failure_id, "error_type": error_type, "sentence": sentence,
+                    "pattern": pattern, "pattern_id": _hash(error_type, pattern), "occurrences": 0,
+                    "first_seen": entry["timestamp"],
+                }
+            item["occurrences"] += 1
+            item["last_seen"] = entry["timestamp"]
+            item["details"] = json.dumps(entry["details"], ensure_ascii=False)
+            days[(entry["timestamp"][:10], failure_id)] += 1
+
+        conn = self._connect()
+        try:
+            # 처음 보는 문장만 패턴의 문장 수에 더함 (같은 문장은 처음 기록된 패턴을 유지)
+            ids = list(failures)
+            existing = {}
+            for i in range(0, len(ids), _LOOKUP_CHUNK):
+                chunk = ids[i:i + _LOOKUP_CHUNK]
+                existing.update(conn.execute(
+                    f"SELECT id, pattern_id FROM nlp_failures WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall())
+            patterns: Dict[str, dict] = {}
+            for item in failures.values():
+                if item["id"] in existing:
+                    item["pattern_id"] = existing[item["id"]]
+                pattern = patterns.get(item["pattern_id"])
+                if pattern is None:
+                    pattern = patterns[item["pattern_id"]] = {
+                        "id": item["pattern_id"], "error_type": item["error_type"], "pattern": item["pattern"],
+                        "example": item["sentence"], "sentences": 0, "occurrences": 0,
+                        "first_seen": item["first_seen"], "last_seen": item["last_seen"],
+                    }
+                pattern["sentences"] += item["id"] not in existing
+                pattern["occurrences"] += item["occurrences"]
+                pattern["first_seen"] = min(pattern["first_seen"], item["first_seen"])
+                pattern["last_seen"] = max(pattern["last_seen"], item["last_seen"])
+
+            conn.executemany("""
+                INSERT INTO nlp_failures
+                (id, error_type, sentence, pattern, pattern_id, details, occurrences, first_seen, last_seen)
+                VALUES (:id, :error_type, :sentence, :pattern, :pattern_id, :details, :occurrences, :first_seen, :last_seen)
+                ON CONFLICT(id) DO UPDATE SET
+                    occurrences = occurrences + excluded.occurrences,
+                    details = excluded.details,
+                    last_seen = excluded.last_seen
+            """, list(failures.values()))
+            conn.executemany("""
+                INSERT INTO nlp_failure_patterns
+                (id, error_type, pattern, example, sentences, occurrences, first_seen, last_seen)
+                VALUES (:id, :error_type, :pattern, :example, :sentences, :occurrences, :first_seen, :last_seen)
+                ON CONFLICT(id) DO UPDATE SET
+                    sentences = sentences + excluded.sentences,
+                    occurrences = occurrences + excluded.occurrences,
+                    last_seen = excluded.last_seen
+            """, list(patterns.values()))
+            conn.executemany("""
+                INSERT INTO nlp_failure_days (day, error_type, failure_id, pattern_id, occurrences)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(day, failure_id) DO UPDATE SET occurrences = occurrences + excluded.occurrences
+            """, [
+                (day, failures[failure_id]["error_type"], failure_id, failures[failure_id]["pattern_id"], count)
+                for (day, failure_id), count in days.items()
+            ])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def top(
+        self,
+        error_type: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        group_by: str = "sentence",
+        limit: int = 50,
+        after: Optional[Tuple[int, str]] = None,
+    ) -> List[dict]:
+        """발생 횟수가 많은 순서로 실패 문장/패턴을 반환합니다.
+
+        Args:
+            error_type: 오류 유형 필터
+            date_from, date_to: 포함 범위의 YYYY-MM-DD 날짜 (지정 시 그 기간의 횟수로 정렬)
+            group_by: "sentence"(문장별) 또는 "pattern"(품사 태그 패턴별)
+            limit: 최대 항목 수
+            after: 이전 페이지 마지막 항목의 (count, id)
+        """
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {GROUP_BY}")
+
+        conn = self._connect()
+        try:
+            if date_from is not None or date_to is not None:
+                # 기간이 기록 전체를 덮으면 누적 횟수와 같음
+                # (MIN/MAX를 따로 조회해야 인덱스 끝만 읽음)
+                first_day = conn.execute("SELECT MIN(day) FROM nlp_failure_days").fetchone()[0]
+                last_day = conn.execute("SELECT MAX(day) FROM nlp_failure_days").fetchone()[0]
+                if (date_from is None or first_day is None or date_from <= first_day) and \
+                        (date_to is None or last_day is None or date_to >= last_day):
+                    date_from = date_to = None
+
+            if date_from is None and date_to is None:
+                rows = self._top_total(conn, group_by, error_type, limit, after)
+            else:
+                rows = self._top_ranged(conn, group_by, error_type, date_from, date_to, limit, after)
+        finally:
+            conn.close()
+
+        items = []
+        for row in rows:
+            item = {key: row[key] for key in row.keys()}
+            if "details" in item:
+                item["details"] = json.loads(item["details"])
+            items.append(item)
+        return items
+
+    def _top_total(self, conn, group_by, error_type, limit, after) -> List[sqlite3.Row]:
+        """누적 횟수 인덱스를 따라 한 페이지만 읽습니다."""
+        table = "nlp_failures" if group_by == "sentence" else "nlp_failure_patterns"
+        columns = (
+            "id, error_type, sentence, pattern, details" if group_by == "sentence"
+            else "id, error_type, pattern, example, sentences"
+        )
+        conditions, params = [], []
+        if error_type is not None:
+            conditions.append("error_type = ?")
+            params.append(error_type)
+        if after is not None:
+            conditions.append("(occurrences < ? OR (occurrences = ? AND id > ?))")
+            params.extend([after[0], after[0], after[1]])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return conn.execute(f"""
+            SELECT {columns}, occurrences AS count, first_seen, last_seen
+            FROM {table} {where}
+            ORDER BY occurrences DESC, id LIMIT ?
+        """, (*params, limit)).fetchall()
+
+    def _top_ranged(self, conn, group_by, error_type, date_from, date_to, limit, after) -> List[sqlite3.Row]:
+        """기간 안의 날짜별 횟수를 합산한 뒤 한 페이지만 원본 행과 연결합니다."""
+        key = "failure_id" if group_by == "sentence" else "pattern_id"
+        conditions, params = [], []
+        if error_type is not None:
+            conditions.append("error_type = ?")
+            params.append(error_type)
+        if date_from is not None:
+            conditions.append("day >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            conditions.append("day <= ?")
+            params.append(date_to)
+        having = ""
+        if after is not None:
+            having = f"HAVING SUM(occurrences) < ? OR (SUM(occurrences) = ? AND {key} > ?)"
+            params.extend([after[0], after[0], after[1]])
+        ranked = f"""
+            FROM nlp_failure_days WHERE {' AND '.join(conditions)}
+            GROUP BY {key} {having}
+            ORDER BY count DESC, {key} LIMIT ?
+        """
+
+        if group_by == "sentence":
+            sql = f"""
+                SELECT f.id, f.error_type, f.sentence, f.pattern, f.details, d.count, f.first_seen, f.last_seen
+                FROM (SELECT failure_id, SUM(occurrences) AS count {ranked}) d
+                JOIN nlp_failures f ON f.id = d.failure_id
+                ORDER BY d.count DESC, f.id
+            """
+        else:
+            sql = f"""
+                SELECT p.id, p.error_type, p.pattern, p.example, d.sentences, d.count, p.first_seen, p.last_seen
+                FROM (
+                    SELECT pattern_id, COUNT(DISTINCT failure_id) AS sentences, SUM(occurrences) AS count {ranked}
+                ) d
+                JOIN nlp_failure_patterns p ON p.id = d.pattern_id
+                ORDER BY d.count DESC, p.id
+            """
+        return conn.execute(sql, (*params, limit)).fetchall()
+
+    def stats(self) -> dict:
+        conn = self._connect()
+        try:
+            sentences, occurrences = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(occurrences), 0) FROM nlp_failures"
+            ).fetchone()
+            patterns = conn.execute("SELECT COUNT(*) FROM nlp_failure_patterns").fetchone()[0]
+        finally:
+            conn.close()
+        return {"sentences": sentences, "patterns": patterns, "occurrences": occurrences}
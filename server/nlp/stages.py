@@ -0,0 +1,75 @@
+"""
+Analyzer Stage Timings - v1.2
+
+분석 호출(지문 1개 또는 배치 1회)마다 단계별 소요 시간과 처리량을 샘플 하나로 모읍니다.
+
+- 단계: spaCy 파싱, find_all_roots, find_subjects_for_roots, 직렬화(토큰/키 dict 생성)
+- 분석 중에는 스레드별 누적만 하고, 호출이 끝날 때 `deque.append` 한 번으로 남깁니다. (잠금 없음)
+- 워커 프로세스의 샘플은 `drain()`으로 꺼내 작업 결과와 함께 부모 프로세스로 보내고
+  `extend()`로 합칩니다. (nlp/executor.py)
+- `/metrics`가 수집할 때 `drain()`하여 히스토그램/카운터에 반영합니다. (monitoring/metrics.py)
+  수집되지 않은 샘플은 최근 `VG_STAGE_SAMPLES`개만 남습니다.
+"""
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Tuple
+
+MAX_SAMPLES = int(os.environ.get("VG_STAGE_SAMPLES", "20000"))
+
+# 샘플 = (단계별 초 ..., 문장 수, 토큰 수)
+STAGES = ("spacy_parse", "find_all_roots", "find_subjects_for_roots", "serialize")
+PARSE, ROOTS, SUBJECTS, SERIALIZE, SENTENCES, TOKENS = range(6)
+
+Sample = Tuple[float, float, float, float, int, int]
+
+_samples: deque = deque(maxlen=MAX_SAMPLES)
+_local = threading.local()
+
+
+@contextmanager
+def analysis_call() -> Iterator[None]:
+    """분석 호출 하나를 감쌉니다. 중첩된 호출은 바깥 호출의 샘플에 합쳐집니다."""
+    if getattr(_local, "state", None) is not None:
+        yield
+        return
+    state = _local.state = [0.0, 0.0, 0.0, 0.0, 0, 0]
+    try:
+        yield
+    finally:
+        _local.state = None
+        # 캐시에서만 응답한 호출은 빈 샘플이므로 남기지 않음
+        if state[SENTENCES] or state[PARSE]:
+            _samples.append(tuple(state))
+
+
+def record_parse(seconds: float) -> None:
+    state = getattr(_local, "state", None)
+    if state is not None:
+        state[PARSE] += seconds
+
+
+def record_sentence(roots: float, subjects: float, serialize: float, tokens: int) -> None:
+    state = getattr(_local, "state", None)
+    if state is not None:
+        state[ROOTS] += roots
+        state[SUBJECTS] += subjects
+        state[SERIALIZE] += serialize
+        state[SENTENCES] += 1
+        state[TOKENS] += tokens
+
+
+def drain() -> List[Sample]:
+    """쌓인 샘플을 모두 꺼냅니다. (분석 스레드와 동시에 호출해도 안전)"""
+    out = []
+    while True:
+        try:
+            out.append(_samples.popleft())
+        except IndexError:
+            return out
+
+
+def extend(samples: Iterable[Sample]) -> None:
+    """다른 프로세스에서 꺼낸 샘플을 합칩니다."""
+    _samples.extend(samples)
@@ -0,0 +1,37 @@
+"""
+공용 pytest fixture
+
+- `app_env`: 임시 DB/분석 오류 로그 경로, 요청 제한 해제, 워커 프로세스 없는 분석기로 설정한 `main` 모듈
+- `client`: `app_env`로 시작한 TestClient (startup/shutdown 훅 포함)
+
+테스트 모듈은 같은 이름의 fixture로 감싸 설정을 더합니다.
+(`app_env`: 앱 시작 전에 바꿀 것, `client`: 시작 후 넣을 데이터)
+"""
+import pytest
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+
+@pytest.fixture
+def app_env(tmp_path, monkeypatch):
+    import main
+    from db import database
+    from nlp import error_tracker
+
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "test.db"))
+    # 가짜/blank 분석 결과의 실패 문장이 저장소의 data/ 폴더에 기록되지 않도록
+    monkeypatch.setattr(error_tracker, "LOG_PATH", str(tmp_path / "nlp_errors.log"))
+    monkeypatch.setattr(main.limiter, "enabled", False)
+    monkeypatch.setattr(main.analysis_executor, "workers", 0)
+    return main
+
+
+@pytest.fixture
+def client(app_env):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app_env.app) as c:
+        yield c
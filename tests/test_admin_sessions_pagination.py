@@ -0,0 +1,90 @@
+"""
+v1.2 관리자 세션 목록 페이지네이션 테스트
+
+GET /api/manage/sessions 의 keyset 커서(created_at, id), 학생/모드/날짜 필터,
+SQL 미리보기(substr)를 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from db import database
+
+
+@pytest.fixture
+def client(client):
+    with database.get_db() as conn:
+        # 같은 시각에 만들어진 세션(s03, s04)도 id로 순서가 정해짐
+        rows = [
+            ("s01", "2026-03-01 09:00:00", "FULL"),
+            ("s02", "2026-03-02 09:00:00", "CORE"),
+            ("s03", "2026-03-03 09:00:00", "FULL"),
+            ("s04", "2026-03-03 09:00:00", "CORE"),
+            ("s05", "2026-03-05 09:00:00", "FULL"),
+        ]
+        conn.executemany(
+            "INSERT INTO sessions (id, created_at, passage_text, total_sentences, mode) VALUES (?, ?, ?, 1, ?)",
+            [(sid, created_at, f"{sid} " + "x" * 100, mode) for sid, created_at, mode in rows]
+        )
+        conn.commit()
+    return client
+
+
+def session_ids(res):
+    return [s["id"] for s in res.json()["sessions"]]
+
+
+class TestAdminSessionsPagination:
+    """관리자 세션 목록 API 테스트"""
+
+    def test_keyset_pages(self, client):
+        first = client.get("/api/manage/sessions?limit=2")
+        assert session_ids(first) == ["s05", "s04"]
+        assert first.json()["students"] == []
+
+        cursor = first.json()["nextCursor"]
+        second = client.get("/api/manage/sessions", params={"limit": 2, "cursor": cursor})
+        assert session_ids(second) == ["s03", "s02"]
+        assert second.json()["students"] is None  # 첫 페이지에서만 반환
+
+        third = client.get("/api/manage/sessions", params={"limit": 2, "cursor": second.json()["nextCursor"]})
+        assert session_ids(third) == ["s01"]
+        assert third.json()["nextCursor"] is None
+
+    def test_preview_is_truncated(self, client):
+        session = client.get("/api/manage/sessions").json()["sessions"][0]
+        assert session["passage_text"] == ("s05 " + "x" * 46) + "..."
+
+    def test_filters(self, client):
+        assert session_ids(client.get("/api/manage/sessions?mode=CORE")) == ["s04", "s02"]
+        assert session_ids(client.get("/api/manage/sessions?date_from=2026-03-02&date_to=2026-03-03")) == ["s04", "s03", "s02"]
+
+        client.put("/api/manage/sessions/s03/assign-student", json={"student_name": "Kim"})
+        student_id = client.get("/api/manage/sessions").json()["students"][0]["studentId"]
+        assert session_ids(client.get(f"/api/manage/sessions?student_id={student_id}")) == ["s03"]
+
+    def test_invalid_parameters(self, client):
+        assert client.get("/api/manage/sessions?cursor=not-a-cursor").status_code == 400
+        assert client.get("/api/manage/sessions?limit=0").status_code == 400
+        assert client.get("/api/manage/sessions?mode=EASY").status_code == 400
+        assert client.get("/api/manage/sessions?date_from=March").status_code == 400
+
+    def test_keyset_query_uses_index(self, client):
+        with database.get_db() as conn:
+            plan = " ".join(row["detail"] for row in conn.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT sess.id FROM sessions sess
+                WHERE (sess.created_at, sess.id) < ('2026-03-03 09:00:00', 's04')
+                ORDER BY sess.created_at DESC, sess.id DESC LIMIT 3
+            """))
+
+        assert "idx_sessions_created_at_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
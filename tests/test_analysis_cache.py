@@ -0,0 +1,75 @@
+"""
+v1.2 분석 결과 캐시 테스트
+
+AnalysisCache의 LRU/바이트 제한, SQLite 2차 캐시, 키 정규화를 검증합니다.
+"""
+import pytest
+import sys
+import os
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.nlp.cache import AnalysisCache, make_cache_key, normalize_passage
+
+
+def _result(n: int) -> dict:
+    return {"sentences": [{"id": i, "text": "x" * 10} for i in range(n)], "meta": {"totalSentences": n}}
+
+
+class TestAnalysisCache:
+    """분석 캐시 테스트"""
+
+    def test_hit_and_miss_counters(self):
+        cache = AnalysisCache(l2_path="")
+        assert cache.get("a") is None
+        cache.put("a", _result(1))
+        assert cache.get("a") == _result(1)
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["bytes"] > 0
+
+    def test_lru_eviction_by_entries(self):
+        cache = AnalysisCache(max_entries=2, l2_path="")
+        cache.put("a", _result(1))
+        cache.put("b", _result(1))
+        cache.get("a")  # a를 최근 사용으로 갱신
+        cache.put("c", _result(1))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_by_bytes(self):
+        cache = AnalysisCache(max_bytes=300, l2_path="")
+        for key in ["a", "b", "c", "d"]:
+            cache.put(key, _result(2))
+
+        stats = cache.stats()
+        assert stats["bytes"] <= 300
+        assert stats["evictions"] > 0
+        assert cache.get("d") is not None
+
+    def test_sqlite_tier_survives_memory_eviction(self, tmp_path):
+        cache = AnalysisCache(max_entries=1, l2_path=str(tmp_path / "cache.db"))
+        cache.put("a", _result(1))
+        cache.put("b", _result(1))  # a는 메모리에서 밀려남
+
+        assert cache.get("a") == _result(1)
+        assert cache.stats()["l2Hits"] == 1
+
+    def test_key_depends_on_mode_and_model(self):
+        text = normalize_passage("The cat sleeps.")
+        assert make_cache_key(text, "FULL", "en_core_web_sm@3.8.0") != make_cache_key(text, "CORE", "en_core_web_sm@3.8.0")
+        assert make_cache_key(text, "FULL", "en_core_web_sm@3.8.0") != make_cache_key(text, "FULL", "en_core_web_sm@3.7.1")
+
+    def test_normalize_passage(self):
+        assert normalize_passage("  The cat sleeps.\r\nIt is warm.  ") == "The cat sleeps.\nIt is warm."
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
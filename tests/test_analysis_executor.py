@@ -0,0 +1,137 @@
+"""
+v1.2 분석 실행기(AnalysisExecutor) 테스트
+
+대기열 제한(backpressure), 동일 지문 동시 요청 병합, 503 + Retry-After 응답을
+검증합니다. 프로세스 풀 대신 스레드 모드(workers=0)로 실행합니다.
+"""
+import pytest
+import asyncio
+import time
+import sys
+import os
+
+# 프로젝트 루트와 server/ 를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+from fastapi.testclient import TestClient
+from server.nlp import analyzer, executor
+from server.nlp.cache import AnalysisCache
+from server.nlp.executor import AnalysisExecutor, AnalysisQueueFull
+
+
+def slow_task(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+class TestAnalysisExecutor:
+    """분석 실행기 테스트"""
+
+    def test_queue_full_raises(self):
+        pool = AnalysisExecutor(workers=0, max_pending=2)
+
+        async def scenario():
+            first = asyncio.ensure_future(pool.run(slow_task, 0.2))
+            second = asyncio.ensure_future(pool.run(slow_task, 0.2))
+            await asyncio.sleep(0.05)
+            with pytest.raises(AnalysisQueueFull):
+                await pool.run(slow_task, 0)
+            assert await first == 0.2
+            assert await second == 0.2
+            # 작업이 끝나면 다시 받을 수 있음
+            assert await pool.run(slow_task, 0) == 0
+
+        asyncio.run(scenario())
+        assert pool.stats()["pending"] == 0
+
+    def test_concurrent_requests_share_one_parse(self, monkeypatch):
+        calls = []
+
+        def fake_parse(text, mode="FULL"):
+            calls.append(text)
+            time.sleep(0.1)
+            return {"sentences": [], "meta": {"totalSentences": 0, "nlp_model": "test"}}
+
+        monkeypatch.setattr(analyzer, "parse_passage", fake_parse)
+        monkeypatch.setattr(analyzer, "model_id", "test@1")
+        monkeypatch.setattr(analyzer, "analysis_cache", AnalysisCache(l2_path=""))
+        monkeypatch.setattr(executor, "analysis_executor", AnalysisExecutor(workers=0, max_pending=8))
+
+        async def scenario():
+            return await asyncio.gather(*[executor.analyze_passage_async("Same text.") for _ in range(5)])
+
+        results = asyncio.run(scenario())
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+
+    def test_cancelled_first_request_does_not_fail_the_others(self, monkeypatch):
+        calls = []
+
+        def fake_parse(text, mode="FULL"):
+            calls.append(text)
+            time.sleep(0.1)
+            return {"sentences": [], "meta": {"totalSentences": 0, "nlp_model": "test"}}
+
+        monkeypatch.setattr(analyzer, "parse_passage", fake_parse)
+        monkeypatch.setattr(analyzer, "model_id", "test@1")
+        monkeypatch.setattr(analyzer, "analysis_cache", AnalysisCache(l2_path=""))
+        monkeypatch.setattr(executor, "analysis_executor", AnalysisExecutor(workers=0, max_pending=8))
+
+        async def scenario():
+            first = asyncio.ensure_future(executor.analyze_passage_async("Same text."))
+            await asyncio.sleep(0.02)
+            waiter = asyncio.ensure_future(executor.analyze_passage_async("Same text."))
+            await asyncio.sleep(0.02)
+            first.cancel()  # 먼저 온 요청의 연결 종료
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await waiter
+
+        result = asyncio.run(scenario())
+        assert result["meta"]["nlp_model"] == "test"
+        assert len(calls) == 1
+        # 취소와 무관하게 결과는 캐시에 저장됨
+        key = executor.make_cache_key("Same text.", "FULL", "test@1")
+        assert analyzer.analysis_cache.get(key) is result
+        assert executor._inflight == {}
+
+    def test_endpoint_returns_503_when_busy(self, app_env, client, monkeypatch):
+        monkeypatch.setattr(app_env.analysis_executor, "max_pending", 0)
+
+        res = client.post("/api/analyze-passage", json={"passage": "An uncached passage for the busy test."})
+
+        assert res.status_code == 503
+        assert res.headers["Retry-After"] == str(executor.RETRY_AFTER_SECONDS)
+
+    def test_readiness_probe(self, monkeypatch):
+        import main
+
+        monkeypatch.setattr(main.analysis_executor, "state", "loading")
+        monkeypatch.setattr(main.analysis_executor, "error", None)
+        client = TestClient(main.app)  # startup 훅 없이 상태만 확인
+
+        res = client.get("/api/health/ready")
+        assert res.status_code == 503
+        assert res.json()["status"] == "loading"
+
+        monkeypatch.setattr(main.analysis_executor, "state", "ready")
+        res = client.get("/api/health/ready")
+        assert res.status_code == 200
+        assert res.json()["status"] == "ready"
+
+    def test_warm_up_failure_is_reported(self, monkeypatch):
+        def broken_warm_up():
+            raise RuntimeError("spaCy model 'en_core_web_sm' is not installed.")
+
+        monkeypatch.setattr(analyzer, "warm_up", broken_warm_up)
+        pool = AnalysisExecutor(workers=0)
+        pool.warm_up()
+
+        assert pool.state == "failed"
+        assert "not installed" in pool.error
+        assert not pool.is_ready
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
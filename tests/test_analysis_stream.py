@@ -0,0 +1,137 @@
+"""
+v1.2 스트리밍 분석 API 테스트
+
+/api/analyze-passage/stream 이 문장별 프레임을 순서대로 보내고 마지막에
+meta 프레임을 보내는지, 긴 지문이 파싱 조각 단위로 문맥 안에서 파싱되는지 검증합니다.
+모델 다운로드 없이 실행되도록 빈 영어 파이프라인(sentencizer)을 사용합니다.
+"""
+import pytest
+import json
+import sys
+import os
+
+import spacy
+from spacy.language import Language
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from nlp import analyzer
+from nlp.cache import AnalysisCache, make_cache_key
+
+parsed_texts = []
+
+
+@Language.component("record_streamed_text")
+def record_streamed_text(doc):
+    parsed_texts.append(doc.text)
+    return doc
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    parsed_texts.clear()
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("record_streamed_text")
+    monkeypatch.setattr(analyzer, "nlp_model", nlp)
+    monkeypatch.setattr(analyzer, "model_id", "blank_en@test")
+    monkeypatch.setattr(analyzer, "analysis_cache", AnalysisCache(l2_path=""))
+    # 워밍업 파싱이 테스트 기록과 섞이지 않도록 시작 시 동기 실행
+    monkeypatch.setattr(main.analysis_executor, "warm_up_in_background", main.analysis_executor.warm_up)
+    return app_env
+
+
+@pytest.fixture
+def client(client):
+    parsed_texts.clear()
+    return client
+
+
+def read_ndjson(res):
+    return [json.loads(line) for line in res.text.splitlines() if line]
+
+
+class TestAnalysisStream:
+    """스트리밍 분석 API 테스트"""
+
+    def test_ndjson_frames(self, client):
+        passage = "The cat sleeps. The dog barks. A bird sings!"
+        res = client.post("/api/analyze-passage/stream", json={"passage": passage})
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("application/x-ndjson")
+
+        frames = read_ndjson(res)
+        assert [f["type"] for f in frames] == ["sentence", "sentence", "sentence", "meta"]
+        assert [f["data"]["id"] for f in frames[:3]] == [0, 1, 2]
+        assert frames[-1]["data"]["totalSentences"] == 3
+
+        # 조각 한도 안의 지문은 문장을 따로 파싱하지 않고 지문 전체를 한 번에 파싱
+        assert parsed_texts == [passage]
+
+    def test_long_passage_streams_chunks_in_context(self, client, monkeypatch):
+        monkeypatch.setattr(analyzer, "CHUNK_CHARS", 100)
+        pending = []
+        parse_chunk = analyzer.parse_chunk
+        monkeypatch.setattr(analyzer, "parse_chunk",
+                            lambda chunk, mode: pending.append(main.analysis_executor._pending) or parse_chunk(chunk, mode))
+        monkeypatch.setattr(main.analysis_executor, "max_pending", 3)
+
+        # 조각 수가 대기열 크기보다 많아도 한 번에 STREAM_WINDOW개만 제출
+        passage = " ".join(f"Sentence number {i} ends here." for i in range(41))
+        frames = read_ndjson(client.post("/api/analyze-passage/stream", json={"passage": passage}))
+
+        chunks = analyzer.split_into_chunks(passage)
+        assert len(chunks) > 3
+        assert parsed_texts == chunks
+        assert len(pending) == len(chunks)
+        assert max(pending) <= 2
+
+        # 일반 분석(parse_passage)과 같은 조각을 파싱하므로 결과도 같음
+        assert [f["type"] for f in frames].count("sentence") == 41
+        regular = analyzer.parse_passage(passage)
+        assert [f["data"] for f in frames if f["type"] == "sentence"] == regular["sentences"]
+        key = make_cache_key(passage, "FULL", analyzer.get_model_id())
+        assert analyzer.analysis_cache.get(key) == regular
+
+    def test_stream_matches_regular_response(self, client):
+        passage = "The cat sleeps. The dog barks."
+        frames = read_ndjson(client.post("/api/analyze-passage/stream", json={"passage": passage}))
+        regular = client.post("/api/analyze-passage", json={"passage": passage}).json()
+
+        assert [f["data"] for f in frames if f["type"] == "sentence"] == regular["sentences"]
+        assert frames[-1]["data"] == regular["meta"]
+
+    def test_completed_stream_is_cached(self, client):
+        passage = "The cat sleeps. The dog barks."
+        client.post("/api/analyze-passage/stream", json={"passage": passage})
+
+        key = make_cache_key(passage, "FULL", analyzer.get_model_id())
+        assert analyzer.analysis_cache.get(key)["meta"]["totalSentences"] == 2
+
+        parsed_texts.clear()
+        frames = read_ndjson(client.post("/api/analyze-passage/stream", json={"passage": passage}))
+        assert len(frames) == 3
+        assert parsed_texts == []
+
+    def test_sse_format(self, client):
+        res = client.post("/api/analyze-passage/stream?format=sse", json={"passage": "The cat sleeps."})
+        assert res.headers["content-type"].startswith("text/event-stream")
+
+        events = [block.split("\n") for block in res.text.strip().split("\n\n")]
+        assert [e[0] for e in events] == ["event: sentence", "event: meta"]
+        assert json.loads(events[0][1][len("data: "):])["text"] == "The cat sleeps."
+
+    def test_invalid_format_and_busy(self, client, monkeypatch):
+        res = client.post("/api/analyze-passage/stream?format=xml", json={"passage": "Run."})
+        assert res.status_code == 400
+
+        monkeypatch.setattr(main.analysis_executor, "max_pending", 0)
+        res = client.post("/api/analyze-passage/stream", json={"passage": "An uncached passage."})
+        assert res.status_code == 503
+        assert "Retry-After" in res.headers
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,93 @@
+"""
+v1.2 배치 분석(analyze_passages) 테스트
+
+nlp.pipe 기반 배치 분석이 입력 순서를 유지하고, 한 지문의 실패가
+배치 전체를 실패시키지 않는지 검증합니다.
+모델 다운로드 없이 실행되도록 빈 영어 파이프라인(sentencizer)을 사용합니다.
+"""
+import pytest
+import asyncio
+import sys
+import os
+
+import spacy
+from spacy.language import Language
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.nlp import analyzer, error_tracker, executor
+from server.nlp.cache import AnalysisCache
+
+
+@Language.component("fail_on_boom")
+def fail_on_boom(doc):
+    if "BOOM" in doc.text:
+        raise ValueError("parser exploded")
+    return doc
+
+
+@pytest.fixture
+def blank_model(monkeypatch):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("fail_on_boom")
+    monkeypatch.setattr(analyzer, "nlp_model", nlp)
+    monkeypatch.setattr(analyzer, "model_id", "blank_en@test")
+    monkeypatch.setattr(analyzer, "analysis_cache", AnalysisCache(l2_path=""))
+    return nlp
+
+
+class TestBatchAnalysis:
+    """배치 분석 테스트"""
+
+    def test_results_keep_input_order(self, blank_model):
+        texts = ["One cat sleeps.", "Two dogs run. They bark.", "Birds fly."]
+        items = analyzer.analyze_passages(texts)
+
+        assert [item["error"] for item in items] == [None, None, None]
+        assert [item["result"]["meta"]["totalSentences"] for item in items] == [1, 2, 1]
+        assert items[1]["result"]["sentences"][1]["text"] == "They bark."
+
+    def test_failure_is_reported_per_item(self, blank_model):
+        items = analyzer.analyze_passages(["Fine text.", "BOOM goes here.", "Also fine."])
+
+        assert items[0]["result"] is not None
+        assert items[1]["result"] is None
+        assert "parser exploded" in items[1]["error"]
+        assert items[2]["result"] is not None
+
+    def test_duplicates_and_cache(self, blank_model):
+        items = analyzer.analyze_passages(["Same text.", "Same text. "])
+        assert items[0]["result"] is items[1]["result"]
+
+        stats = analyzer.analysis_cache.stats()
+        assert stats["entries"] == 1
+
+        single = analyzer.analyze_passage("Same text.")
+        assert single is items[0]["result"]
+
+    def test_async_batch_parses_misses_in_one_worker_job(self, blank_model, tmp_path, monkeypatch):
+        monkeypatch.setattr(executor, "analysis_executor", executor.AnalysisExecutor(workers=0))
+        # 새로 파싱한 지문의 실패가 기록되므로 임시 폴더에 기록
+        monkeypatch.setattr(error_tracker, "LOG_PATH", str(tmp_path / "nlp_errors.log"))
+        jobs = []
+        parse_passages = analyzer.parse_passages
+        monkeypatch.setattr(analyzer, "parse_passages", lambda texts, mode: jobs.append(texts) or parse_passages(texts, mode))
+        cached = analyzer.analyze_passage("Cached text.")
+
+        items = asyncio.run(executor.analyze_passages_async(
+            ["Cached text.", "New text.", "BOOM goes here.", "New text. "]
+        ))
+
+        assert jobs == [["New text.", "BOOM goes here."]]
+        assert items[0]["result"] is cached
+        assert items[1]["result"] is items[3]["result"]
+        assert "parser exploded" in items[2]["error"]
+        assert analyzer.analysis_cache.stats()["entries"] == 2
+        # writer 스레드가 경로를 되돌린 뒤에 기록하지 않도록 지금 기록
+        error_tracker.error_tracker.flush()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+v1.2 긴 지문 조각 분석 테스트
+
+긴 지문이 문단/문장 경계에서 한도 이하 조각으로 나뉘고, 조각별 분석 결과가
+전역으로 이어지는 문장 id로 합쳐지는지 검증합니다.
+모델 다운로드 없이 실행되도록 빈 영어 파이프라인(sentencizer)을 사용합니다.
+"""
+import pytest
+import sys
+import os
+
+import spacy
+
+# 프로젝트 루트와 server/ 를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+from server.nlp import analyzer
+
+PARAGRAPH = "The cat sleeps on the mat. The dog barks at the door. A bird sings in the tree."
+
+
+@pytest.fixture
+def blank_model(monkeypatch):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    monkeypatch.setattr(analyzer, "nlp_model", nlp)
+    monkeypatch.setattr(analyzer, "model_id", "blank_en@test")
+    monkeypatch.setattr(analyzer, "SENTENCE_CACHE_ENABLED", False)
+    monkeypatch.setattr(analyzer, "CHUNK_CHARS", 100)
+    return nlp
+
+
+class TestSplitIntoChunks:
+    """조각 나누기 테스트"""
+
+    def test_short_text_is_one_chunk(self):
+        assert analyzer.split_into_chunks(PARAGRAPH, max_chars=200) == [PARAGRAPH]
+
+    def test_paragraphs_are_packed_within_limit(self):
+        text = "\n\n".join([PARAGRAPH] * 3)
+        chunks = analyzer.split_into_chunks(text, max_chars=2 * len(PARAGRAPH) + 2)
+
+        assert chunks == ["\n\n".join([PARAGRAPH] * 2), PARAGRAPH]
+
+    def test_long_paragraph_splits_on_sentences(self):
+        chunks = analyzer.split_into_chunks(PARAGRAPH, max_chars=60)
+
+        assert chunks == ["The cat sleeps on the mat. The dog barks at the door.", "A bird sings in the tree."]
+
+    def test_long_sentence_splits_on_whitespace(self):
+        sentence = " ".join(["word"] * 50) + "."
+        chunks = analyzer.split_into_chunks(sentence, max_chars=32)
+
+        assert all(len(chunk) <= 32 for chunk in chunks)
+        assert " ".join(chunks) == sentence
+
+
+class TestChunkedAnalysis:
+    """조각 분석 결과 합치기 테스트"""
+
+    def test_sentence_ids_are_global(self, blank_model):
+        text = "\n\n".join([PARAGRAPH] * 4)
+        result = analyzer.parse_passage(text)
+
+        assert [s["id"] for s in result["sentences"]] == list(range(12))
+        assert result["meta"]["totalSentences"] == 12
+
+    def test_matches_whole_parse(self, blank_model):
+        text = "\n\n".join([PARAGRAPH] * 4)
+        chunked = analyzer.parse_passage(text)
+        whole = analyzer._analyze_doc(blank_model(text), "FULL")
+
+        assert [s["text"] for s in chunked["sentences"]] == [s["text"].strip() for s in whole["sentences"] if s["text"].strip()]
+        assert [s["tokens"] for s in chunked["sentences"]][0] == whole["sentences"][0]["tokens"]
+
+    def test_hard_cap(self, app_env, client, monkeypatch):
+        monkeypatch.setattr(app_env, "MAX_PASSAGE_CHARS", 50)
+
+        res = client.post("/api/analyze-passage", json={"passage": PARAGRAPH})
+
+        assert res.status_code == 400
+        assert "max 50 chars" in res.json()["detail"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,143 @@
+"""
+v1.2 compact 분석 응답 형식 테스트
+
+라벨 테이블/병렬 배열로 변환한 결과가 원래 AnalysisResponse로 그대로
+복원되는지, ?format=compact 응답이 올바른지 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import json
+import shutil
+import subprocess
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from models import AnalysisResponse
+from nlp.compact import encode_compact, decode_compact, COMPACT_FORMAT
+
+
+def make_token(i, text, start, pos, tag, dep):
+    return {"id": i, "text": text, "start": start, "end": start + len(text), "pos": pos, "tag": tag, "dep": dep}
+
+
+RESULT = {
+    "sentences": [
+        {
+            "id": 0,
+            "text": "The cat sleeps.",
+            "tokens": [
+                make_token(0, "The", 0, "DET", "DT", "det"),
+                make_token(1, "cat", 4, "NOUN", "NN", "nsubj"),
+                make_token(2, "sleeps", 8, "VERB", "VBZ", "ROOT"),
+                make_token(3, ".", 14, "PUNCT", ".", "punct"),
+            ],
+            "key": {"roots": [2], "subjects": [1], "subjectSpans": [[0, 1]]}
+        },
+        {
+            "id": 1,
+            "text": "The dog barks.",
+            "tokens": [
+                make_token(0, "The", 0, "DET", "DT", "det"),
+                make_token(1, "dog", 4, "NOUN", "NN", "nsubj"),
+                make_token(2, "barks", 8, "VERB", "VBZ", "ROOT"),
+                make_token(3, ".", 13, "PUNCT", ".", "punct"),
+            ],
+            "key": {"roots": [2], "subjects": [1], "subjectSpans": [[0, 1]]}
+        },
+    ],
+    "meta": {"totalSentences": 2, "nlp_model": "en_core_web_sm"}
+}
+
+
+# BMP 밖 문자(이모지)는 JS 문자열에서 UTF-16 두 단위이므로 뒤 토큰 오프셋이 어긋나기 쉬움
+ASTRAL_RESULT = {
+    "sentences": [
+        {
+            "id": 0,
+            "text": "I love 🍕 and 𝒳 pizza.",
+            "tokens": [
+                make_token(0, "I", 0, "PRON", "PRP", "nsubj"),
+                make_token(1, "love", 2, "VERB", "VBP", "ROOT"),
+                make_token(2, "🍕", 7, "NOUN", "NN", "dobj"),
+                make_token(3, "and", 9, "CCONJ", "CC", "cc"),
+                make_token(4, "𝒳", 13, "NOUN", "NN", "compound"),
+                make_token(5, "pizza", 15, "NOUN", "NN", "conj"),
+                make_token(6, ".", 20, "PUNCT", ".", "punct"),
+            ],
+            "key": {"roots": [1], "subjects": [0], "subjectSpans": [[0, 0]]}
+        },
+    ],
+    "meta": {"totalSentences": 1, "nlp_model": "en_core_web_sm"}
+}
+
+CLIENT_API = os.path.join(os.path.dirname(__file__), "..", "client", "src", "services", "api.js")
+
+
+async def fake_analyze_async(text, mode="FULL"):
+    return RESULT
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    monkeypatch.setattr(main, "analyze_passage_async", fake_analyze_async)
+    return app_env
+
+
+class TestCompactEncoding:
+    """compact 형식 변환 테스트"""
+
+    def test_round_trip(self):
+        assert decode_compact(encode_compact(RESULT)) == RESULT
+
+    def test_round_trip_non_bmp(self):
+        sentence = ASTRAL_RESULT["sentences"][0]
+        assert all(sentence["text"][t["start"]:t["end"]] == t["text"] for t in sentence["tokens"])
+        assert decode_compact(encode_compact(ASTRAL_RESULT)) == ASTRAL_RESULT
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+    def test_client_decoder_round_trip_non_bmp(self):
+        # 클라이언트(client/src/services/api.js)의 decodeCompactAnalysis로 복원
+        script = (
+            f"import {{ decodeCompactAnalysis }} from {json.dumps(os.path.abspath(CLIENT_API))};\n"
+            "let input = '';\n"
+            "process.stdin.on('data', (chunk) => { input += chunk; });\n"
+            "process.stdin.on('end', () => process.stdout.write(JSON.stringify(decodeCompactAnalysis(JSON.parse(input)))));\n"
+        )
+        out = subprocess.run(
+            ["node", "--input-type=module", "-e", script],
+            input=json.dumps(encode_compact(ASTRAL_RESULT)), capture_output=True, text=True, encoding="utf-8",
+            check=True, timeout=30,
+        )
+        assert json.loads(out.stdout) == ASTRAL_RESULT
+
+    def test_labels_are_interned(self):
+        compact = encode_compact(RESULT)
+
+        assert compact["format"] == COMPACT_FORMAT
+        assert compact["labels"]["pos"] == ["DET", "NOUN", "VERB", "PUNCT"]
+        # 두 문장이 같은 라벨 코드를 공유
+        assert compact["sentences"][0]["tokens"]["pos"] == compact["sentences"][1]["tokens"]["pos"] == [0, 1, 2, 3]
+        assert "text" not in compact["sentences"][0]["tokens"]
+
+    def test_analyze_endpoint_compact(self, client):
+        res = client.post("/api/analyze-passage?format=compact", json={"passage": "The cat sleeps. The dog barks."})
+        assert res.status_code == 200
+        assert AnalysisResponse(**decode_compact(res.json())).model_dump() == RESULT
+
+        # 기본 형식은 그대로
+        assert client.post("/api/analyze-passage", json={"passage": "x"}).json() == RESULT
+        assert client.post("/api/analyze-passage?format=xml", json={"passage": "x"}).status_code == 400
+
+    def test_stored_passage_analysis_compact(self, client):
+        passage_id = client.post("/api/passages", json={"title": "T", "content": "The cat sleeps."}).json()["id"]
+        res = client.get(f"/api/passages/{passage_id}/analysis?mode=FULL&format=compact")
+
+        assert res.status_code == 200
+        assert decode_compact(res.json()) == RESULT
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+"""
+v1.2 조건부 GET(ETag / If-None-Match) 테스트
+
+세션 조회와 지문 목록이 revision 기반 ETag를 돌려주고, 변경이 없으면
+304를 돌려주며, 진행 상황/지문이 바뀌면 ETag가 바뀌는지 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from db import database
+from db.write_behind import ProgressWriter
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    monkeypatch.setattr(main, "progress_writer", ProgressWriter(flush_interval_ms=60_000))
+    monkeypatch.setattr(main, "precompute_passage_analyses", lambda passage_id, content: None)
+    return app_env
+
+
+def answer(client, session_id, index, correct=True):
+    return client.put(f"/api/sessions/{session_id}/progress", json={
+        "sentence_index": index, "root_answer": 0, "root_correct": correct,
+        "subject_answer": None, "subject_correct": correct
+    })
+
+
+class TestSessionEtag:
+    """세션 조회 ETag 테스트"""
+
+    def test_not_modified(self, client):
+        session_id = client.post("/api/sessions", json={"passage_text": "Run.", "total_sentences": 1}).json()["id"]
+        first = client.get(f"/api/sessions/{session_id}")
+        etag = first.headers["ETag"]
+
+        res = client.get(f"/api/sessions/{session_id}", headers={"If-None-Match": etag})
+        assert res.status_code == 304
+        assert res.headers["ETag"] == etag
+        assert res.content == b""
+
+    def test_pending_and_committed_progress_change_etag(self, client):
+        session_id = client.post("/api/sessions", json={"passage_text": "Run.", "total_sentences": 2}).json()["id"]
+        etag = client.get(f"/api/sessions/{session_id}").headers["ETag"]
+
+        # 아직 커밋되지 않은 쓰기도 반영
+        answer(client, session_id, 0)
+        pending = client.get(f"/api/sessions/{session_id}", headers={"If-None-Match": etag})
+        assert pending.status_code == 200
+        assert len(pending.json()["progress"]) == 1
+
+        # 커밋 후에는 revision이 바뀜
+        main.progress_writer.flush()
+        committed = client.get(f"/api/sessions/{session_id}", headers={"If-None-Match": pending.headers["ETag"]})
+        assert committed.status_code == 200
+        assert committed.headers["ETag"] not in (etag, pending.headers["ETag"])
+        assert client.get(
+            f"/api/sessions/{session_id}", headers={"If-None-Match": committed.headers["ETag"]}
+        ).status_code == 304
+
+        # 같은 문장 재제출도 revision 증가
+        answer(client, session_id, 0, correct=False)
+        main.progress_writer.flush()
+        assert client.get(
+            f"/api/sessions/{session_id}", headers={"If-None-Match": committed.headers["ETag"]}
+        ).status_code == 200
+
+    def test_missing_session_is_404(self, client):
+        assert client.get("/api/sessions/missing", headers={"If-None-Match": '"0"'}).status_code == 404
+
+
+class TestPassagesEtag:
+    """지문 목록 ETag 테스트"""
+
+    def test_create_update_delete_change_etag(self, client):
+        etag = client.get("/api/passages").headers["ETag"]
+        assert client.get("/api/passages", headers={"If-None-Match": etag}).status_code == 304
+
+        passage_id = client.post("/api/passages", json={"title": "T", "content": "Run."}).json()["id"]
+        res = client.get("/api/passages", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+        assert len(res.json()["passages"]) == 1
+
+        etag = res.headers["ETag"]
+        with database.get_db() as conn:
+            conn.execute("UPDATE passages SET title = 'T2' WHERE id = ?", (passage_id,))
+            conn.commit()
+        res = client.get("/api/passages", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+
+        client.delete(f"/api/passages/{passage_id}")
+        assert client.get("/api/passages", headers={"If-None-Match": res.headers["ETag"]}).status_code == 200
+
+    def test_if_none_match_list_and_weak_comparison(self, client):
+        etag = client.get("/api/passages").headers["ETag"]
+        strong = etag.removeprefix("W/")
+
+        assert client.get("/api/passages", headers={"If-None-Match": f'"other", {strong}'}).status_code == 304
+        assert client.get("/api/passages", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""
+v1.2 DB lane(읽기/쓰기 전용 스레드 풀) 테스트
+
+읽기 lane이 오래 걸리는 조회로 모두 점유되어도 진행 상황 저장(쓰기 lane)이
+바로 처리되는지, lane 통계가 노출되는지 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import asyncio
+import threading
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from db.lanes import DatabaseLane
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    monkeypatch.setattr(main, "read_lane", DatabaseLane("read", 1))
+    monkeypatch.setattr(main, "write_lane", DatabaseLane("write", 1))
+    return app_env
+    main.read_lane.shutdown()
+    main.write_lane.shutdown()
+
+
+class TestDatabaseLane:
+    """DatabaseLane 단위 테스트"""
+
+    def test_run_returns_result_and_counts(self):
+        lane = DatabaseLane("test", 2)
+        assert asyncio.run(lane.run(lambda a, b: a + b, 1, 2)) == 3
+
+        with pytest.raises(ValueError):
+            asyncio.run(lane.run(int, "x"))
+
+        stats = lane.stats()
+        assert stats["completed"] == 1
+        assert stats["failed"] == 1
+        assert stats["pending"] == 0
+        lane.shutdown()
+
+    def test_restart_after_shutdown(self):
+        lane = DatabaseLane("test", 1)
+        lane.shutdown()
+        assert asyncio.run(lane.run(lambda: "ok")) == "ok"
+        lane.shutdown()
+
+
+class TestLaneIsolation:
+    """읽기/쓰기 lane 분리 테스트"""
+
+    def test_progress_save_is_not_blocked_by_slow_reads(self, client):
+        session_id = client.post("/api/sessions", json={"passage_text": "Run.", "total_sentences": 1}).json()["id"]
+
+        # 느린 대시보드 조회가 읽기 lane을 모두 점유한 상황
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow_read():
+            started.set()
+            release.wait(timeout=10)
+
+        client.portal.start_task_soon(main.read_lane.run, slow_read)
+        assert started.wait(timeout=5)
+
+        try:
+            res = client.put(f"/api/sessions/{session_id}/progress", json={
+                "sentence_index": 0, "root_answer": 0, "root_correct": True,
+                "subject_answer": None, "subject_correct": True
+            })
+            assert res.status_code == 200
+            assert main.read_lane.stats()["pending"] == 1
+        finally:
+            release.set()
+
+    def test_not_found_from_lane(self, client):
+        assert client.get("/api/sessions/missing").status_code == 404
+        assert client.put("/api/sessions/missing/progress", json={
+            "sentence_index": 0, "root_correct": True, "subject_correct": True
+        }).status_code == 404
+
+    def test_lane_stats_exposed(self, client):
+        client.post("/api/sessions", json={"passage_text": "Run.", "total_sentences": 1})
+        lanes = client.get("/api/manage/db-pool").json()["lanes"]
+
+        assert lanes["write"]["completed"] >= 1
+        assert set(lanes) == {"read", "write"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
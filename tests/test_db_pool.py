@@ -0,0 +1,96 @@
+"""
+v1.2 SQLite 연결 풀 테스트
+
+연결 재사용, 연결당 한 번만 적용되는 PRAGMA, 커밋되지 않은 트랜잭션 롤백,
+상태 확인 실패 시 연결 교체를 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+from db import database
+from db.database import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    path = str(tmp_path / "pool.db")
+    pool = ConnectionPool(path, size=2)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.commit()
+    yield pool
+    pool.close_all()
+
+
+class TestConnectionPool:
+    """연결 풀 테스트"""
+
+    def test_connections_are_reused(self, pool):
+        for _ in range(5):
+            with pool.connection() as conn:
+                conn.execute("SELECT COUNT(*) FROM items").fetchone()
+
+        stats = pool.stats()
+        assert stats["created"] == 1
+        assert stats["reused"] == 5
+        assert stats["idle"] == 1
+        assert stats["inUse"] == 0
+
+    def test_pragmas_applied(self, pool):
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == database.DB_BUSY_TIMEOUT_MS
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -database.DB_CACHE_KB
+
+    def test_nested_use_shares_connection(self, pool):
+        with pool.connection() as outer:
+            with pool.connection() as inner:
+                assert inner is outer
+            assert pool.stats()["inUse"] == 1
+
+    def test_uncommitted_work_is_rolled_back(self, pool):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('draft')")
+
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+        assert pool.stats()["rollbacks"] == 1
+
+    def test_broken_idle_connection_is_replaced(self, pool):
+        with pool.connection() as conn:
+            pass
+        conn.close()  # 풀에 반환된 뒤 외부 요인으로 끊긴 연결을 흉내
+
+        pool.health_check_seconds = 0
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+        assert pool.stats()["healthCheckFailures"] == 1
+        assert pool.stats()["created"] == 2
+
+    def test_idle_connections_are_capped(self, pool):
+        with pool.connection():
+            # 다른 스레드에서 동시에 빌린 것처럼 직접 체크아웃
+            extra = [pool._checkout() for _ in range(3)]
+            for conn in extra:
+                pool._release(conn)
+
+        assert pool.stats()["idle"] == 2
+
+    def test_pool_follows_db_path_and_stats_endpoint(self, tmp_path, client):
+        assert database.get_pool().path == str(tmp_path / "test.db")
+        client.get("/api/passages")
+        client.get("/api/passages")
+        stats = client.get("/api/manage/db-pool").json()
+
+        assert stats["reused"] >= 1
+        assert stats["inUse"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,105 @@
+"""
+v1.2 NLP 오류 로그 테스트
+
+오류 로그가 대기열에 모였다가 묶음으로 기록되고, 크기 기준으로 압축 교체되며,
+유형별 통계가 로그 파일을 다시 읽지 않고 유지되는지 검증합니다. (spaCy 불필요)
+"""
+import pytest
+import gzip
+import json
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+from nlp.error_tracker import ErrorTracker
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "data" / "nlp_errors.log")
+
+
+def read_entries(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestErrorTracker:
+    """버퍼링 오류 로그 테스트"""
+
+    def test_log_is_buffered_until_flush(self, log_path):
+        tracker = ErrorTracker(log_path, flush_interval_ms=60000, max_rows=100)
+        tracker.log("The dog.", "no_root", {"mode": "FULL"})
+        tracker.log("Runs fast.", "no_subject")
+
+        assert not os.path.exists(log_path)
+        assert tracker.stats()["pending"] == 2
+
+        tracker.flush()
+        entries = read_entries(log_path)
+        assert [e["error_type"] for e in entries] == ["no_root", "no_subject"]
+        assert entries[0]["details"] == {"mode": "FULL"}
+        assert tracker.stats()["flushes"] == 1
+        tracker.stop()
+
+    def test_writer_thread_flushes_full_batches(self, log_path):
+        tracker = ErrorTracker(log_path, flush_interval_ms=60000, max_rows=3)
+        for i in range(3):
+            tracker.log(f"Sentence {i}.", "no_root")
+        tracker.stop()
+
+        assert len(read_entries(log_path)) == 3
+        assert tracker.stats()["written"] == 3
+
+    def test_full_queue_drops_entries(self, log_path):
+        tracker = ErrorTracker(log_path, flush_interval_ms=60000, max_rows=100, max_pending=2)
+        for i in range(5):
+            tracker.log(f"Sentence {i}.", "no_root")
+
+        assert tracker.stats()["dropped"] == 3
+        tracker.stop()
+        assert len(read_entries(log_path)) == 2
+
+    def test_stats_are_persisted(self, log_path):
+        tracker = ErrorTracker(log_path)
+        tracker.log("A.", "no_root")
+        tracker.log("B.", "no_root")
+        tracker.log("C.", "parse_error")
+        tracker.stop()
+
+        # 로그 파일이 없어도 통계는 유지됨 (새 프로세스에서 다시 읽음)
+        os.remove(log_path)
+        assert ErrorTracker(log_path).error_stats() == {"no_root": 2, "parse_error": 1}
+
+    def test_legacy_log_is_counted_once(self, log_path):
+        os.makedirs(os.path.dirname(log_path))
+        with open(log_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"sentence": "A.", "error_type": "no_root"}) + "\n")
+            f.write("not json\n")
+
+        tracker = ErrorTracker(log_path)
+        tracker.log("B.", "no_root")
+        tracker.stop()
+        assert tracker.error_stats() == {"no_root": 2}
+
+    def test_rotation_compresses_and_keeps_backups(self, log_path):
+        tracker = ErrorTracker(log_path, rotate_bytes=1, backups=2)
+        for i in range(4):
+            tracker.log(f"Sentence {i}.", "no_root")
+            tracker.flush()
+        tracker.stop()
+
+        rotated = tracker.rotated_files()
+        assert tracker.stats()["rotations"] == 3
+        assert len(rotated) == 2
+        with gzip.open(rotated[-1], "rt", encoding="utf-8") as f:
+            assert json.loads(f.readline())["sentence"] == "Sentence 2."
+        assert [e["sentence"] for e in read_entries(log_path)] == ["Sentence 3."]
+        # 통계는 교체된 로그까지 누적
+        assert tracker.error_stats() == {"no_root": 4}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,135 @@
+"""
+v1.2 /metrics 테스트
+
+요청 지연/분석 단계/DB 문장별 히스토그램과 상태 게이지가 Prometheus 텍스트 형식으로
+내보내지는지 검증합니다. 모델 다운로드 없이 실행되도록 빈 영어 파이프라인(sentencizer)을 사용합니다.
+"""
+import pytest
+import sys
+import os
+
+import spacy
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from monitoring import metrics
+from monitoring.metrics import Histogram, render_family, statement_label
+from nlp import analyzer, executor, stages
+from nlp.cache import AnalysisCache
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    monkeypatch.setattr(analyzer, "nlp_model", nlp)
+    monkeypatch.setattr(analyzer, "model_id", "blank_en@test")
+    monkeypatch.setattr(analyzer, "analysis_cache", AnalysisCache(l2_path=""))
+    monkeypatch.setattr(analyzer, "sentence_cache", AnalysisCache(l2_path=""))
+    monkeypatch.setattr(main.analysis_executor, "warm_up_in_background", main.analysis_executor.warm_up)
+    return app_env
+
+
+def sample_value(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestRendering:
+    """텍스트 형식 렌더링 테스트"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        hist = Histogram("t_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            hist.observe(value, "/a")
+
+        lines = hist.render().splitlines()
+        assert lines[:2] == ["# HELP t_seconds Test.", "# TYPE t_seconds histogram"]
+        assert lines[2:] == [
+            't_seconds_bucket{route="/a",le="0.1"} 1',
+            't_seconds_bucket{route="/a",le="1.0"} 3',
+            't_seconds_bucket{route="/a",le="+Inf"} 4',
+            't_seconds_sum{route="/a"} 4.05',
+            't_seconds_count{route="/a"} 4',
+        ]
+
+    def test_label_values_are_escaped(self):
+        text = render_family("t", "gauge", "Test.", [({"k": 'a"b\\c\nd'}, 1), ({}, True), ({}, None)])
+        assert text.splitlines()[2:] == ['t{k="a\\"b\\\\c\\nd"} 1', "t 1"]
+
+    def test_statement_labels(self):
+        assert statement_label("SELECT * FROM sessions WHERE id = ?") == "SELECT sessions"
+        assert statement_label("INSERT OR IGNORE INTO students (id) VALUES (?)") == "INSERT students"
+        assert statement_label("UPDATE sessions SET mode = ?") == "UPDATE sessions"
+        assert statement_label("PRAGMA foreign_keys = ON") == "PRAGMA foreign_keys"
+        assert statement_label("WITH x AS (SELECT id FROM progress) DELETE FROM sessions") == "DELETE sessions"
+        assert statement_label("SELECT 1") == "SELECT"
+
+
+class TestStageSamples:
+    """분석 단계 샘플 테스트"""
+
+    def test_nested_calls_make_one_sample(self):
+        stages.drain()
+        with stages.analysis_call():
+            stages.record_parse(0.5)
+            with stages.analysis_call():
+                stages.record_sentence(0.1, 0.2, 0.3, 7)
+        with stages.analysis_call():
+            pass  # 캐시에서만 응답한 호출은 기록하지 않음
+        stages.record_parse(1.0)  # 분석 호출 밖(워밍업 등)은 무시
+
+        assert stages.drain() == [(0.5, 0.1, 0.2, 0.3, 1, 7)]
+
+    def test_worker_samples_travel_with_the_result(self):
+        stages.drain()
+
+        def analyze():
+            with stages.analysis_call():
+                stages.record_sentence(0.1, 0.1, 0.1, 3)
+            return "done"
+
+        result, samples = executor._run_with_stages(analyze)
+        assert result == "done"
+        assert len(samples) == 1 and stages.drain() == []
+
+
+class TestMetricsEndpoint:
+    """/metrics API 테스트"""
+
+    def test_request_analyzer_and_db_metrics(self, client):
+        route = ("POST", "/api/analyze-passage")
+        requests_before = metrics.http_request_seconds.count(*route)
+        sentences_before = metrics.analyzer_sentences.value()
+        missing_before = metrics.http_requests.value("GET", "/api/sessions/{session_id}", "404")
+        unmatched_before = metrics.http_requests.value("GET", "unmatched", "404")
+
+        res = client.post("/api/analyze-passage", json={"passage": "The cat sleeps. The dog runs."})
+        assert res.status_code == 200
+        assert client.get("/api/sessions/no-such-session").status_code == 404
+        assert client.get("/api/no-such-route").status_code == 404
+
+        res = client.get("/metrics")
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = res.text
+
+        assert metrics.http_request_seconds.count(*route) == requests_before + 1
+        assert metrics.http_requests.value("GET", "/api/sessions/{session_id}", "404") == missing_before + 1
+        assert metrics.http_requests.value("GET", "unmatched", "404") == unmatched_before + 1
+        assert metrics.analyzer_sentences.value() == sentences_before + 2
+        for stage in stages.STAGES:
+            assert sample_value(text, f'vg_analyzer_stage_duration_seconds_count{{stage="{stage}"}}') >= 1
+        assert sample_value(text, 'vg_db_query_duration_seconds_count{statement="SELECT sessions"}') >= 1
+        assert sample_value(text, 'vg_db_pool_connections{state="in_use"}') == 0
+        assert sample_value(text, "vg_analysis_model_ready") == 1
+        assert sample_value(text, "vg_analysis_cache_hit_ratio") is not None
+        assert "# TYPE vg_http_request_duration_seconds histogram" in text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
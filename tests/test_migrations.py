@@ -0,0 +1,92 @@
+"""
+v1.2 스키마 마이그레이션 테스트
+
+schema_version 기록, 재실행 시 no-op, 버전 기록이 없던 기존 DB의 채택,
+조회용 인덱스 생성을 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import sqlite3
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+from db.migrations import migrate, current_version, LATEST_VERSION, MIGRATIONS
+
+
+def index_names(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    yield conn
+    conn.close()
+
+
+class TestMigrations:
+    """버전 기반 마이그레이션 테스트"""
+
+    def test_fresh_database_is_migrated_to_latest(self, conn):
+        assert migrate(conn) == [version for version, _, _ in MIGRATIONS]
+        assert current_version(conn) == LATEST_VERSION
+
+        descriptions = [row[0] for row in conn.execute("SELECT description FROM schema_version ORDER BY version")]
+        assert descriptions == [description for _, description, _ in MIGRATIONS]
+
+    def test_rerun_is_noop(self, conn):
+        migrate(conn)
+        assert migrate(conn) == []
+        assert current_version(conn) == LATEST_VERSION
+
+    def test_target_version(self, conn):
+        assert migrate(conn, target=3) == [1, 2, 3]
+        assert "idx_students_display_name" not in index_names(conn)
+
+        assert migrate(conn) == list(range(4, LATEST_VERSION + 1))
+        assert "idx_students_display_name" in index_names(conn)
+
+    def test_legacy_database_is_adopted(self, conn):
+        # v1.0 DB 흉내: mode 컬럼도 schema_version도 없음
+        conn.execute("CREATE TABLE sessions (id TEXT PRIMARY KEY, created_at DATETIME, passage_text TEXT NOT NULL, total_sentences INTEGER)")
+        conn.execute("INSERT INTO sessions (id, passage_text, total_sentences) VALUES ('s1', 'Run.', 1)")
+        conn.commit()
+
+        migrate(conn)
+
+        assert conn.execute("SELECT mode FROM sessions WHERE id = 's1'").fetchone()[0] == "FULL"
+        assert current_version(conn) == LATEST_VERSION
+
+    def test_failed_step_is_rolled_back(self, conn):
+        migrate(conn, target=LATEST_VERSION - 1)
+
+        def broken(cursor):
+            cursor.execute("CREATE INDEX idx_half_done ON students(created_at)")
+            raise RuntimeError("boom")
+
+        version, description, step = MIGRATIONS[-1]
+        MIGRATIONS[-1] = (version, description, broken)
+        try:
+            with pytest.raises(RuntimeError):
+                migrate(conn)
+        finally:
+            MIGRATIONS[-1] = (version, description, step)
+
+        assert current_version(conn) == LATEST_VERSION - 1
+        assert "idx_half_done" not in index_names(conn)
+
+    def test_lookup_queries_use_indexes(self, conn):
+        migrate(conn)
+
+        def plan(sql):
+            return " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+
+        assert "idx_students_display_name" in plan("SELECT id FROM students WHERE display_name = 'Kim'")
+        assert "idx_session_student_map_student" in plan("SELECT session_id FROM session_student_map WHERE student_id = 'st'")
+        assert "TEMP B-TREE" not in plan("SELECT id FROM passages ORDER BY created_at DESC")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,163 @@
+"""
+v1.2 NLP 분석 실패 저장소 테스트
+
+분석 결과에서 실패 문장을 골라내고, 문장별로 중복 제거하여 횟수와 함께 저장하며,
+관리자 API에서 오류 유형/기간/패턴별로 페이지 조회되는지 검증합니다. (spaCy 불필요)
+"""
+import pytest
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from nlp import analyzer
+from nlp.cache import AnalysisCache
+from nlp.error_tracker import classify_sentence
+from nlp.failure_store import FailureStore
+
+
+def sentence(text, tokens, roots, subjects):
+    """(text, pos, tag) 토큰 목록으로 SentenceItem을 만듭니다."""
+    return {
+        "id": 0,
+        "text": text,
+        "tokens": [
+            {"id": i, "text": t, "start": 0, "end": 0, "pos": pos, "tag": tag, "dep": ""}
+            for i, (t, pos, tag) in enumerate(tokens)
+        ],
+        "key": {"roots": roots, "subjects": subjects, "subjectSpans": [[] for _ in roots]},
+    }
+
+
+GOOD = sentence("The cat sleeps.", [("The", "DET", "DT"), ("cat", "NOUN", "NN"), ("sleeps", "VERB", "VBZ"), (".", "PUNCT", ".")], [2], [1])
+IMPERATIVE = sentence("Run fast.", [("Run", "VERB", "VB"), ("fast", "ADV", "RB"), (".", "PUNCT", ".")], [0], [None])
+FRAGMENT = sentence("Good morning.", [("Good", "ADJ", "JJ"), ("morning", "NOUN", "NN"), (".", "PUNCT", ".")], [1], [None])
+NO_SUBJECT = sentence("Went home.", [("Went", "VERB", "VBD"), ("home", "ADV", "RB"), (".", "PUNCT", ".")], [0], [None])
+
+
+def entry(text, error_type, day="2026-03-01", pattern="NN ."):
+    return {"timestamp": f"{day}T09:00:00", "sentence": text, "error_type": error_type,
+            "details": {"mode": "FULL", "pattern": pattern}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FailureStore(str(tmp_path / "nlp_errors.db"))
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    def fake_parse(text, mode="FULL"):
+        return {"sentences": [GOOD, FRAGMENT, NO_SUBJECT], "meta": {"totalSentences": 3, "nlp_model": "test"}}
+
+    monkeypatch.setattr(analyzer, "parse_passage", fake_parse)
+    monkeypatch.setattr(analyzer, "model_id", "fake@test")
+    monkeypatch.setattr(analyzer, "analysis_cache", AnalysisCache(l2_path=""))
+    return app_env
+
+
+class TestClassifySentence:
+    """실패 유형 분류 테스트"""
+
+    def test_good_and_imperative_sentences_pass(self):
+        assert classify_sentence(GOOD) == []
+        assert classify_sentence(IMPERATIVE) == []
+
+    def test_failures(self):
+        assert classify_sentence(FRAGMENT) == [("no_root", {"roots": ["morning"]})]
+        assert classify_sentence(NO_SUBJECT) == [("no_subject", {"roots": ["Went"]})]
+
+    def test_punctuation_only_is_skipped(self):
+        assert classify_sentence(sentence("...", [("...", "PUNCT", ":")], [0], [None])) == []
+
+
+class TestFailureStore:
+    """실패 저장소 테스트"""
+
+    def test_dedup_counts(self, store):
+        store.record([entry("Good  morning.", "no_root"), entry("Good morning.", "no_root")])
+        store.record([entry("Good morning.", "no_root", day="2026-03-02"), entry("Good morning.", "no_subject")])
+
+        items = store.top()
+        assert [(i["error_type"], i["count"]) for i in items] == [("no_root", 3), ("no_subject", 1)]
+        assert items[0]["sentence"] == "Good morning."
+        assert items[0]["first_seen"].startswith("2026-03-01")
+        assert items[0]["last_seen"].startswith("2026-03-02")
+        assert store.stats() == {"sentences": 2, "patterns": 2, "occurrences": 4}
+
+    def test_filters(self, store):
+        store.record([entry("A.", "no_root"), entry("A.", "no_root", day="2026-03-05"), entry("B.", "no_subject")])
+
+        assert [i["sentence"] for i in store.top(error_type="no_subject")] == ["B."]
+        ranged = store.top(date_from="2026-03-02", date_to="2026-03-31")
+        assert [(i["sentence"], i["count"]) for i in ranged] == [("A.", 1)]
+
+    def test_group_by_pattern(self, store):
+        store.record([
+            entry("A.", "no_root", pattern="NN ."), entry("B.", "no_root", pattern="NN ."),
+            entry("B.", "no_root", pattern="NN ."), entry("C d.", "no_root", pattern="JJ NN ."),
+        ])
+
+        items = store.top(group_by="pattern")
+        assert [(i["pattern"], i["sentences"], i["count"]) for i in items] == [("NN .", 2, 3), ("JJ NN .", 1, 1)]
+        ranged = store.top(group_by="pattern", date_from="2026-03-01", error_type="no_root")
+        assert [i["count"] for i in ranged] == [3, 1]
+
+    def test_keyset_paging(self, store):
+        store.record([entry(f"S{i}.", "no_root") for i in range(5) for _ in range(i % 2 + 1)])
+
+        for kwargs in ({}, {"date_from": "2026-01-01"}, {"group_by": "pattern"}):
+            seen, after = [], None
+            while True:
+                page = store.top(limit=2, after=after, **kwargs)
+                if not page:
+                    break
+                seen.extend(page)
+                after = (page[-1]["count"], page[-1]["id"])
+            counts = [i["count"] for i in seen]
+            assert counts == sorted(counts, reverse=True)
+            assert len({i["id"] for i in seen}) == len(seen)
+            assert sum(counts) == 7
+
+
+class TestNlpFailuresApi:
+    """실패 조회 API 테스트"""
+
+    def test_analysis_failures_are_listed(self, client):
+        # 새로 파싱한 두 지문만 기록 (지문 캐시 적중은 제외)
+        for passage in ("x", "y", "x"):
+            assert client.post("/api/analyze-passage", json={"passage": passage, "mode": "CORE"}).status_code == 200
+        main.error_tracker.flush()
+
+        res = client.get("/api/manage/nlp-failures")
+        assert res.status_code == 200
+        body = res.json()
+        assert {(i["errorType"], i["sentence"], i["count"]) for i in body["items"]} == {
+            ("no_root", "Good morning.", 2), ("no_subject", "Went home.", 2)
+        }
+        assert body["items"][0]["details"]["mode"] == "CORE"
+        assert body["totals"] == {"no_root": 2, "no_subject": 2}
+
+        res = client.get("/api/manage/nlp-failures?group_by=pattern&error_type=no_subject")
+        assert [(i["pattern"], i["example"]) for i in res.json()["items"]] == [("VBD RB .", "Went home.")]
+
+    def test_paging_and_validation(self, client):
+        client.post("/api/analyze-passage", json={"passage": "x"})
+        main.error_tracker.flush()
+
+        first = client.get("/api/manage/nlp-failures?limit=1").json()
+        second = client.get(f"/api/manage/nlp-failures?limit=1&cursor={first['nextCursor']}").json()
+        assert len(first["items"]) == len(second["items"]) == 1
+        assert first["items"][0]["id"] != second["items"][0]["id"]
+        assert second["nextCursor"] is None
+
+        assert client.get("/api/manage/nlp-failures?limit=0").status_code == 400
+        assert client.get("/api/manage/nlp-failures?group_by=tag").status_code == 400
+        assert client.get("/api/manage/nlp-failures?date_from=March").status_code == 400
+        assert client.get("/api/manage/nlp-failures?cursor=bad").status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
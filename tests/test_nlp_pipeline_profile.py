@@ -0,0 +1,65 @@
+"""
+v1.2 spaCy 파이프라인 프로필 정확도 테스트
+
+NER/lemmatizer를 제외한 "minimal" 프로필이 전체 파이프라인과 같은
+뿌리 동사/주어를 찾는지 test_nlp_cases.py, test_relative_clauses.py의
+문장들로 확인합니다. (en_core_web_sm 설치 필요)
+"""
+import pytest
+import sys
+import os
+
+import spacy
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.nlp.analyzer import MODEL_NAME, get_excluded_components, _analyze_doc
+
+pytestmark = pytest.mark.skipif(
+    not spacy.util.is_package(MODEL_NAME), reason=f"{MODEL_NAME} is not installed"
+)
+
+SENTENCES = [
+    # test_nlp_cases.py
+    "There is a cat on the mat.",
+    "It is hard to study English.",
+    "It seems that he is honest.",
+    "This mental training helps them stay calm.",
+    "I saw him running.",
+    "I think he will come tomorrow.",
+    # test_relative_clauses.py
+    "The man who lives next door is friendly.",
+    "The book which I bought yesterday is interesting.",
+    "The cake that she baked was delicious.",
+    "Some fans dislike it because it stops the game.",
+]
+
+
+@pytest.fixture(scope="module")
+def models():
+    return {
+        profile: spacy.load(MODEL_NAME, exclude=get_excluded_components(profile))
+        for profile in ("full", "minimal")
+    }
+
+
+class TestPipelineProfile:
+    """파이프라인 프로필 정확도 테스트"""
+
+    def test_minimal_profile_drops_unused_components(self, models):
+        assert "ner" not in models["minimal"].pipe_names
+        assert "lemmatizer" not in models["minimal"].pipe_names
+        assert "attribute_ruler" in models["minimal"].pipe_names  # pos_ 매핑
+
+    @pytest.mark.parametrize("mode", ["FULL", "CORE"])
+    @pytest.mark.parametrize("sentence", SENTENCES)
+    def test_same_roots_and_subjects(self, models, sentence, mode):
+        full = _analyze_doc(models["full"](sentence), mode)
+        minimal = _analyze_doc(models["minimal"](sentence), mode)
+
+        assert minimal["sentences"] == full["sentences"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
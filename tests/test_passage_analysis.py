@@ -0,0 +1,97 @@
+"""
+v1.2 저장된 지문 분석 결과 테스트
+
+지문 저장 시 FULL/CORE 분석이 미리 저장되고, 지문 내용이나 모델 버전이
+바뀌면 저장된 결과가 무효화되는지 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from db import database
+
+
+calls = []
+
+
+async def fake_analyze(text, mode="FULL"):
+    calls.append((text, mode))
+    return {
+        "sentences": [{
+            "id": 0,
+            "text": text,
+            "tokens": [{"id": 0, "text": text, "start": 0, "end": len(text), "pos": "VERB", "tag": "VBZ", "dep": "ROOT"}],
+            "key": {"roots": [0], "subjects": [None], "subjectSpans": [[]]}
+        }],
+        "meta": {"totalSentences": 1, "nlp_model": "en_core_web_sm"}
+    }
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    calls.clear()
+    monkeypatch.setattr(main, "analyze_passage_async", fake_analyze)
+    monkeypatch.setattr(main, "get_analysis_version", lambda: "test-model@1+analyzer1")
+    return app_env
+
+
+class TestPassageAnalysis:
+    """저장된 지문 분석 결과 API 테스트"""
+
+    def test_create_passage_precomputes_both_modes(self, client):
+        res = client.post("/api/passages", json={"title": "T", "content": "Run."})
+        passage_id = res.json()["id"]
+
+        assert sorted(mode for _, mode in calls) == ["CORE", "FULL"]
+
+        calls.clear()
+        res = client.get(f"/api/passages/{passage_id}/analysis?mode=CORE")
+        assert res.status_code == 200
+        assert res.json()["sentences"][0]["text"] == "Run."
+        assert calls == []  # 저장된 결과 사용
+
+    def test_model_version_change_invalidates(self, client, monkeypatch):
+        passage_id = client.post("/api/passages", json={"title": "T", "content": "Run."}).json()["id"]
+        calls.clear()
+
+        monkeypatch.setattr(main, "get_analysis_version", lambda: "test-model@2+analyzer1")
+        res = client.get(f"/api/passages/{passage_id}/analysis?mode=FULL")
+        assert res.status_code == 200
+        assert calls == [("Run.", "FULL")]
+
+        # 다시 저장되었으므로 재분석하지 않음
+        client.get(f"/api/passages/{passage_id}/analysis?mode=FULL")
+        assert len(calls) == 1
+
+    def test_content_change_invalidates(self, client):
+        passage_id = client.post("/api/passages", json={"title": "T", "content": "Run."}).json()["id"]
+        calls.clear()
+
+        with database.get_db() as conn:
+            conn.execute("UPDATE passages SET content = ? WHERE id = ?", ("Walk.", passage_id))
+            conn.commit()
+
+        res = client.get(f"/api/passages/{passage_id}/analysis?mode=FULL")
+        assert res.json()["sentences"][0]["text"] == "Walk."
+        assert calls == [("Walk.", "FULL")]
+
+    def test_unknown_passage_and_mode(self, client):
+        assert client.get("/api/passages/missing/analysis").status_code == 404
+        passage_id = client.post("/api/passages", json={"title": "T", "content": "Run."}).json()["id"]
+        assert client.get(f"/api/passages/{passage_id}/analysis?mode=EASY").status_code == 400
+
+    def test_delete_passage_cascades(self, client):
+        passage_id = client.post("/api/passages", json={"title": "T", "content": "Run."}).json()["id"]
+        client.delete(f"/api/passages/{passage_id}")
+
+        with database.get_db() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM passage_analyses").fetchone()[0]
+        assert count == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
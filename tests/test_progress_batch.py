@@ -0,0 +1,68 @@
+"""
+v1.2 진행 상황 일괄 저장 테스트
+
+PUT /api/sessions/{id}/progress/batch 가 여러 문장의 진행 상황을
+한 번에 저장하는지 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+
+
+def progress_item(index, correct=True):
+    return {
+        "sentence_index": index,
+        "root_answer": 1,
+        "root_correct": correct,
+        "subject_answer": 0,
+        "subject_correct": correct
+    }
+
+
+
+@pytest.fixture
+def session_id(client):
+    res = client.post("/api/sessions", json={"passage_text": "Run. Walk. Jump.", "total_sentences": 3})
+    return res.json()["id"]
+
+
+class TestProgressBatch:
+    """진행 상황 일괄 저장 API 테스트"""
+
+    def test_saves_all_items(self, client, session_id):
+        items = [progress_item(i) for i in range(3)]
+        res = client.put(f"/api/sessions/{session_id}/progress/batch", json={"items": items})
+
+        assert res.status_code == 200
+        assert res.json()["saved"] == 3
+
+        progress = client.get(f"/api/sessions/{session_id}").json()["progress"]
+        assert [p["sentence_index"] for p in progress] == [0, 1, 2]
+
+    def test_later_item_for_same_sentence_wins(self, client, session_id):
+        items = [progress_item(0, correct=False), progress_item(0, correct=True)]
+        client.put(f"/api/sessions/{session_id}/progress/batch", json={"items": items})
+
+        progress = client.get(f"/api/sessions/{session_id}").json()["progress"]
+        assert len(progress) == 1
+        assert progress[0]["root_correct"] is True
+
+    def test_unknown_session(self, client):
+        res = client.put("/api/sessions/missing/progress/batch", json={"items": [progress_item(0)]})
+        assert res.status_code == 404
+
+    def test_too_many_items(self, client, session_id, monkeypatch):
+        monkeypatch.setattr(main, "MAX_PROGRESS_BATCH", 2)
+        items = [progress_item(i) for i in range(3)]
+
+        res = client.put(f"/api/sessions/{session_id}/progress/batch", json={"items": items})
+        assert res.status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,182 @@
+"""
+v1.2 진행 상황 write-behind 대기열 테스트
+
+진행 상황 쓰기가 묶음으로 커밋되고, 커밋 전에도 세션 조회에 보이며
+(read-your-writes), 종료 시 모두 커밋되는지 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import sqlite3
+import time
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+from fastapi.testclient import TestClient
+import main
+from db import database
+from db.write_behind import ProgressWriter, ProgressQueueFull
+
+
+def row(session_id, index, correct=True):
+    return (session_id, index, 1, correct, 0, correct, "2026-01-01T00:00:00")
+
+
+def committed_count(session_id):
+    with database.get_db() as conn:
+        return conn.execute("SELECT COUNT(*) FROM progress WHERE session_id = ?", (session_id,)).fetchone()[0]
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "test.db"))
+    database.init_db()
+    with database.get_db() as conn:
+        conn.execute("INSERT INTO sessions (id, passage_text, total_sentences) VALUES ('s1', 'Run.', 3)")
+        conn.commit()
+    yield
+    database.close_pool()
+
+
+class TestProgressWriter:
+    """write-behind 대기열 테스트"""
+
+    def test_group_commit(self, db):
+        writer = ProgressWriter(flush_interval_ms=60_000)
+        writer.submit([row("s1", 0), row("s1", 1)])
+        writer.submit([row("s1", 2)])
+
+        assert committed_count("s1") == 0
+        assert sorted(writer.pending_for("s1")) == [0, 1, 2]
+
+        writer.flush()
+        assert committed_count("s1") == 3
+        assert writer.stats()["commits"] == 1
+        assert writer.pending_for("s1") == {}
+
+    def test_latest_write_wins(self, db):
+        writer = ProgressWriter(flush_interval_ms=60_000)
+        writer.submit([row("s1", 0, correct=False)])
+        writer.submit([row("s1", 0, correct=True)])
+        writer.flush()
+
+        with database.get_db() as conn:
+            rows = conn.execute("SELECT root_correct FROM progress WHERE session_id = 's1'").fetchall()
+        assert [r[0] for r in rows] == [1]
+
+    def test_max_rows_triggers_commit(self, db):
+        writer = ProgressWriter(flush_interval_ms=60_000, max_rows=2)
+        writer.submit([row("s1", 0), row("s1", 1)])
+
+        for _ in range(100):
+            if writer.stats()["written"] == 2:
+                break
+            time.sleep(0.01)
+        assert committed_count("s1") == 2
+        writer.stop()
+
+    def test_stop_flushes_pending(self, db):
+        writer = ProgressWriter(flush_interval_ms=60_000)
+        writer.submit([row("s1", 0)])
+        writer.stop()
+
+        assert committed_count("s1") == 1
+
+    def test_rows_for_deleted_session_are_dropped(self, db):
+        writer = ProgressWriter(flush_interval_ms=60_000)
+        writer.submit([row("s1", 0), row("missing", 0)])
+        writer.flush()
+
+        assert committed_count("s1") == 1
+        assert writer.stats()["dropped"] == 1
+
+    def test_locked_database_is_retried(self, db, monkeypatch):
+        writer = ProgressWriter(flush_interval_ms=60_000, retry_backoff_ms=1)
+        write = writer._write
+        attempts = []
+
+        def locked_once(rows):
+            attempts.append(rows)
+            if len(attempts) == 1:
+                # 첫 커밋 도중 들어온 같은 문장의 쓰기가 되돌린 행보다 우선
+                writer.submit([row("s1", 0, correct=False)])
+                raise sqlite3.OperationalError("database is locked")
+            write(rows)
+
+        monkeypatch.setattr(writer, "_write", locked_once)
+        writer.submit([row("s1", 0), row("s1", 1)])
+        writer.flush()
+
+        assert len(attempts) == 2
+        assert committed_count("s1") == 2
+        with database.get_db() as conn:
+            assert conn.execute(
+                "SELECT root_correct FROM progress WHERE session_id = 's1' AND sentence_index = 0"
+            ).fetchone()[0] == 0
+        stats = writer.stats()
+        assert stats["retries"] == 1
+        assert stats["dropped"] == 0
+        assert stats["pending"] == 0
+
+    def test_dropped_after_retries(self, db, monkeypatch):
+        writer = ProgressWriter(flush_interval_ms=60_000, max_retries=2, retry_backoff_ms=1)
+
+        def locked(rows):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(writer, "_write", locked)
+        writer.submit([row("s1", 0)])
+        writer.flush()
+
+        stats = writer.stats()
+        assert stats["retries"] == 2
+        assert stats["dropped"] == 1
+        assert stats["pending"] == 0
+
+    def test_queue_full(self, db):
+        writer = ProgressWriter(flush_interval_ms=60_000, max_pending=2)
+        writer.submit([row("s1", 0), row("s1", 1)])
+        writer.submit([row("s1", 1)])  # 같은 문장 덮어쓰기는 허용
+
+        with pytest.raises(ProgressQueueFull):
+            writer.submit([row("s1", 2)])
+        writer.stop()
+
+
+class TestProgressEndpoints:
+    """진행 상황 API read-your-writes 테스트"""
+
+    def test_get_session_sees_pending_progress(self, app_env, monkeypatch):
+        monkeypatch.setattr(main, "progress_writer", ProgressWriter(flush_interval_ms=60_000))
+
+        with TestClient(main.app) as client:
+            session_id = client.post("/api/sessions", json={"passage_text": "Run.", "total_sentences": 1}).json()["id"]
+            res = client.put(f"/api/sessions/{session_id}/progress", json={
+                "sentence_index": 0, "root_answer": 0, "root_correct": True,
+                "subject_answer": None, "subject_correct": True
+            })
+            assert res.status_code == 200
+            assert committed_count(session_id) == 0
+
+            progress = client.get(f"/api/sessions/{session_id}").json()["progress"]
+            assert progress[0]["sentence_index"] == 0
+            assert progress[0]["root_correct"] is True
+
+        # 종료 시 커밋됨
+        assert committed_count(session_id) == 1
+
+    def test_queue_full_returns_503(self, client, monkeypatch):
+        monkeypatch.setattr(main, "progress_writer", ProgressWriter(max_pending=0))
+
+        session_id = client.post("/api/sessions", json={"passage_text": "Run.", "total_sentences": 1}).json()["id"]
+        res = client.put(f"/api/sessions/{session_id}/progress/batch", json={"items": [{
+            "sentence_index": 0, "root_correct": True, "subject_correct": True
+        }]})
+
+        assert res.status_code == 503
+        assert res.headers["Retry-After"] == "1"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
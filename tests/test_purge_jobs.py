@@ -0,0 +1,149 @@
+"""
+v1.2 세션 대량 삭제(purge) 작업 테스트
+
+id 목록/학생/날짜/전체 기준 삭제가 묶음 단위 백그라운드 작업으로 실행되고,
+진행 상황이 보고되며, 삭제 후 checkpoint/VACUUM이 실행되는지 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import sqlite3
+import time
+from contextlib import contextmanager
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from db import database, purge
+from db.purge import PurgeManager
+from db.student_stats import verify_student_stats
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    monkeypatch.setattr(main, "purge_manager", PurgeManager(chunk_size=2, pause_ms=0, vacuum_free_ratio=0.0))
+    return app_env
+
+
+@pytest.fixture
+def client(client):
+    with database.get_db() as conn:
+        conn.executemany(
+            "INSERT INTO sessions (id, created_at, passage_text, total_sentences) VALUES (?, ?, 'Run.', 1)",
+            [(f"s{i}", f"2026-03-0{i} 09:00:00") for i in range(1, 6)]
+        )
+        conn.commit()
+    return client
+
+
+def session_ids():
+    with database.get_db() as conn:
+        return [row[0] for row in conn.execute("SELECT id FROM sessions ORDER BY id")]
+
+
+def run_job(client, body):
+    res = client.post("/api/manage/purge", json=body)
+    assert res.status_code == 202
+    job = main.purge_manager.wait(res.json()["id"], timeout=10)
+    assert job["status"] == "done"
+    return job
+
+
+class TestPurgeJobs:
+    """purge 작업 API 테스트"""
+
+    def test_older_than(self, client):
+        job = run_job(client, {"older_than": "2026-03-04"})
+
+        assert job["kind"] == "older_than"
+        assert job["total"] == 3
+        assert job["deleted"] == 3
+        assert session_ids() == ["s4", "s5"]
+        assert client.get(f"/api/manage/purge/{job['id']}").json()["deleted"] == 3
+
+    def test_session_ids(self, client):
+        job = run_job(client, {"session_ids": ["s1", "s3", "s3", "missing"]})
+
+        assert job["total"] == 3
+        assert job["deleted"] == 2
+        assert session_ids() == ["s2", "s4", "s5"]
+
+    def test_duplicate_ids_are_chunked_once(self, client, monkeypatch):
+        chunks = []
+        next_chunk = main.purge_manager._next_chunk
+        monkeypatch.setattr(main.purge_manager, "_next_chunk", lambda job, max_rowid: chunks.append(next_chunk(job, max_rowid)) or chunks[-1])
+
+        job = run_job(client, {"session_ids": ["s2", "s1", "s2", "s1", "s4"]})
+
+        assert job["total"] == job["deleted"] == 3
+        assert chunks == [["s2", "s1"], ["s4"], []]
+
+    def test_student(self, client):
+        for session_id in ("s1", "s2", "s3"):
+            client.put(f"/api/manage/sessions/{session_id}/assign-student", json={"student_name": "Kim"})
+        client.put("/api/manage/sessions/s4/assign-student", json={"student_name": "Lee"})
+        kim = next(s for s in client.get("/api/manage/sessions").json()["students"] if s["displayName"] == "Kim")
+
+        job = run_job(client, {"student_id": kim["studentId"]})
+
+        assert job["deleted"] == 3
+        assert session_ids() == ["s4", "s5"]
+        students = client.get("/api/manage/sessions").json()["students"]
+        assert [s["displayName"] for s in students] == ["Lee"]
+        with database.get_db() as conn:
+            assert verify_student_stats(conn.cursor()) == []
+
+    def test_clear_all_is_a_job(self, client):
+        res = client.delete("/api/manage/sessions")
+        assert res.status_code == 202
+
+        job = main.purge_manager.wait(res.json()["jobId"], timeout=10)
+        assert job["kind"] == "all"
+        assert job["deleted"] == 5
+        assert session_ids() == []
+
+        jobs = client.get("/api/manage/purge").json()["jobs"]
+        assert jobs[0]["id"] == job["id"]
+
+    def test_checkpoint_and_vacuum_after_purge(self, client):
+        run_job(client, {"all": True})
+
+        for _ in range(100):
+            maintenance = client.get("/api/manage/purge").json()["maintenance"]
+            if maintenance["vacuums"]:
+                break
+            time.sleep(0.02)
+        assert maintenance["checkpoints"] == 1
+        assert maintenance["vacuums"] == 1
+        assert maintenance["vacuumDue"] is False
+
+    def test_failed_vacuum_is_not_retried_immediately(self, monkeypatch):
+        manager = PurgeManager(vacuum_free_ratio=0.0, vacuum_retry_seconds=60)
+        manager.mark_vacuum_due()
+        assert manager._maintenance_wait() == 0
+
+        @contextmanager
+        def locked_db():
+            raise sqlite3.OperationalError("database is locked")
+            yield
+
+        monkeypatch.setattr(purge, "get_db", locked_db)
+        with pytest.raises(sqlite3.OperationalError):
+            manager.run_maintenance()
+
+        # worker는 재시도 간격만큼 기다리고, 그 전에는 VACUUM하지 않음
+        assert manager._maintenance_wait() > 59
+        assert manager.run_maintenance() is False
+        assert manager.stats()["vacuumFailures"] == 1
+        assert manager.stats()["vacuumDue"] is True
+
+    def test_invalid_requests(self, client):
+        assert client.post("/api/manage/purge", json={}).status_code == 400
+        assert client.post("/api/manage/purge", json={"all": True, "student_id": "x"}).status_code == 400
+        assert client.post("/api/manage/purge", json={"older_than": "March"}).status_code == 400
+        assert client.get("/api/manage/purge/missing").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
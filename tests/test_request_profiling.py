@@ -0,0 +1,94 @@
+"""
+v1.2 요청 프로파일링 테스트
+
+헤더/샘플링 비율로 선택된 요청만 스택 샘플링되고, 최근 프로파일이 관리자 API에서
+collapsed stack 형식으로 조회되는지 검증합니다. (spaCy 불필요)
+"""
+import pytest
+import time
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from monitoring.profiling import RequestProfiler, request_profiler
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    async def slow_analyze_async(text, mode="FULL"):
+        time.sleep(0.05)  # 이벤트 루프를 막는 느린 요청
+        return {"sentences": [], "meta": {"totalSentences": 0, "nlp_model": "test"}}
+
+    monkeypatch.setattr(main, "analyze_passage_async", slow_analyze_async)
+    monkeypatch.setattr(request_profiler, "sample_rate", 0.0)
+    monkeypatch.setattr(request_profiler, "token", "s3cret")
+    return app_env
+
+
+class TestProfileSelection:
+    """프로파일 대상 선택 테스트"""
+
+    def test_header_sample_rate_and_paths(self):
+        profiler = RequestProfiler(sample_rate=0.0, token="s3cret", paths=("/api/",))
+        assert profiler.wants("/api/sessions", "s3cret") == "header"
+        assert profiler.wants("/api/sessions", "1") is None
+        assert profiler.wants("/api/sessions", None) is None
+        assert profiler.wants("/static/app.js", "s3cret") is None
+        assert profiler.wants("/api/manage/profiles", "s3cret") is None
+
+        profiler.sample_rate = 1.0
+        assert profiler.wants("/api/sessions", None) == "sample"
+
+    def test_header_is_ignored_without_token(self):
+        profiler = RequestProfiler(sample_rate=0.0, token="", paths=("/api/",))
+        assert profiler.wants("/api/sessions", "1") is None
+        assert profiler.wants("/api/sessions", "") is None
+
+    def test_non_ascii_header_is_a_mismatch(self):
+        profiler = RequestProfiler(sample_rate=0.0, token="s3cret", paths=("/api/",))
+        assert profiler.wants("/api/sessions", "s3crét") is None
+        assert RequestProfiler(sample_rate=0.0, token="비밀", paths=("/api/",)).wants(
+            "/api/sessions", "비밀".encode("utf-8").decode("latin-1")
+        ) == "header"
+
+
+class TestProfilesApi:
+    """프로파일 조회 API 테스트"""
+
+    def test_profiled_request_is_stored_as_collapsed_stacks(self, client):
+        res = client.post("/api/analyze-passage", json={"passage": "x"}, headers={"X-VG-Profile": "s3cret"})
+        assert res.status_code == 200
+        profile_id = res.headers["x-vg-profile-id"]
+
+        listing = client.get("/api/manage/profiles").json()
+        summary = next(p for p in listing["items"] if p["id"] == profile_id)
+        assert summary["route"] == "/api/analyze-passage"
+        assert summary["status"] == 200
+        assert summary["reason"] == "header"
+        assert summary["samples"] > 0
+        assert "stacks" not in summary
+
+        res = client.get(f"/api/manage/profiles/{profile_id}")
+        assert res.status_code == 200
+        lines = res.text.splitlines()
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any("slow_analyze_async" in line for line in lines)
+
+    def test_unprofiled_requests_are_untouched(self, client):
+        captured = request_profiler.stats()["captured"]
+        res = client.post("/api/analyze-passage", json={"passage": "x"})
+        assert "x-vg-profile-id" not in res.headers
+        res = client.post("/api/analyze-passage", json={"passage": "x"}, headers={"X-VG-Profile": "1"})
+        assert "x-vg-profile-id" not in res.headers
+        res = client.post("/api/analyze-passage", json={"passage": "x"}, headers={"X-VG-Profile": "s3cr\u00e9t".encode("latin-1")})
+        assert res.status_code == 200
+        assert "x-vg-profile-id" not in res.headers
+        assert request_profiler.stats()["captured"] == captured
+        assert client.get("/api/manage/profiles/unknown").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
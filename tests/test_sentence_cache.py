@@ -0,0 +1,113 @@
+"""
+v1.2 문장 단위 캐시 테스트
+
+단독 파싱 결과가 지문 안 결과와 같은 문장만 캐시되고, 모든 문장이 캐시된
+지문만 파싱 없이 조립되며, 문맥에 의존할 수 있는 문장이 있으면 지문 전체
+파싱으로 대체되는지 검증합니다.
+모델 다운로드 없이 실행되도록 빈 영어 파이프라인(sentencizer)을 사용합니다.
+"""
+import pytest
+import sys
+import os
+
+import spacy
+from spacy.language import Language
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.nlp import analyzer, cache
+from server.nlp.cache import AnalysisCache
+
+parsed_texts = []
+
+
+@Language.component("record_parsed_text")
+def record_parsed_text(doc):
+    parsed_texts.append(doc.text)
+    return doc
+
+
+@Language.component("tag_by_doc_length")
+def tag_by_doc_length(doc):
+    for token in doc:
+        token.tag_ = "LONG" if len(doc) > 5 else "SHORT"
+    return doc
+
+
+@pytest.fixture
+def blank_model(monkeypatch):
+    parsed_texts.clear()
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("record_parsed_text")
+    monkeypatch.setattr(analyzer, "nlp_model", nlp)
+    monkeypatch.setattr(analyzer, "model_id", "blank_en@test")
+    monkeypatch.setattr(analyzer, "sentence_cache", AnalysisCache(l2_path=""))
+    monkeypatch.setattr(analyzer, "SENTENCE_CACHE_ENABLED", True)
+    return nlp
+
+
+class TestSentenceCache:
+    """문장 캐시 테스트"""
+
+    def test_verified_sentences_are_reused(self, blank_model):
+        # 처음 보는 문장: 지문 전체 파싱 + 검증용 단독 파싱
+        analyzer.parse_passage("The cat sleeps. The dog barks.")
+        assert parsed_texts == ["The cat sleeps. The dog barks.", "The cat sleeps.", "The dog barks."]
+
+        parsed_texts.clear()
+        analyzer.parse_passage("The dog barks. A bird sings!")
+        assert parsed_texts == ["The dog barks. A bird sings!", "A bird sings!"]
+
+        # 모든 문장이 캐시에 있으면 파싱하지 않음
+        parsed_texts.clear()
+        result = analyzer.parse_passage("A bird sings! The cat sleeps.")
+        assert parsed_texts == []
+
+        # 문장 id는 지문 안의 위치 기준으로 다시 매겨짐
+        assert [s["id"] for s in result["sentences"]] == [0, 1]
+        assert [s["text"] for s in result["sentences"]] == ["A bird sings!", "The cat sleeps."]
+
+    def test_context_sensitive_sentence_is_not_cached(self, blank_model):
+        # 지문 길이에 따라 태그가 달라지는 파이프라인: 단독 파싱 결과가 문맥 안 결과와 다름
+        blank_model.add_pipe("tag_by_doc_length")
+        passage = "The cat sleeps. The dog barks."
+        first = analyzer.parse_passage(passage)
+        assert analyzer.sentence_cache.stats()["entries"] == 0
+
+        parsed_texts.clear()
+        assert analyzer.parse_passage(passage) == first
+        assert parsed_texts[0] == passage
+
+    def test_cached_sentence_matches_full_parse(self, blank_model):
+        # 캐시에서 조립한 결과의 id/오프셋이 지문 전체 파싱과 같은지 확인
+        passage = "The cat sleeps. The dog barks."
+        analyzer.parse_passage(passage)
+        cached = analyzer.parse_passage(passage)
+
+        full = analyzer._analyze_doc(blank_model(passage), "FULL")
+        assert cached == full
+
+    def test_mode_is_part_of_the_key(self, blank_model):
+        analyzer.parse_passage("The cat sleeps.", mode="FULL")
+        parsed_texts.clear()
+        analyzer.parse_passage("The cat sleeps.", mode="CORE")
+        assert parsed_texts == ["The cat sleeps.", "The cat sleeps."]
+
+    def test_disabled_by_default(self):
+        assert cache.SENTENCE_CACHE_ENABLED is (os.environ.get("VG_SENTENCE_CACHE") == "1")
+
+    @pytest.mark.parametrize("passage", [
+        "The cat sleeps. and then it wakes up.",   # 소문자로 시작하는 조각
+        'He said "Stop. Wait here." Then he left.',  # 문장에 걸친 인용문
+        "The cat sleeps (on the mat. It is warm.)",  # 짝이 맞지 않는 괄호
+        "The cat sleeps",                            # 종결 부호 없음
+    ])
+    def test_context_dependent_passage_falls_back(self, blank_model, passage):
+        analyzer.parse_passage(passage)
+        assert parsed_texts == [passage]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,166 @@
+"""
+v1.2 세션 보관(retention) 테스트
+
+오래된 세션이 압축 보관 파일로 옮겨지고, 학생 통계는 그대로 유지되며,
+id로 조회하면 hot DB로 복원되는지 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import gzip
+import json
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from db import database
+from db.retention import RetentionManager, archive_dir
+from db.student_stats import verify_student_stats
+from db.write_behind import ProgressWriter
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    monkeypatch.setattr(main, "retention_manager", RetentionManager(days=0, batch_size=1))
+    monkeypatch.setattr(main, "progress_writer", ProgressWriter(enabled=False))
+    return app_env
+
+
+def create_session(client, created_at, student="Kim", answers=2):
+    session_id = client.post("/api/sessions", json={"passage_text": "Run. Walk. Jump.", "total_sentences": 3}).json()["id"]
+    for index in range(answers):
+        client.put(f"/api/sessions/{session_id}/progress", json={
+            "sentence_index": index, "root_answer": 0, "root_correct": True,
+            "subject_answer": None, "subject_correct": index == 0
+        })
+    client.put(f"/api/manage/sessions/{session_id}/assign-student", json={"student_name": student})
+    with database.get_db() as conn:
+        conn.execute("UPDATE sessions SET created_at = ? WHERE id = ?", (created_at, session_id))
+        conn.commit()
+    return session_id
+
+
+def students(client):
+    return {s["displayName"]: s for s in client.get("/api/manage/sessions").json()["students"]}
+
+
+def hot_session_ids():
+    with database.get_db() as conn:
+        return {row[0] for row in conn.execute("SELECT id FROM sessions")}
+
+
+class TestSessionRetention:
+    """세션 보관/복원 테스트"""
+
+    def test_archive_moves_old_sessions(self, client):
+        old = [create_session(client, "2025-01-01 09:00:00"), create_session(client, "2025-01-02 09:00:00")]
+        new = create_session(client, "2099-01-01 09:00:00")
+
+        res = client.post("/api/manage/retention/run?days=30")
+        assert res.status_code == 200
+        assert res.json()["archived"] == 2
+        assert hot_session_ids() == {new}
+
+        # 보관 파일은 일반 .jsonl.gz로 읽을 수 있음
+        with gzip.open(os.path.join(archive_dir(), res.json()["file"]), "rt", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert [r["session"]["id"] for r in records] == old
+        assert len(records[0]["progress"]) == 2
+        assert records[0]["session"]["passage_text"] == "Run. Walk. Jump."
+
+        stats = client.get("/api/manage/retention").json()
+        assert stats["archivedSessions"] == 2
+        assert stats["archiveFiles"] == 1
+
+    def test_student_stats_are_kept(self, client):
+        create_session(client, "2025-01-01 09:00:00")
+        create_session(client, "2099-01-01 09:00:00", answers=1)
+        before = students(client)["Kim"]
+
+        client.post("/api/manage/retention/run?days=30")
+
+        after = students(client)["Kim"]
+        for key in ("totalSentences", "completedSentences", "rootCorrect", "subjectCorrect", "lastCompletedAt", "mode"):
+            assert after[key] == before[key]
+        with database.get_db() as conn:
+            assert verify_student_stats(conn.cursor()) == []
+
+    def test_lookup_restores_archived_session(self, client):
+        session_id = create_session(client, "2025-01-01 09:00:00")
+        before = students(client)["Kim"]
+        client.post("/api/manage/retention/run?days=30")
+
+        res = client.get(f"/api/sessions/{session_id}")
+        assert res.status_code == 200
+        assert res.json()["passage_text"] == "Run. Walk. Jump."
+        assert [p["sentence_index"] for p in res.json()["progress"]] == [0, 1]
+        assert session_id in hot_session_ids()
+
+        assert students(client)["Kim"]["completedSentences"] == before["completedSentences"]
+        with database.get_db() as conn:
+            assert verify_student_stats(conn.cursor()) == []
+            assert conn.execute("SELECT COUNT(*) FROM archived_sessions").fetchone()[0] == 0
+
+        # 복원된 세션은 복원 시점부터 다시 보관 기간을 세고,
+        # 참조가 없어진 보관 파일은 다음 실행에서 삭제
+        res = client.post("/api/manage/retention/run?days=30").json()
+        assert res["archived"] == 0
+        assert res["filesRemoved"] == 1
+        assert session_id in hot_session_ids()
+        assert client.get("/api/manage/retention").json()["archiveFiles"] == 0
+
+    def test_deleted_student_drops_archived_sessions(self, client):
+        session_id = create_session(client, "2025-01-01 09:00:00")
+        client.post("/api/manage/retention/run?days=30")
+
+        client.delete(f"/api/manage/students/{students(client)['Kim']['studentId']}")
+        assert client.get(f"/api/sessions/{session_id}").status_code == 404
+
+        # 학생의 지문/진행 상황이 담긴 보관 파일도 삭제
+        stats = client.get("/api/manage/retention").json()
+        assert stats["archivedSessions"] == 0
+        assert stats["archiveFiles"] == 0
+
+    def test_deleted_archived_session_stays_gone(self, client):
+        session_id = create_session(client, "2025-01-01 09:00:00")
+        create_session(client, "2099-01-01 09:00:00", answers=1)
+        client.post("/api/manage/retention/run?days=30")
+
+        assert client.delete(f"/api/manage/sessions/{session_id}").status_code == 200
+        assert client.get(f"/api/sessions/{session_id}").status_code == 404
+        assert session_id not in hot_session_ids()
+
+        # 보관 합계에서도 빠지고, 참조가 없어진 보관 파일은 바로 삭제
+        assert students(client)["Kim"]["completedSentences"] == 1
+        stats = client.get("/api/manage/retention").json()
+        assert stats["archivedSessions"] == 0
+        assert stats["archiveFiles"] == 0
+
+    @pytest.mark.parametrize("body", [{"session_ids": ["OLD"]}, {"older_than": "2026-01-01"}, {"all": True}])
+    def test_purge_jobs_drop_archived_sessions(self, client, body):
+        old = create_session(client, "2025-01-01 09:00:00")
+        create_session(client, "2099-01-01 09:00:00", answers=1)
+        client.post("/api/manage/retention/run?days=30")
+
+        if "session_ids" in body:
+            body = {"session_ids": [old]}
+        job = client.post("/api/manage/purge", json=body).json()
+        job = main.purge_manager.wait(job["id"], timeout=10)
+        assert job["status"] == "done"
+        assert job["deleted"] == job["total"]
+
+        assert client.get(f"/api/sessions/{old}").status_code == 404
+        expected = 0 if "all" in body else 1
+        assert students(client)["Kim"]["completedSentences"] == expected
+        with database.get_db() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM archived_sessions").fetchone()[0] == 0
+        assert client.get("/api/manage/retention").json()["archiveFiles"] == 0
+
+    def test_disabled_without_days(self, client):
+        assert client.post("/api/manage/retention/run").status_code == 400
+        assert client.get("/api/sessions/missing").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
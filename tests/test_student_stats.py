@@ -0,0 +1,145 @@
+"""
+v1.2 학생별 요약(student_stats) 테스트
+
+진행 상황 저장, 학생 배정, 세션/학생 삭제 후에도 트리거로 갱신된 요약이
+원본 테이블에서 계산한 값과 같은지 검증합니다. (서버 실행 불필요)
+"""
+import pytest
+import sys
+import os
+
+# server/ 를 path에 추가 (main.py는 server/ 기준 import 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+
+import main
+from db import database
+from db.student_stats import verify_student_stats, rebuild_student_stats
+from db.write_behind import ProgressWriter
+
+
+@pytest.fixture
+def app_env(app_env, monkeypatch):
+    # 쓰기를 바로 커밋하여 트리거 결과를 즉시 확인
+    monkeypatch.setattr(main, "progress_writer", ProgressWriter(enabled=False))
+    return app_env
+
+
+def create_session(client, total, mode="FULL"):
+    res = client.post("/api/sessions", json={"passage_text": "Run. " * total, "total_sentences": total, "mode": mode})
+    return res.json()["id"]
+
+
+def answer(client, session_id, index, correct=True):
+    client.put(f"/api/sessions/{session_id}/progress", json={
+        "sentence_index": index, "root_answer": 0, "root_correct": correct,
+        "subject_answer": 0, "subject_correct": correct
+    })
+
+
+def assign(client, session_id, name):
+    client.put(f"/api/manage/sessions/{session_id}/assign-student", json={"student_name": name})
+
+
+def student(client, name):
+    students = client.get("/api/manage/sessions").json()["students"]
+    return next(s for s in students if s["displayName"] == name)
+
+
+def assert_consistent():
+    with database.get_db() as conn:
+        assert verify_student_stats(conn.cursor()) == []
+
+
+class TestStudentStats:
+    """student_stats 트리거 테스트"""
+
+    def test_progress_updates_stats(self, client):
+        session_id = create_session(client, 3, mode="CORE")
+        assign(client, session_id, "Kim")
+        answer(client, session_id, 0, correct=True)
+        answer(client, session_id, 1, correct=False)
+
+        kim = student(client, "Kim")
+        assert kim["totalSentences"] == 3
+        assert kim["completedSentences"] == 2
+        assert kim["rootCorrect"] == 1
+        assert kim["mode"] == "CORE"
+        assert kim["lastCompletedAt"] is not None
+        assert_consistent()
+
+        # 같은 문장 재제출은 개수를 늘리지 않고 정답 수만 갱신
+        answer(client, session_id, 1, correct=True)
+        kim = student(client, "Kim")
+        assert kim["completedSentences"] == 2
+        assert kim["rootCorrect"] == 2
+        assert_consistent()
+
+    def test_progress_before_assignment_is_counted(self, client):
+        session_id = create_session(client, 2)
+        answer(client, session_id, 0)
+        assign(client, session_id, "Lee")
+
+        assert student(client, "Lee")["completedSentences"] == 1
+        assert_consistent()
+
+    def test_reassign_and_delete(self, client):
+        first = create_session(client, 2)
+        second = create_session(client, 4)
+        assign(client, first, "Kim")
+        assign(client, second, "Kim")
+        answer(client, first, 0)
+        answer(client, second, 0)
+        answer(client, second, 1)
+
+        # 다른 학생에게 재배정
+        assign(client, second, "Park")
+        assert student(client, "Kim")["completedSentences"] == 1
+        assert student(client, "Park")["completedSentences"] == 2
+        assert_consistent()
+
+        # 세션 삭제 (progress/map CASCADE)
+        client.delete(f"/api/manage/sessions/{first}")
+        kim = student(client, "Kim")
+        assert kim["totalSentences"] == 0
+        assert kim["completedSentences"] == 0
+        assert kim["lastCompletedAt"] is None
+        assert_consistent()
+
+        # 학생 삭제
+        client.delete(f"/api/manage/students/{student(client, 'Park')['studentId']}")
+        assert_consistent()
+
+    def test_rebuild_restores_stats(self, client):
+        session_id = create_session(client, 2)
+        assign(client, session_id, "Kim")
+        answer(client, session_id, 0)
+
+        with database.get_db() as conn:
+            conn.execute("UPDATE student_stats SET completed_sentences = 99")
+            conn.commit()
+            assert len(verify_student_stats(conn.cursor())) == 1
+
+            rebuild_student_stats(conn.cursor())
+            conn.commit()
+        assert_consistent()
+        assert student(client, "Kim")["completedSentences"] == 1
+
+    def test_existing_database_is_backfilled(self, client):
+        session_id = create_session(client, 2)
+        assign(client, session_id, "Kim")
+        answer(client, session_id, 0)
+
+        # v1.1 DB 흉내: 요약 테이블과 버전 기록 없이 다시 초기화
+        with database.get_db() as conn:
+            conn.execute("DROP TABLE student_stats")
+            conn.execute("DROP TABLE schema_version")
+            conn.commit()
+        database.close_pool()
+        database.init_db()
+
+        assert student(client, "Kim")["completedSentences"] == 1
+        assert_consistent()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])